@@ -1,12 +1,15 @@
 """Main Streamlit application entry point."""
 
 import os
+from dataclasses import dataclass
+
 import streamlit as st
 from dotenv import load_dotenv
 
 from storage.hybrid_storage import HybridStorageHandler
 from services.transaction_service import TransactionService
 from services.analytics_service import AnalyticsService
+from services.budget_service import BudgetService
 from ui import dashboard, add_transaction, analytics
 
 # Load environment variables
@@ -21,29 +24,88 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# Initialize services (using session state to persist across reruns)
-if "storage_handler" not in st.session_state:
+
+@dataclass(frozen=True)
+class AppServices:
+    """Storage handler and services shared by every session.
+    
+    Attributes:
+        storage_handler: Storage for transactions and budgets
+        transaction_service: Service for transaction operations
+        analytics_service: Service for analytics and summaries
+        budget_service: Service for budgets and spending against them
+    """
+    
+    storage_handler: HybridStorageHandler
+    transaction_service: TransactionService
+    analytics_service: AnalyticsService
+    budget_service: BudgetService
+
+
+@st.cache_resource
+def get_services() -> AppServices:
+    """Create the storage handler and services once per server process.
+    
+    All sessions share them, so the Supabase client, the in-memory caches
+    and the startup cost do not grow with the number of sessions. The
+    handler and services are thread-safe; only per-user view state belongs
+    in ``st.session_state``.
+    
+    Returns:
+        Shared AppServices
+    """
     # Use hybrid storage handler that saves to both local JSON and Supabase
-    st.session_state.storage_handler = HybridStorageHandler(
+    storage_handler = HybridStorageHandler(
         data_dir="data",
         supabase_url=os.getenv("SUPABASE_URL"),
         supabase_key=os.getenv("SUPABASE_KEY"),
         use_supabase=bool(os.getenv("SUPABASE_URL") and os.getenv("SUPABASE_KEY")),
+        journal=True,
+        local_backend=os.getenv("LOCAL_STORAGE_BACKEND", "json"),
     )
-
-if "transaction_service" not in st.session_state:
-    st.session_state.transaction_service = TransactionService(
-        st.session_state.storage_handler
+    transaction_service = TransactionService(storage_handler)
+    analytics_service = AnalyticsService(transaction_service)
+    return AppServices(
+        storage_handler=storage_handler,
+        transaction_service=transaction_service,
+        analytics_service=analytics_service,
+        budget_service=BudgetService(transaction_service, analytics_service),
     )
 
-if "analytics_service" not in st.session_state:
-    st.session_state.analytics_service = AnalyticsService(
-        st.session_state.transaction_service
-    )
+
+def show_remote_health(storage_handler: HybridStorageHandler) -> None:
+    """Display the Supabase connection health in the sidebar.
+    
+    Args:
+        storage_handler: Storage handler whose Supabase health is shown
+    """
+    health = storage_handler.remote_health()
+    if health["state"] == "disabled":
+        return
+    
+    st.sidebar.markdown("---")
+    if health["state"] == "closed":
+        st.sidebar.markdown("☁️ Supabase: 🟢 Connected")
+    elif health["state"] == "half_open":
+        st.sidebar.markdown("☁️ Supabase: 🟡 Reconnecting")
+    else:
+        st.sidebar.markdown("☁️ Supabase: 🔴 Offline, using local data")
+        st.sidebar.caption(f"Retrying in {health['retry_in']:.0f}s")
+    if health["last_error"] and (health["state"] != "closed" or health["rejected_writes"]):
+        st.sidebar.caption(f"Last error: {health['last_error']}")
+    if health["pending_writes"]:
+        st.sidebar.caption(f"{health['pending_writes']:,} changes waiting to sync")
+    if health["rejected_writes"]:
+        st.sidebar.caption(
+            f"{health['rejected_writes']:,} changes rejected by Supabase, "
+            "kept in data/outbox.rejected.jsonl"
+        )
 
 
 def main() -> None:
     """Main application function."""
+    services = get_services()
+    
     # Sidebar navigation
     st.sidebar.title("💰 Money Management")
     st.sidebar.markdown("---")
@@ -56,8 +118,11 @@ def main() -> None:
     
     st.sidebar.markdown("---")
     
+    # Compute all metrics once and share them with the page for this rerun
+    snapshot = services.analytics_service.snapshot()
+    
     # Display current balance in sidebar
-    current_balance = st.session_state.analytics_service.get_current_balance()
+    current_balance = snapshot.balance
     balance_color = "🟢" if current_balance >= 0 else "🔴"
     st.sidebar.markdown(
         f"### {balance_color} Current Balance\n"
@@ -67,25 +132,27 @@ def main() -> None:
     st.sidebar.markdown("---")
     
     # Quick stats in sidebar
-    total_income = st.session_state.analytics_service.get_total_income()
-    total_expenses = st.session_state.analytics_service.get_total_expenses()
+    st.sidebar.metric("Total Income", f"${snapshot.total_income:,.2f}")
+    st.sidebar.metric("Total Expenses", f"${snapshot.total_expenses:,.2f}")
     
-    st.sidebar.metric("Total Income", f"${total_income:,.2f}")
-    st.sidebar.metric("Total Expenses", f"${total_expenses:,.2f}")
+    show_remote_health(services.storage_handler)
     
     # Route to appropriate page
     if page == "Dashboard":
         dashboard.show_dashboard(
-            st.session_state.transaction_service,
-            st.session_state.analytics_service,
+            services.transaction_service,
+            services.analytics_service,
+            snapshot,
+            services.budget_service,
         )
     elif page == "Add Transaction":
         add_transaction.show_add_transaction(
-            st.session_state.transaction_service,
+            services.transaction_service,
         )
     elif page == "Analytics":
         analytics.show_analytics(
-            st.session_state.analytics_service,
+            services.analytics_service,
+            snapshot,
         )
 
 
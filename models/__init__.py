@@ -1,6 +1,7 @@
 """Models package for money management application."""
 
 from .transaction import Transaction
+from .compact_transaction import CompactTransaction
 from .budget import Budget
 
-__all__ = ["Transaction", "Budget"]
+__all__ = ["Transaction", "CompactTransaction", "Budget"]
@@ -0,0 +1,174 @@
+"""Memory-compact transaction model for large in-memory datasets."""
+
+import sys
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, List, Literal, Mapping, Union
+
+from models.transaction import Transaction
+
+
+@dataclass(slots=True)
+class CompactTransaction:
+    """Compact variant of Transaction for holding many rows in memory.
+    
+    Instances have no per-instance ``__dict__``, the category and type
+    strings are interned so equal values share one object, and the amount
+    is stored as integer cents so sums are exact. ``amount`` is available
+    as a property, and ``to_dict``/``from_dict`` use the same format as
+    Transaction, so both models read and write the same files.
+    
+    Attributes:
+        id: Unique identifier for the transaction
+        date: Date of the transaction
+        amount_cents: Transaction amount in cents (always positive)
+        category: Category of the transaction (e.g., 'Food', 'Salary')
+        description: Optional description of the transaction
+        type: Type of transaction ('income' or 'expense')
+    """
+    
+    date: date
+    amount_cents: int
+    category: str
+    description: str
+    type: Literal["income", "expense"]
+    id: str = field(default="")
+    
+    def __post_init__(self) -> None:
+        """Validate transaction data and intern repeated strings."""
+        if self.amount_cents < 0:
+            raise ValueError("Amount must be positive")
+        if not self.category.strip():
+            raise ValueError("Category cannot be empty")
+        if self.type not in ["income", "expense"]:
+            raise ValueError("Type must be 'income' or 'expense'")
+        self.category = sys.intern(self.category)
+        self.type = sys.intern(self.type)
+    
+    @property
+    def amount(self) -> float:
+        """Transaction amount in currency units."""
+        return self.amount_cents / 100
+    
+    @amount.setter
+    def amount(self, value: float) -> None:
+        """Set the amount from currency units, rounded to whole cents."""
+        if value < 0:
+            raise ValueError("Amount must be positive")
+        self.amount_cents = round(value * 100)
+    
+    @classmethod
+    def from_transaction(
+        cls,
+        transaction: Union[Transaction, "CompactTransaction"],
+    ) -> "CompactTransaction":
+        """Create a compact copy of a transaction.
+        
+        Args:
+            transaction: Transaction or CompactTransaction to copy
+            
+        Returns:
+            CompactTransaction instance
+        """
+        if isinstance(transaction, CompactTransaction):
+            amount_cents = transaction.amount_cents
+        else:
+            amount_cents = round(transaction.amount * 100)
+        return cls(
+            id=transaction.id,
+            date=transaction.date,
+            amount_cents=amount_cents,
+            category=transaction.category,
+            description=transaction.description,
+            type=transaction.type,
+        )
+    
+    def to_transaction(self) -> Transaction:
+        """Convert to a regular Transaction.
+        
+        Returns:
+            Transaction instance
+        """
+        return Transaction(
+            id=self.id,
+            date=self.date,
+            amount=self.amount,
+            category=self.category,
+            description=self.description,
+            type=self.type,
+        )
+    
+    def to_dict(self) -> dict:
+        """Convert transaction to dictionary for storage.
+        
+        Returns:
+            Dictionary representation of the transaction
+        """
+        return {
+            "id": self.id,
+            "date": self.date.isoformat(),
+            "amount": self.amount,
+            "category": self.category,
+            "description": self.description,
+            "type": self.type,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "CompactTransaction":
+        """Create a CompactTransaction instance from a dictionary.
+        
+        Args:
+            data: Dictionary containing transaction data
+            
+        Returns:
+            CompactTransaction instance
+        """
+        return cls(
+            id=data.get("id", ""),
+            date=date.fromisoformat(data["date"]),
+            amount_cents=round(data["amount"] * 100),
+            category=data["category"],
+            description=data.get("description", ""),
+            type=data["type"],
+        )
+    
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping]) -> List["CompactTransaction"]:
+        """Create CompactTransactions in bulk from records this app stored itself.
+        
+        Like ``Transaction.from_records``, validation is skipped and each
+        distinct date string is parsed once. Category and type strings are
+        still interned.
+        
+        Args:
+            records: Mappings with 'id', 'date', 'amount', 'category',
+                'description' and 'type' keys, as written by to_dict
+                
+        Returns:
+            List of CompactTransaction instances
+        """
+        new = object.__new__
+        intern = sys.intern
+        dates: Dict[str, date] = {}
+        transactions = []
+        for data in records:
+            day = data["date"]
+            parsed = dates.get(day)
+            if parsed is None:
+                parsed = dates[day] = date.fromisoformat(day)
+            
+            transaction = new(cls)
+            transaction.date = parsed
+            transaction.amount_cents = round(data["amount"] * 100)
+            transaction.category = intern(data["category"])
+            try:
+                transaction.description = data["description"]
+            except KeyError:
+                transaction.description = ""
+            transaction.type = intern(data["type"])
+            try:
+                transaction.id = data["id"]
+            except KeyError:
+                transaction.id = ""
+            transactions.append(transaction)
+        return transactions
@@ -2,7 +2,7 @@
 
 from dataclasses import dataclass, field
 from datetime import date
-from typing import Literal
+from typing import Dict, Iterable, List, Literal, Mapping
 
 
 @dataclass
@@ -67,3 +67,45 @@ class Transaction:
             description=data.get("description", ""),
             type=data["type"],
         )
+    
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping]) -> List["Transaction"]:
+        """Create Transactions in bulk from records this app stored itself.
+        
+        This is a trusted fast path for loading storage: validation in
+        ``__post_init__`` is skipped, each distinct date string is parsed
+        once, and every record must contain all fields except 'description'
+        and 'id', which default to empty strings like in ``from_dict``. Use
+        ``from_dict`` or the constructor for user input and imported data.
+        
+        Args:
+            records: Mappings with 'id', 'date', 'amount', 'category',
+                'description' and 'type' keys, as written by to_dict
+                
+        Returns:
+            List of Transaction instances
+        """
+        new = object.__new__
+        dates: Dict[str, date] = {}
+        transactions = []
+        for data in records:
+            day = data["date"]
+            parsed = dates.get(day)
+            if parsed is None:
+                parsed = dates[day] = date.fromisoformat(day)
+            
+            transaction = new(cls)
+            transaction.date = parsed
+            transaction.amount = data["amount"]
+            transaction.category = data["category"]
+            try:
+                transaction.description = data["description"]
+            except KeyError:
+                transaction.description = ""
+            transaction.type = data["type"]
+            try:
+                transaction.id = data["id"]
+            except KeyError:
+                transaction.id = ""
+            transactions.append(transaction)
+        return transactions
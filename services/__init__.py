@@ -1,6 +1,16 @@
 """Services package for business logic."""
 
-from .transaction_service import TransactionService
-from .analytics_service import AnalyticsService
+from .transaction_service import ImportReport, TransactionService
+from .analytics_service import AnalyticsService, AnalyticsSnapshot
+from .importer import TransactionImporter
+from .budget_service import BudgetService, BudgetStatus
 
-__all__ = ["TransactionService", "AnalyticsService"]
+__all__ = [
+    "TransactionService",
+    "ImportReport",
+    "AnalyticsService",
+    "AnalyticsSnapshot",
+    "TransactionImporter",
+    "BudgetService",
+    "BudgetStatus",
+]
@@ -1,26 +1,224 @@
 """Analytics service for computing financial summaries and statistics."""
 
+import threading
+from dataclasses import dataclass
 from datetime import date
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Callable, Dict, Hashable, Mapping, Optional, Tuple, TypeVar
 
-from models.transaction import Transaction
+import pandas as pd
+
+from services.cache import VersionedCache
+from services.transaction_frame import TransactionFrame
 from services.transaction_service import TransactionService
 
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class AnalyticsSnapshot:
+    """Immutable set of the metrics shown across the app's pages.
+    
+    Attributes:
+        total_income: Total income of all transactions
+        total_expenses: Total expenses of all transactions
+        balance: Total income minus total expenses
+        income_by_category: Income totals by category
+        expense_by_category: Expense totals by category
+        net_by_category: Income minus expenses by category
+        monthly: Dictionaries with 'income', 'expenses' and 'balance' keys
+            by (year, month)
+        data_version: Storage data version the snapshot was computed at,
+            None if the storage is not versioned
+    """
+    
+    total_income: float
+    total_expenses: float
+    balance: float
+    income_by_category: Mapping[str, float]
+    expense_by_category: Mapping[str, float]
+    net_by_category: Mapping[str, float]
+    monthly: Mapping[Tuple[int, int], Mapping[str, float]]
+    data_version: Optional[int] = None
+    
+    def get_monthly_summary(self, year: int, month: int) -> Dict[str, float]:
+        """Get the financial summary for a specific month.
+        
+        Args:
+            year: Year to look up
+            month: Month to look up (1-12)
+            
+        Returns:
+            Dictionary with 'income', 'expenses', and 'balance' keys
+        """
+        summary = self.monthly.get((year, month))
+        if summary is None:
+            return {"income": 0.0, "expenses": 0.0, "balance": 0.0}
+        return dict(summary)
+
 
 class AnalyticsService:
     """Service for computing financial analytics and summaries.
     
     This service handles all calculation and aggregation logic for
-    financial data analysis.
+    financial data analysis. When the storage backend can aggregate on its
+    own (see ``supports_aggregation``), for example in the database,
+    totals are delegated to it. Otherwise, or if the backend fails, they
+    are computed on a columnar TransactionFrame, which is rebuilt only when
+    the storage reports a new data version.
+    
+    Results are memoized in a bounded LRU cache keyed on the storage's
+    ``data_version``, so repeated calls between writes cost a lookup.
+    Callers can cache their own derived values the same way with
+    ``memoize``. The service is thread-safe and can be shared by sessions.
     """
     
-    def __init__(self, transaction_service: TransactionService) -> None:
+    def __init__(self, transaction_service: TransactionService, cache_size: int = 128) -> None:
         """Initialize the analytics service.
         
         Args:
             transaction_service: TransactionService instance for accessing transactions
+            cache_size: Maximum number of memoized results
         """
         self.transaction_service = transaction_service
+        self._frame: Optional[TransactionFrame] = None
+        self._frame_version: Optional[int] = None
+        self._frame_lock = threading.Lock()
+        self.cache = VersionedCache(cache_size)
+    
+    def data_version(self) -> Optional[int]:
+        """Get the storage's current data version.
+        
+        Returns:
+            Data version, or None if the storage is not versioned
+        """
+        return getattr(self.transaction_service.storage, "data_version", None)
+    
+    def memoize(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """Cache a value derived from the transactions until they change.
+        
+        Args:
+            key: Key identifying the value
+            compute: Function computing the value
+            
+        Returns:
+            Cached or freshly computed value
+        """
+        return self.cache.get_or_compute(key, self.data_version(), compute)
+    
+    def get_frame(self) -> TransactionFrame:
+        """Get a columnar frame of all transactions.
+        
+        The frame is reused while the storage's ``data_version`` is
+        unchanged. Storage without a data version gets a fresh frame on
+        every call. Storage that can hand out its columns directly (see
+        ``read_columns``) is used without loading transactions.
+        
+        Returns:
+            TransactionFrame of all transactions
+        """
+        version = self.data_version()
+        # Held while building, so concurrent callers share one frame
+        with self._frame_lock:
+            if self._frame is None or version is None or version != self._frame_version:
+                read_columns = getattr(self.transaction_service.storage, "read_columns", None)
+                columns = read_columns() if read_columns is not None else None
+                if columns is not None:
+                    self._frame = TransactionFrame(**columns)
+                else:
+                    self._frame = TransactionFrame.from_transactions(
+                        self.transaction_service.get_all_transactions()
+                    )
+                self._frame_version = version
+            return self._frame
+    
+    def _aggregate(self, method: str, *args):
+        """Compute totals, memoized until the data version changes.
+        
+        Args:
+            method: Name of the aggregate method ('sum_by_type',
+                'sum_by_category', 'sum_by_month' or 'sum_by_month_and_category')
+            *args: Arguments for the method
+            
+        Returns:
+            Result of the aggregate method; callers must not modify it
+        """
+        return self.memoize((method, *args), lambda: self._compute_aggregate(method, *args))
+    
+    def _compute_aggregate(self, method: str, *args):
+        """Compute totals with the storage if it supports aggregation.
+        
+        Falls back to the TransactionFrame when the storage cannot aggregate,
+        lacks the aggregate method or the method raises.
+        
+        Args:
+            method: Name of the aggregate method
+            *args: Arguments for the method
+            
+        Returns:
+            Result of the aggregate method
+        """
+        storage = self.transaction_service.storage
+        supports = getattr(storage, "supports_aggregation", None)
+        if supports is not None and supports() and hasattr(storage, method):
+            try:
+                return getattr(storage, method)(*args)
+            except Exception as e:
+                print(f"Warning: Storage aggregation failed, computing locally: {e}")
+        return getattr(self.get_frame(), method)(*args)
+    
+    def snapshot(self) -> AnalyticsSnapshot:
+        """Compute all page-level metrics in one pass over the aggregates.
+        
+        Category nets, the balance and monthly balances are derived from the
+        income and expense totals rather than computed separately. The
+        snapshot is reused while the storage's ``data_version`` is unchanged.
+        
+        Returns:
+            AnalyticsSnapshot of the current data
+        """
+        version = self.data_version()
+        return self.cache.get_or_compute("snapshot", version, lambda: self._compute_snapshot(version))
+    
+    def _compute_snapshot(self, version: Optional[int]) -> AnalyticsSnapshot:
+        """Compute an AnalyticsSnapshot.
+        
+        Args:
+            version: Data version the snapshot is computed at
+            
+        Returns:
+            AnalyticsSnapshot of the current data
+        """
+        totals = self._aggregate("sum_by_type")
+        income_by_category = self._aggregate("sum_by_category", "income")
+        expense_by_category = self._aggregate("sum_by_category", "expense")
+        
+        net_by_category = {
+            category: round(
+                income_by_category.get(category, 0.0) - expense_by_category.get(category, 0.0),
+                2,
+            )
+            for category in {**income_by_category, **expense_by_category}
+        }
+        monthly = {
+            key: MappingProxyType({
+                "income": sums["income"],
+                "expenses": sums["expense"],
+                "balance": round(sums["income"] - sums["expense"], 2),
+            })
+            for key, sums in sorted(self._aggregate("sum_by_month").items())
+        }
+        
+        return AnalyticsSnapshot(
+            total_income=totals["income"],
+            total_expenses=totals["expense"],
+            balance=round(totals["income"] - totals["expense"], 2),
+            income_by_category=MappingProxyType(income_by_category),
+            expense_by_category=MappingProxyType(expense_by_category),
+            net_by_category=MappingProxyType(net_by_category),
+            monthly=MappingProxyType(monthly),
+            data_version=version,
+        )
     
     def get_total_income(self) -> float:
         """Calculate total income from all income transactions.
@@ -28,8 +226,7 @@ class AnalyticsService:
         Returns:
             Total income amount
         """
-        income_transactions = self.transaction_service.get_transactions_by_type("income")
-        return sum(t.amount for t in income_transactions)
+        return self._aggregate("sum_by_type")["income"]
     
     def get_total_expenses(self) -> float:
         """Calculate total expenses from all expense transactions.
@@ -37,8 +234,7 @@ class AnalyticsService:
         Returns:
             Total expenses amount
         """
-        expense_transactions = self.transaction_service.get_transactions_by_type("expense")
-        return sum(t.amount for t in expense_transactions)
+        return self._aggregate("sum_by_type")["expense"]
     
     def get_current_balance(self) -> float:
         """Calculate current balance (income - expenses).
@@ -46,7 +242,8 @@ class AnalyticsService:
         Returns:
             Current balance
         """
-        return self.get_total_income() - self.get_total_expenses()
+        totals = self._aggregate("sum_by_type")
+        return totals["income"] - totals["expense"]
     
     def get_category_summary(self) -> Dict[str, float]:
         """Get spending summary grouped by category.
@@ -54,20 +251,7 @@ class AnalyticsService:
         Returns:
             Dictionary mapping category names to total amounts
         """
-        transactions = self.transaction_service.get_all_transactions()
-        category_totals: Dict[str, float] = {}
-        
-        for transaction in transactions:
-            category = transaction.category
-            if category not in category_totals:
-                category_totals[category] = 0.0
-            
-            if transaction.type == "income":
-                category_totals[category] += transaction.amount
-            else:  # expense
-                category_totals[category] -= transaction.amount
-        
-        return category_totals
+        return dict(self._aggregate("sum_by_category"))
     
     def get_expense_by_category(self) -> Dict[str, float]:
         """Get expense totals grouped by category.
@@ -75,17 +259,7 @@ class AnalyticsService:
         Returns:
             Dictionary mapping category names to total expense amounts
         """
-        transactions = self.transaction_service.get_all_transactions()
-        category_expenses: Dict[str, float] = {}
-        
-        for transaction in transactions:
-            if transaction.type == "expense":
-                category = transaction.category
-                if category not in category_expenses:
-                    category_expenses[category] = 0.0
-                category_expenses[category] += transaction.amount
-        
-        return category_expenses
+        return dict(self._aggregate("sum_by_category", "expense"))
     
     def get_income_by_category(self) -> Dict[str, float]:
         """Get income totals grouped by category.
@@ -93,17 +267,19 @@ class AnalyticsService:
         Returns:
             Dictionary mapping category names to total income amounts
         """
-        transactions = self.transaction_service.get_all_transactions()
-        category_income: Dict[str, float] = {}
-        
-        for transaction in transactions:
-            if transaction.type == "income":
-                category = transaction.category
-                if category not in category_income:
-                    category_income[category] = 0.0
-                category_income[category] += transaction.amount
+        return dict(self._aggregate("sum_by_category", "income"))
+    
+    def get_expense_by_category_for_month(self, year: int, month: int) -> Dict[str, float]:
+        """Get expense totals of a specific month grouped by category.
         
-        return category_income
+        Args:
+            year: Year to filter by
+            month: Month to filter by (1-12)
+            
+        Returns:
+            Dictionary mapping category names to expense amounts in the month
+        """
+        return dict(self._aggregate("sum_by_category", "expense", year, month))
     
     def get_monthly_summary(self, year: int, month: int) -> Dict[str, float]:
         """Get financial summary for a specific month.
@@ -115,20 +291,121 @@ class AnalyticsService:
         Returns:
             Dictionary with 'income', 'expenses', and 'balance' keys
         """
-        transactions = self.transaction_service.get_all_transactions()
-        
-        monthly_income = 0.0
-        monthly_expenses = 0.0
-        
-        for transaction in transactions:
-            if transaction.date.year == year and transaction.date.month == month:
-                if transaction.type == "income":
-                    monthly_income += transaction.amount
-                else:
-                    monthly_expenses += transaction.amount
+        totals = self._aggregate("sum_by_month", year, month).get((year, month), {})
+        monthly_income = totals.get("income", 0.0)
+        monthly_expenses = totals.get("expense", 0.0)
         
         return {
             "income": monthly_income,
             "expenses": monthly_expenses,
             "balance": monthly_income - monthly_expenses,
         }
+    
+    def get_monthly_series(
+        self,
+        start: date,
+        end: date,
+        by_category: bool = False,
+        cumulative: bool = True,
+        rolling_window: Optional[int] = 3,
+    ) -> pd.DataFrame:
+        """Get income, expenses and balance for every month in a range.
+        
+        All months come from one grouped aggregate (memoized until the data
+        changes) rather than a query per month. Months without transactions
+        are included with zero totals, so the result can be charted directly.
+        
+        Args:
+            start: Any day of the first month
+            end: Any day of the last month
+            by_category: Whether to break the totals down by category
+            cumulative: Whether to add a 'cumulative_balance' column, the
+                running balance including all months before the range
+            rolling_window: Number of months averaged in the 'income_rolling',
+                'expenses_rolling' and 'balance_rolling' columns, None to
+                leave them out
+                
+        Returns:
+            DataFrame with 'month' (timestamp of the first day), 'income',
+            'expenses' and 'balance' columns, one row per month, or per
+            month and 'category' if by_category is set
+        """
+        key = ("monthly_series", start.year, start.month, end.year, end.month,
+               by_category, cumulative, rolling_window)
+        series = self.memoize(
+            key,
+            lambda: self._compute_monthly_series(start, end, by_category, cumulative, rolling_window),
+        )
+        return series.copy()
+    
+    def _compute_monthly_series(
+        self,
+        start: date,
+        end: date,
+        by_category: bool,
+        cumulative: bool,
+        rolling_window: Optional[int],
+    ) -> pd.DataFrame:
+        """Compute a monthly time series; see ``get_monthly_series``.
+        
+        Args:
+            start: Any day of the first month
+            end: Any day of the last month
+            by_category: Whether to break the totals down by category
+            cumulative: Whether to add a 'cumulative_balance' column
+            rolling_window: Number of months in the rolling averages, or None
+            
+        Returns:
+            DataFrame of the monthly series
+        """
+        first = (start.year, start.month)
+        last = (end.year, end.month)
+        keys = []
+        year, month = first
+        while (year, month) <= last:
+            keys.append((year, month))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        
+        # One grouped aggregate serves every month; with categories, each
+        # month maps categories to sums, otherwise the month maps to its sums
+        if by_category:
+            totals = self._aggregate("sum_by_month_and_category")
+            categories = sorted({category for sums in totals.values() for category in sums})
+        else:
+            totals = {key: {None: sums} for key, sums in self._aggregate("sum_by_month").items()}
+            categories = [None]
+        
+        empty = {"income": 0.0, "expense": 0.0}
+        rows = []
+        for key in keys:
+            month_totals = totals.get(key, {})
+            for category in categories:
+                sums = month_totals.get(category, empty)
+                rows.append((date(key[0], key[1], 1), category, sums["income"], sums["expense"]))
+        
+        frame = pd.DataFrame(rows, columns=["month", "category", "income", "expenses"]).astype(
+            {"month": "datetime64[ns]", "income": float, "expenses": float}
+        )
+        frame["balance"] = (frame["income"] - frame["expenses"]).round(2)
+        
+        if cumulative:
+            # Balances of the months before the range open the running balance
+            opening: Dict[Optional[str], float] = {}
+            for key, month_totals in totals.items():
+                if key < first:
+                    for category, sums in month_totals.items():
+                        opening[category] = opening.get(category, 0.0) + sums["income"] - sums["expense"]
+            running = frame.groupby("category", dropna=False)["balance"].cumsum()
+            frame["cumulative_balance"] = (frame["category"].map(opening).fillna(0.0) + running).round(2)
+        
+        if rolling_window:
+            for column in ("income", "expenses", "balance"):
+                frame[f"{column}_rolling"] = (
+                    frame.groupby("category", dropna=False)[column]
+                    .transform(lambda values: values.rolling(rolling_window, min_periods=1).mean())
+                    .round(2)
+                )
+        
+        if not by_category:
+            frame = frame.drop(columns="category")
+        return frame
@@ -0,0 +1,202 @@
+"""Budget service for tracking spending against monthly category budgets."""
+
+import calendar
+import threading
+from dataclasses import dataclass
+from datetime import date
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
+
+from models.budget import Budget
+from services.analytics_service import AnalyticsService
+from services.transaction_service import TransactionService
+
+
+@dataclass(frozen=True)
+class BudgetStatus:
+    """Month-to-date spending of a category against its monthly budget.
+    
+    Attributes:
+        category: Category name
+        limit: Monthly spending limit
+        spent: Expenses in the category so far this month
+        projected: Expected expenses by the end of the month if spending
+            continues at the month-to-date daily rate
+    """
+    
+    category: str
+    limit: float
+    spent: float
+    projected: float
+    
+    @property
+    def remaining(self) -> float:
+        """Amount left to spend this month, negative once over budget."""
+        return round(self.limit - self.spent, 2)
+    
+    @property
+    def projected_overrun(self) -> float:
+        """Amount the projected spending exceeds the limit by, 0 if within it."""
+        return max(round(self.projected - self.limit, 2), 0.0)
+    
+    @property
+    def fraction_used(self) -> float:
+        """Spent amount as a fraction of the limit."""
+        if self.limit > 0:
+            return self.spent / self.limit
+        return 1.0 if self.spent > 0 else 0.0
+    
+    @property
+    def over_budget(self) -> bool:
+        """Whether more than the limit has been spent."""
+        return self.spent > self.limit
+
+
+class BudgetService:
+    """Service for managing budgets and the spending against them.
+    
+    Month-to-date spending per category comes from the expense totals by
+    category and month, which the storage maintains incrementally as
+    transactions are added and deleted (or aggregates in the database), so
+    history is never rescanned. Statuses are memoized through
+    AnalyticsService on the storage's data version, the day and the
+    budgets, so between writes looking up a category's status is a
+    dictionary lookup.
+    
+    Budgets are loaded from storage once and kept in memory; changes made
+    through this service update both, under a lock so the service can be
+    shared by sessions.
+    """
+    
+    def __init__(
+        self,
+        transaction_service: TransactionService,
+        analytics_service: AnalyticsService,
+    ) -> None:
+        """Initialize the budget service.
+        
+        Args:
+            transaction_service: TransactionService whose storage holds the budgets
+            analytics_service: AnalyticsService used for the spending totals
+        """
+        self.transaction_service = transaction_service
+        self.analytics_service = analytics_service
+        self._budgets: Optional[Dict[str, Budget]] = None
+        self._lock = threading.RLock()
+    
+    def _cached_budgets(self) -> Dict[str, Budget]:
+        """Get the budgets, loading them on first use.
+        
+        Returns:
+            Dictionary mapping category names to Budget objects
+        """
+        with self._lock:
+            if self._budgets is None:
+                self._budgets = {
+                    budget.category: budget
+                    for budget in self.transaction_service.storage.load_all_budgets()
+                }
+            return self._budgets
+    
+    def get_budgets(self) -> List[Budget]:
+        """Get all budgets.
+        
+        Returns:
+            List of Budget objects sorted by category
+        """
+        with self._lock:
+            budgets = list(self._cached_budgets().values())
+        return sorted(budgets, key=lambda budget: budget.category)
+    
+    def set_budget(self, category: str, monthly_limit: float) -> Budget:
+        """Create or replace the budget of a category.
+        
+        Args:
+            category: Category name
+            monthly_limit: Monthly spending limit
+            
+        Returns:
+            Saved Budget object
+        """
+        budget = Budget(category=category, monthly_limit=monthly_limit)
+        with self._lock:
+            self.transaction_service.storage.save_budget(budget)
+            self._cached_budgets()[category] = budget
+        return budget
+    
+    def delete_budget(self, category: str) -> bool:
+        """Delete the budget of a category.
+        
+        Args:
+            category: Category name
+            
+        Returns:
+            True if the budget was deleted, False if not found
+        """
+        with self._lock:
+            deleted = self.transaction_service.storage.delete_budget(category)
+            self._cached_budgets().pop(category, None)
+        return deleted
+    
+    def get_status(self, today: Optional[date] = None) -> Mapping[str, BudgetStatus]:
+        """Get the month-to-date status of every budget.
+        
+        Args:
+            today: Day to report for, defaults to the current date
+            
+        Returns:
+            Read-only mapping of category names to BudgetStatus objects
+        """
+        if today is None:
+            today = date.today()
+        with self._lock:
+            budgets = tuple(
+                (budget.category, budget.monthly_limit)
+                for budget in self._cached_budgets().values()
+            )
+        return self.analytics_service.memoize(
+            ("budget_status", today, budgets),
+            lambda: self._compute_status(budgets, today),
+        )
+    
+    def get_category_status(
+        self,
+        category: str,
+        today: Optional[date] = None,
+    ) -> Optional[BudgetStatus]:
+        """Get the month-to-date status of one category's budget.
+        
+        Args:
+            category: Category name
+            today: Day to report for, defaults to the current date
+            
+        Returns:
+            BudgetStatus, or None if the category has no budget
+        """
+        return self.get_status(today).get(category)
+    
+    def _compute_status(self, budgets: tuple, today: date) -> Mapping[str, BudgetStatus]:
+        """Compute budget statuses from the month's expense totals.
+        
+        Args:
+            budgets: Tuples of (category, monthly limit)
+            today: Day to report for
+            
+        Returns:
+            Read-only mapping of category names to BudgetStatus objects
+        """
+        spent_by_category = self.analytics_service.get_expense_by_category_for_month(
+            today.year, today.month
+        )
+        days_in_month = calendar.monthrange(today.year, today.month)[1]
+        
+        statuses = {}
+        for category, limit in budgets:
+            spent = spent_by_category.get(category, 0.0)
+            statuses[category] = BudgetStatus(
+                category=category,
+                limit=limit,
+                spent=spent,
+                projected=round(spent / today.day * days_in_month, 2),
+            )
+        return MappingProxyType(statuses)
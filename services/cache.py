@@ -0,0 +1,96 @@
+"""Bounded cache for results derived from versioned storage data."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class VersionedCache:
+    """Least-recently-used cache of results computed at a data version.
+    
+    Results are stored per key together with the storage data version they
+    were computed at. Versions only increase, so once a newer version is
+    seen every older entry is dropped. A caller still holding an older
+    version, e.g. a request that read it before a write, gets a freshly
+    computed result that is not stored. At most ``maxsize`` entries are kept;
+    the least recently used one is evicted when the cache is full. Results
+    computed without a version (storage that is not versioned) are never
+    cached.
+    """
+    
+    def __init__(self, maxsize: int = 128) -> None:
+        """Initialize an empty cache.
+        
+        Args:
+            maxsize: Maximum number of cached results
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+    
+    def get_or_compute(
+        self,
+        key: Hashable,
+        version: Optional[int],
+        compute: Callable[[], T],
+    ) -> T:
+        """Get a cached result, computing and storing it on a miss.
+        
+        Args:
+            key: Key identifying the result, e.g. a method name and arguments
+            version: Data version the result depends on, None to skip caching
+            compute: Function computing the result
+            
+        Returns:
+            Cached or freshly computed result
+        """
+        if version is None:
+            return compute()
+        
+        with self._lock:
+            if self._version is None or version > self._version:
+                self._entries.clear()
+                self._version = version
+            elif version == self._version and key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key]
+            self._misses += 1
+        
+        # Computed outside the lock so slow results don't block other keys
+        result = compute()
+        
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = result
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+        return result
+    
+    def clear(self) -> None:
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+    
+    def stats(self) -> Dict[str, int]:
+        """Get cache statistics.
+        
+        Returns:
+            Dictionary with 'hits', 'misses', 'evictions' and 'size' keys
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "size": len(self._entries),
+            }
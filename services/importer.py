@@ -0,0 +1,257 @@
+"""Streaming importer for bank statements in CSV and OFX format."""
+
+import csv
+import math
+import re
+import time
+from datetime import date, datetime
+from itertools import islice
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+from models.transaction import Transaction
+from services.transaction_service import ImportReport, TransactionService
+
+
+# Matches one OFX element, e.g. "<TRNAMT>-12.50" or "</STMTTRN>"
+OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+class TransactionImporter:
+    """Imports transactions from bank statement files.
+    
+    Input is parsed one row at a time and validated in chunks, so large
+    files are never held in memory. Valid rows are passed on to
+    ``TransactionService.add_transactions``, which skips rows that are
+    already stored and saves the rest with one write per chunk.
+    
+    CSV files need a header with at least 'date' and 'amount' columns.
+    Optional 'category', 'description' and 'type' columns are used when
+    present; without a 'type' column, negative amounts are expenses and
+    positive amounts are income. OFX/QFX files are read from their
+    STMTTRN records.
+    """
+    
+    # Maximum number of rejected rows described in the report
+    MAX_ERRORS = 20
+    
+    def __init__(
+        self,
+        transaction_service: TransactionService,
+        chunk_size: int = 500,
+        default_category: str = "Uncategorized",
+        date_format: Optional[str] = None,
+    ) -> None:
+        """Initialize the importer.
+        
+        Args:
+            transaction_service: TransactionService used to save transactions
+            chunk_size: Number of rows validated and saved together
+            default_category: Category for rows without one
+            date_format: strptime format of CSV dates, ISO 8601 if None
+        """
+        self.transaction_service = transaction_service
+        self.chunk_size = chunk_size
+        self.default_category = default_category
+        self.date_format = date_format
+    
+    def import_csv(self, file: IO[str]) -> ImportReport:
+        """Import transactions from a CSV file.
+        
+        Args:
+            file: Text stream of the CSV file
+            
+        Returns:
+            ImportReport of the import
+        """
+        return self._import(self.parse_csv(file))
+    
+    def import_ofx(self, file: IO[str]) -> ImportReport:
+        """Import transactions from an OFX or QFX file.
+        
+        Args:
+            file: Text stream of the OFX file
+            
+        Returns:
+            ImportReport of the import
+        """
+        return self._import(self.parse_ofx(file))
+    
+    def import_file(self, file: IO[str], filename: str) -> ImportReport:
+        """Import transactions from a file, choosing the format by extension.
+        
+        Args:
+            file: Text stream of the file
+            filename: Name of the file, ending in .csv, .ofx or .qfx
+            
+        Returns:
+            ImportReport of the import
+        """
+        if filename.lower().endswith((".ofx", ".qfx")):
+            return self.import_ofx(file)
+        if filename.lower().endswith(".csv"):
+            return self.import_csv(file)
+        raise ValueError(f"Unsupported file type: {filename}")
+    
+    def parse_csv(self, file: IO[str]) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """Stream rows of a CSV file.
+        
+        Args:
+            file: Text stream of the CSV file
+            
+        Yields:
+            Tuples of (line number, row) with lower-cased column names
+        """
+        reader = csv.DictReader(file)
+        if reader.fieldnames is None:
+            return
+        reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+        missing = {"date", "amount"} - set(reader.fieldnames)
+        if missing:
+            raise ValueError(f"CSV file is missing columns: {', '.join(sorted(missing))}")
+        
+        for row in reader:
+            yield reader.line_num, row
+    
+    def parse_ofx(self, file: IO[str]) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """Stream STMTTRN records of an OFX or QFX file.
+        
+        Both SGML (unclosed elements) and XML flavours are supported, as
+        long as no element is split across lines.
+        
+        Args:
+            file: Text stream of the OFX file
+            
+        Yields:
+            Tuples of (line number, row) with 'date', 'amount', 'description'
+            and 'type' keys
+        """
+        record: Optional[Dict[str, str]] = None
+        record_line = 0
+        for line_number, line in enumerate(file, start=1):
+            for closing, tag, value in OFX_TAG.findall(line):
+                tag = tag.upper()
+                if tag == "STMTTRN":
+                    if closing and record is not None:
+                        yield record_line, self._ofx_row(record)
+                        record = None
+                    elif not closing:
+                        record, record_line = {}, line_number
+                elif record is not None and not closing:
+                    record[tag] = value.strip()
+    
+    @staticmethod
+    def _ofx_row(record: Dict[str, str]) -> Dict[str, str]:
+        """Convert an OFX STMTTRN record to an import row.
+        
+        Args:
+            record: Element values of the record by tag
+            
+        Returns:
+            Row dictionary with 'date', 'amount', 'description' and 'type' keys
+        """
+        amount = record.get("TRNAMT", "")
+        description = " - ".join(
+            value for value in (record.get("NAME"), record.get("MEMO")) if value
+        )
+        return {
+            # DTPOSTED is YYYYMMDD, optionally followed by time and timezone
+            "date": record.get("DTPOSTED", "")[:8],
+            "amount": amount,
+            "description": description,
+            "type": "expense" if amount.startswith("-") else "income",
+        }
+    
+    def _parse_date(self, value: str) -> date:
+        """Parse a date from an import row.
+        
+        Args:
+            value: Date string
+            
+        Returns:
+            Parsed date
+        """
+        if self.date_format:
+            return datetime.strptime(value, self.date_format).date()
+        if len(value) == 8 and value.isdigit():
+            return datetime.strptime(value, "%Y%m%d").date()
+        return date.fromisoformat(value)
+    
+    def _to_transaction(self, row: Dict[str, str]) -> Transaction:
+        """Validate an import row and convert it to a Transaction.
+        
+        Args:
+            row: Row dictionary
+            
+        Returns:
+            Transaction instance
+            
+        Raises:
+            ValueError: If the row is not a valid transaction
+        """
+        amount_text = (row.get("amount") or "").strip().replace(",", "")
+        if not amount_text:
+            raise ValueError("Amount is missing")
+        amount = float(amount_text)
+        # Amounts are also summed as cents, which must stay finite
+        if not math.isfinite(amount * 100):
+            raise ValueError(f"Amount is not a finite number: {amount_text}")
+        
+        transaction_type = (row.get("type") or "").strip().lower()
+        if not transaction_type:
+            transaction_type = "expense" if amount < 0 else "income"
+        
+        return Transaction(
+            date=self._parse_date((row.get("date") or "").strip()),
+            amount=round(abs(amount), 2),
+            category=(row.get("category") or "").strip() or self.default_category,
+            description=(row.get("description") or "").strip(),
+            type=transaction_type,
+        )
+    
+    def _validate(
+        self,
+        rows: Iterator[Tuple[int, Dict[str, str]]],
+        report: ImportReport,
+    ) -> Iterator[Transaction]:
+        """Validate rows chunk by chunk, recording rejected rows in the report.
+        
+        Args:
+            rows: Tuples of (line number, row)
+            report: Report to record rejected rows in
+            
+        Yields:
+            Valid Transaction objects
+        """
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                return
+            valid: List[Transaction] = []
+            for line_number, row in chunk:
+                try:
+                    valid.append(self._to_transaction(row))
+                except ValueError as e:
+                    report.invalid += 1
+                    if len(report.errors) < self.MAX_ERRORS:
+                        report.errors.append(f"Line {line_number}: {e}")
+            yield from valid
+    
+    def _import(self, rows: Iterator[Tuple[int, Dict[str, str]]]) -> ImportReport:
+        """Validate rows and add the valid ones as transactions.
+        
+        Args:
+            rows: Tuples of (line number, row)
+            
+        Returns:
+            ImportReport of the import
+        """
+        started = time.perf_counter()
+        rejected = ImportReport()
+        report = self.transaction_service.add_transactions(
+            self._validate(rows, rejected),
+            chunk_size=self.chunk_size,
+        )
+        report.invalid = rejected.invalid
+        report.errors = rejected.errors
+        report.seconds = time.perf_counter() - started
+        return report
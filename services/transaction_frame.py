@@ -0,0 +1,225 @@
+"""Columnar NumPy-backed view of transactions for vectorized analytics."""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from models.transaction import Transaction
+
+
+class TransactionFrame:
+    """Columnar representation of a set of transactions.
+    
+    Transactions are stored as parallel NumPy arrays: date ordinals, month
+    keys (year * 12 + month - 1), integer-cent amounts, an income flag and
+    dictionary-encoded category codes. Totals are computed with masked sums
+    and ``bincount`` instead of Python loops.
+    
+    The aggregate methods mirror the ones offered by storage backends that
+    aggregate on their own, so callers can use either interchangeably.
+    
+    Attributes:
+        date_ordinals: Proleptic Gregorian ordinal of each transaction date
+        month_keys: year * 12 + (month - 1) of each transaction date
+        amount_cents: Amount of each transaction in integer cents
+        is_income: True for income transactions, False for expenses
+        category_codes: Index of each transaction's category in categories
+        categories: Category names, indexed by category code
+    """
+    
+    def __init__(
+        self,
+        date_ordinals: np.ndarray,
+        month_keys: np.ndarray,
+        amount_cents: np.ndarray,
+        is_income: np.ndarray,
+        category_codes: np.ndarray,
+        categories: List[str],
+    ) -> None:
+        """Initialize the frame from its columns.
+        
+        Args:
+            date_ordinals: Proleptic Gregorian ordinal of each transaction date
+            month_keys: year * 12 + (month - 1) of each transaction date
+            amount_cents: Amount of each transaction in integer cents
+            is_income: True for income transactions, False for expenses
+            category_codes: Index of each transaction's category in categories
+            categories: Category names, indexed by category code
+        """
+        self.date_ordinals = date_ordinals
+        self.month_keys = month_keys
+        self.amount_cents = amount_cents
+        self.is_income = is_income
+        self.category_codes = category_codes
+        self.categories = categories
+    
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> "TransactionFrame":
+        """Build a frame from Transaction objects.
+        
+        Args:
+            transactions: Transactions to include
+            
+        Returns:
+            TransactionFrame instance
+        """
+        category_index: Dict[str, int] = {}
+        date_ordinals = []
+        month_keys = []
+        amount_cents = []
+        is_income = []
+        category_codes = []
+        
+        for transaction in transactions:
+            transaction_date = transaction.date
+            date_ordinals.append(transaction_date.toordinal())
+            month_keys.append(transaction_date.year * 12 + transaction_date.month - 1)
+            cents = getattr(transaction, "amount_cents", None)
+            amount_cents.append(cents if cents is not None else round(transaction.amount * 100))
+            is_income.append(transaction.type == "income")
+            category_codes.append(
+                category_index.setdefault(transaction.category, len(category_index))
+            )
+        
+        return cls(
+            date_ordinals=np.array(date_ordinals, dtype=np.int32),
+            month_keys=np.array(month_keys, dtype=np.int32),
+            amount_cents=np.array(amount_cents, dtype=np.int64),
+            is_income=np.array(is_income, dtype=bool),
+            category_codes=np.array(category_codes, dtype=np.int32),
+            categories=list(category_index),
+        )
+    
+    def __len__(self) -> int:
+        """Get the number of transactions in the frame.
+        
+        Returns:
+            Number of transactions
+        """
+        return len(self.amount_cents)
+    
+    def _mask(
+        self,
+        transaction_type: Optional[str] = None,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> np.ndarray:
+        """Build a row mask for a type and month filter.
+        
+        Args:
+            transaction_type: Type to keep ('income' or 'expense'), or None for all
+            year: Year to keep, requires month
+            month: Month (1-12) to keep, requires year
+            
+        Returns:
+            Boolean array selecting the matching rows
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if transaction_type == "income":
+            mask &= self.is_income
+        elif transaction_type == "expense":
+            mask &= ~self.is_income
+        if year is not None and month is not None:
+            mask &= self.month_keys == year * 12 + month - 1
+        return mask
+    
+    def supports_aggregation(self) -> bool:
+        """Whether this frame can compute totals.
+        
+        Returns:
+            Always True
+        """
+        return True
+    
+    def sum_by_type(self) -> Dict[str, float]:
+        """Sum transaction amounts by type.
+        
+        Returns:
+            Dictionary with 'income' and 'expense' totals
+        """
+        income_cents = int(self.amount_cents[self.is_income].sum())
+        expense_cents = int(self.amount_cents.sum()) - income_cents
+        return {"income": income_cents / 100, "expense": expense_cents / 100}
+    
+    def sum_by_category(
+        self,
+        transaction_type: Optional[str] = None,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> Dict[str, float]:
+        """Sum transaction amounts by category.
+        
+        Args:
+            transaction_type: Type to sum ('income' or 'expense'), or None for
+                the net amount (income - expenses) per category
+            year: Year to restrict the sums to, requires month
+            month: Month (1-12) to restrict the sums to, requires year
+            
+        Returns:
+            Dictionary mapping category names to totals
+        """
+        mask = self._mask(transaction_type, year, month)
+        codes = self.category_codes[mask]
+        amounts = self.amount_cents[mask]
+        if transaction_type is None:
+            amounts = np.where(self.is_income[mask], amounts, -amounts)
+        
+        minlength = len(self.categories)
+        counts = np.bincount(codes, minlength=minlength)
+        totals = np.bincount(codes, weights=amounts, minlength=minlength)
+        return {
+            self.categories[code]: int(totals[code]) / 100
+            for code in np.flatnonzero(counts)
+        }
+    
+    def sum_by_month(
+        self,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> Dict[Tuple[int, int], Dict[str, float]]:
+        """Sum transaction amounts by month and type.
+        
+        Args:
+            year: Year to restrict the sums to, requires month
+            month: Month (1-12) to restrict the sums to, requires year
+            
+        Returns:
+            Dictionary mapping (year, month) to 'income' and 'expense' totals
+        """
+        mask = self._mask(None, year, month)
+        keys, inverse = np.unique(self.month_keys[mask], return_inverse=True)
+        amounts = self.amount_cents[mask]
+        is_income = self.is_income[mask]
+        
+        income = np.bincount(inverse, weights=np.where(is_income, amounts, 0), minlength=len(keys))
+        expense = np.bincount(inverse, weights=np.where(is_income, 0, amounts), minlength=len(keys))
+        return {
+            (int(key) // 12, int(key) % 12 + 1): {
+                "income": int(income[i]) / 100,
+                "expense": int(expense[i]) / 100,
+            }
+            for i, key in enumerate(keys)
+        }
+    
+    def sum_by_month_and_category(self) -> Dict[Tuple[int, int], Dict[str, Dict[str, float]]]:
+        """Sum transaction amounts by month, category and type.
+        
+        Returns:
+            Dictionary mapping (year, month) to dictionaries mapping category
+            names to 'income' and 'expense' totals
+        """
+        category_count = max(len(self.categories), 1)
+        group_keys = self.month_keys.astype(np.int64) * category_count + self.category_codes
+        keys, inverse = np.unique(group_keys, return_inverse=True)
+        amounts = self.amount_cents
+        
+        income = np.bincount(inverse, weights=np.where(self.is_income, amounts, 0), minlength=len(keys))
+        expense = np.bincount(inverse, weights=np.where(self.is_income, 0, amounts), minlength=len(keys))
+        months: Dict[Tuple[int, int], Dict[str, Dict[str, float]]] = {}
+        for i, key in enumerate(keys.tolist()):
+            month_key, code = divmod(key, category_count)
+            months.setdefault((month_key // 12, month_key % 12 + 1), {})[self.categories[code]] = {
+                "income": int(income[i]) / 100,
+                "expense": int(expense[i]) / 100,
+            }
+        return months
@@ -1,12 +1,52 @@
 """Transaction service for managing transaction-related business logic."""
 
+import calendar
+import csv
+import heapq
+import time
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import date
-from typing import List
+from itertools import islice
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
 
 from models.transaction import Transaction
 from storage.storage_handler import StorageHandler
 
 
+# Column order of exported files, readable by TransactionImporter
+EXPORT_COLUMNS = ["date", "amount", "category", "description", "type", "id"]
+
+
+@dataclass
+class ImportReport:
+    """Outcome of a bulk import.
+    
+    Attributes:
+        added: Number of transactions saved
+        duplicates: Number of transactions skipped as already stored
+        invalid: Number of input rows rejected by validation
+        errors: Messages describing the first rejected rows
+        seconds: Wall-clock duration of the import
+    """
+    
+    added: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    errors: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+    
+    @property
+    def rows(self) -> int:
+        """Number of input rows processed."""
+        return self.added + self.duplicates + self.invalid
+    
+    @property
+    def rows_per_second(self) -> float:
+        """Import throughput in input rows per second."""
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
 class TransactionService:
     """Service for managing transactions.
     
@@ -52,6 +92,75 @@ class TransactionService:
         self.storage.save_transaction(transaction)
         return transaction
     
+    @staticmethod
+    def _fingerprint(transaction: Transaction) -> Tuple:
+        """Get the key used to recognize a transaction that is already stored.
+        
+        Args:
+            transaction: Transaction to fingerprint
+            
+        Returns:
+            Hashable tuple of the transaction's fields, without its ID
+        """
+        return (
+            transaction.date,
+            round(transaction.amount * 100),
+            transaction.category,
+            transaction.description,
+            transaction.type,
+        )
+    
+    def add_transactions(
+        self,
+        transactions: Iterable[Transaction],
+        chunk_size: int = 500,
+        skip_duplicates: bool = True,
+    ) -> ImportReport:
+        """Add many transactions, committing them in chunks.
+        
+        The input is consumed lazily and each chunk is saved with a single
+        storage write. Transactions matching stored ones on every field but
+        the ID are skipped, using a hash index of the stored transactions
+        built once up front. Identical rows are counted, so an input with
+        two equal transactions adds the second one if only one is stored.
+        
+        Args:
+            transactions: Transactions to add
+            chunk_size: Number of transactions saved per storage write
+            skip_duplicates: Whether to skip transactions already stored
+            
+        Returns:
+            ImportReport with the added and duplicate counts
+        """
+        started = time.perf_counter()
+        report = ImportReport()
+        
+        stored: Counter = Counter()
+        if skip_duplicates:
+            stored.update(self._fingerprint(t) for t in self.get_all_transactions())
+        seen: Counter = Counter()
+        
+        chunk: List[Transaction] = []
+        for transaction in transactions:
+            if skip_duplicates:
+                key = self._fingerprint(transaction)
+                seen[key] += 1
+                if seen[key] <= stored[key]:
+                    report.duplicates += 1
+                    continue
+            chunk.append(transaction)
+            if len(chunk) >= chunk_size:
+                self.storage.save_transactions(chunk)
+                report.added += len(chunk)
+                chunk = []
+        
+        if chunk:
+            self.storage.save_transactions(chunk)
+            report.added += len(chunk)
+        
+        report.seconds = time.perf_counter() - started
+        return report
+    
     def get_all_transactions(self) -> List[Transaction]:
         """Retrieve all transactions.
         
@@ -60,6 +169,259 @@ class TransactionService:
         """
         return self.storage.load_all_transactions()
     
+    def get_transaction(self, transaction_id: str) -> Optional[Transaction]:
+        """Retrieve a single transaction by ID.
+        
+        Args:
+            transaction_id: ID of the transaction to retrieve
+            
+        Returns:
+            Transaction object, or None if not found
+        """
+        return self.storage.get_transaction(transaction_id)
+    
+    def iter_transactions(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        transaction_type: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> Iterator[Transaction]:
+        """Stream transactions matching optional filters.
+        
+        Transactions are streamed from the storage when it supports it, so
+        callers can process them without holding all of them in memory.
+        
+        Args:
+            start_date: Earliest date to include
+            end_date: Latest date to include
+            transaction_type: Type to include ('income' or 'expense')
+            category: Category to include
+            
+        Yields:
+            Transaction objects matching every given filter
+        """
+        iterate = getattr(self.storage, "iter_transactions", None)
+        transactions = iterate() if iterate is not None else self.get_all_transactions()
+        for transaction in transactions:
+            if start_date is not None and transaction.date < start_date:
+                continue
+            if end_date is not None and transaction.date > end_date:
+                continue
+            if transaction_type is not None and transaction.type != transaction_type:
+                continue
+            if category is not None and transaction.category != category:
+                continue
+            yield transaction
+    
+    def export_csv(
+        self,
+        file: IO[str],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        transaction_type: Optional[str] = None,
+        category: Optional[str] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        """Write transactions to a CSV file in chunks.
+        
+        Args:
+            file: Text stream to write to, opened with newline=""
+            start_date: Earliest date to include
+            end_date: Latest date to include
+            transaction_type: Type to include ('income' or 'expense')
+            category: Category to include
+            chunk_size: Number of transactions written at a time
+            
+        Returns:
+            Number of transactions written
+        """
+        writer = csv.writer(file)
+        writer.writerow(EXPORT_COLUMNS)
+        transactions = self.iter_transactions(start_date, end_date, transaction_type, category)
+        
+        count = 0
+        while True:
+            chunk = list(islice(transactions, chunk_size))
+            if not chunk:
+                return count
+            writer.writerows(
+                [
+                    transaction.date.isoformat(),
+                    f"{transaction.amount:.2f}",
+                    transaction.category,
+                    transaction.description,
+                    transaction.type,
+                    transaction.id,
+                ]
+                for transaction in chunk
+            )
+            count += len(chunk)
+    
+    def export_parquet(
+        self,
+        file: IO[bytes],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        transaction_type: Optional[str] = None,
+        category: Optional[str] = None,
+        chunk_size: int = 20000,
+    ) -> int:
+        """Write transactions to a Parquet file, one row group per chunk.
+        
+        Requires the pyarrow package.
+        
+        Args:
+            file: Binary stream or path to write to
+            start_date: Earliest date to include
+            end_date: Latest date to include
+            transaction_type: Type to include ('income' or 'expense')
+            category: Category to include
+            chunk_size: Number of transactions per row group
+            
+        Returns:
+            Number of transactions written
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        schema = pa.schema([
+            ("date", pa.date32()),
+            ("amount", pa.float64()),
+            ("category", pa.string()),
+            ("description", pa.string()),
+            ("type", pa.string()),
+            ("id", pa.string()),
+        ])
+        transactions = self.iter_transactions(start_date, end_date, transaction_type, category)
+        
+        count = 0
+        with pq.ParquetWriter(file, schema) as writer:
+            while True:
+                chunk = list(islice(transactions, chunk_size))
+                if not chunk:
+                    return count
+                writer.write_batch(pa.record_batch(
+                    [
+                        [t.date for t in chunk],
+                        [t.amount for t in chunk],
+                        [t.category for t in chunk],
+                        [t.description for t in chunk],
+                        [t.type for t in chunk],
+                        [t.id for t in chunk],
+                    ],
+                    schema=schema,
+                ))
+                count += len(chunk)
+    
+    def get_recent(
+        self,
+        limit: int = 10,
+        offset: int = 0,
+        before: Optional[Tuple[date, str]] = None,
+    ) -> List[Transaction]:
+        """Retrieve the newest transactions, one page at a time.
+        
+        Pages are keyset-paginated: pass the ``recent_cursor`` of the last
+        transaction of a page as ``before`` to get the next one. The storage's
+        date ordering is used when available, so no full sort is needed.
+        
+        Args:
+            limit: Maximum number of transactions to return
+            offset: Number of transactions to skip after the cursor
+            before: (date, ID) cursor; only older transactions are returned
+            
+        Returns:
+            List of Transaction objects ordered by date, then ID (newest first)
+        """
+        recent = getattr(self.storage, "get_recent_transactions", None)
+        if recent is not None:
+            transactions = recent(limit + offset, before)
+        else:
+            candidates = self.get_all_transactions()
+            if before is not None:
+                candidates = [t for t in candidates if self.recent_cursor(t) < before]
+            transactions = heapq.nlargest(limit + offset, candidates, key=self.recent_cursor)
+        return transactions[offset:]
+    
+    @staticmethod
+    def recent_cursor(transaction: Transaction) -> Tuple[date, str]:
+        """Get the keyset cursor of a transaction for ``get_recent``.
+        
+        Args:
+            transaction: Transaction to get the cursor of
+            
+        Returns:
+            Tuple of (date, ID)
+        """
+        return (transaction.date, transaction.id)
+    
+    def get_transactions_between(self, start_date: date, end_date: date) -> List[Transaction]:
+        """Retrieve the transactions dated within a range.
+        
+        Storage backends with a date index answer this without scanning
+        every transaction.
+        
+        Args:
+            start_date: First date of the range
+            end_date: Last date of the range (inclusive)
+            
+        Returns:
+            List of Transaction objects ordered by date
+        """
+        between = getattr(self.storage, "get_transactions_between", None)
+        if between is not None:
+            return between(start_date, end_date)
+        return sorted(
+            (t for t in self.get_all_transactions() if start_date <= t.date <= end_date),
+            key=lambda t: t.date,
+        )
+    
+    def get_transactions_for_month(self, year: int, month: int) -> List[Transaction]:
+        """Retrieve the transactions of one month.
+        
+        Args:
+            year: Year of the month
+            month: Month (1-12)
+            
+        Returns:
+            List of Transaction objects ordered by date
+        """
+        last_day = calendar.monthrange(year, month)[1]
+        return self.get_transactions_between(date(year, month, 1), date(year, month, last_day))
+    
+    def get_transactions_for_quarter(self, year: int, quarter: int) -> List[Transaction]:
+        """Retrieve the transactions of one quarter.
+        
+        Args:
+            year: Year of the quarter
+            quarter: Quarter (1-4)
+            
+        Returns:
+            List of Transaction objects ordered by date
+            
+        Raises:
+            ValueError: If quarter is not between 1 and 4
+        """
+        if quarter not in (1, 2, 3, 4):
+            raise ValueError("Quarter must be between 1 and 4")
+        last_month = quarter * 3
+        last_day = calendar.monthrange(year, last_month)[1]
+        return self.get_transactions_between(
+            date(year, last_month - 2, 1), date(year, last_month, last_day)
+        )
+    
+    def get_transactions_for_year(self, year: int) -> List[Transaction]:
+        """Retrieve the transactions of one year.
+        
+        Args:
+            year: Year to retrieve
+            
+        Returns:
+            List of Transaction objects ordered by date
+        """
+        return self.get_transactions_between(date(year, 1, 1), date(year, 12, 31))
+    
     def get_transactions_by_category(self, category: str) -> List[Transaction]:
         """Filter transactions by category.
         
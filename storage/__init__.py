@@ -1,7 +1,13 @@
 """Storage package for data persistence."""
 
 from .storage_handler import StorageHandler
+from .sqlite_storage import SqliteStorageHandler
 from .supabase_storage import SupabaseStorageHandler
 from .hybrid_storage import HybridStorageHandler
 
-__all__ = ["StorageHandler", "SupabaseStorageHandler", "HybridStorageHandler"]
+__all__ = [
+    "StorageHandler",
+    "SqliteStorageHandler",
+    "SupabaseStorageHandler",
+    "HybridStorageHandler",
+]
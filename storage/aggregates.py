@@ -0,0 +1,262 @@
+"""Running totals of transactions, maintained incrementally on writes."""
+
+import hashlib
+import json
+from typing import Dict, List, Optional, Tuple
+
+from models.transaction import Transaction
+
+
+class RunningAggregates:
+    """Incrementally maintained totals by type, category and month.
+    
+    Every total is kept as a [count, cents] pair so adding or removing a
+    transaction is O(1) and a group disappears once its last transaction is
+    removed. Amounts are summed as integer cents to avoid float drift.
+    
+    Attributes:
+        signature: Signature of the data files these totals were computed for
+    """
+    
+    def __init__(self, signature: Optional[list] = None) -> None:
+        """Initialize empty aggregates.
+        
+        Args:
+            signature: Signature of the data files the totals describe
+        """
+        self.signature = signature
+        self._by_type: Dict[str, List[int]] = {}
+        self._by_category: Dict[Tuple[str, str], List[int]] = {}
+        self._by_month: Dict[Tuple[int, int], Dict[Tuple[str, str], List[int]]] = {}
+    
+    @classmethod
+    def from_transactions(cls, transactions, signature: Optional[list] = None) -> "RunningAggregates":
+        """Build aggregates from scratch.
+        
+        Args:
+            transactions: Iterable of Transaction objects
+            signature: Signature of the data files the totals describe
+            
+        Returns:
+            RunningAggregates instance
+        """
+        aggregates = cls(signature)
+        for transaction in transactions:
+            aggregates.add(transaction)
+        return aggregates
+    
+    @staticmethod
+    def _apply(groups: dict, key, cents: int, count: int) -> None:
+        """Apply a count and amount delta to one group.
+        
+        Args:
+            groups: Dictionary of [count, cents] pairs
+            key: Group key
+            cents: Amount delta in cents
+            count: Count delta (1 or -1)
+        """
+        totals = groups.get(key)
+        if totals is None:
+            totals = groups[key] = [0, 0]
+        totals[0] += count
+        totals[1] += cents
+        if totals[0] <= 0:
+            del groups[key]
+    
+    def _update(self, transaction: Transaction, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) a transaction from every total.
+        
+        Args:
+            transaction: Transaction to apply
+            sign: 1 to add, -1 to remove
+        """
+        cents = getattr(transaction, "amount_cents", None)
+        if cents is None:
+            cents = round(transaction.amount * 100)
+        cents *= sign
+        month_key = (transaction.date.year, transaction.date.month)
+        category_key = (transaction.type, transaction.category)
+        
+        self._apply(self._by_type, transaction.type, cents, sign)
+        self._apply(self._by_category, category_key, cents, sign)
+        month = self._by_month.setdefault(month_key, {})
+        self._apply(month, category_key, cents, sign)
+        if not month:
+            del self._by_month[month_key]
+    
+    def add(self, transaction: Transaction) -> None:
+        """Add a transaction to the totals.
+        
+        Args:
+            transaction: Transaction to add
+        """
+        self._update(transaction, 1)
+    
+    def remove(self, transaction: Transaction) -> None:
+        """Remove a previously added transaction from the totals.
+        
+        Args:
+            transaction: Transaction to remove
+        """
+        self._update(transaction, -1)
+    
+    def sum_by_type(self) -> Dict[str, float]:
+        """Sum transaction amounts by type.
+        
+        Returns:
+            Dictionary with 'income' and 'expense' totals
+        """
+        return {
+            transaction_type: self._by_type.get(transaction_type, [0, 0])[1] / 100
+            for transaction_type in ("income", "expense")
+        }
+    
+    def sum_by_category(
+        self,
+        transaction_type: Optional[str] = None,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> Dict[str, float]:
+        """Sum transaction amounts by category.
+        
+        Args:
+            transaction_type: Type to sum ('income' or 'expense'), or None for
+                the net amount (income - expenses) per category
+            year: Year to restrict the sums to, requires month
+            month: Month (1-12) to restrict the sums to, requires year
+            
+        Returns:
+            Dictionary mapping category names to totals
+        """
+        if year is not None and month is not None:
+            groups = self._by_month.get((year, month), {})
+        else:
+            groups = self._by_category
+        
+        cents: Dict[str, int] = {}
+        for (group_type, category), (_, total) in groups.items():
+            if transaction_type is None:
+                delta = total if group_type == "income" else -total
+            elif group_type == transaction_type:
+                delta = total
+            else:
+                continue
+            cents[category] = cents.get(category, 0) + delta
+        return {category: total / 100 for category, total in cents.items()}
+    
+    def sum_by_month(
+        self,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> Dict[Tuple[int, int], Dict[str, float]]:
+        """Sum transaction amounts by month and type.
+        
+        Args:
+            year: Year to restrict the sums to, requires month
+            month: Month (1-12) to restrict the sums to, requires year
+            
+        Returns:
+            Dictionary mapping (year, month) to 'income' and 'expense' totals
+        """
+        if year is not None and month is not None:
+            keys = [(year, month)] if (year, month) in self._by_month else []
+        else:
+            keys = list(self._by_month)
+        
+        months: Dict[Tuple[int, int], Dict[str, float]] = {}
+        for key in keys:
+            cents = {"income": 0, "expense": 0}
+            for (group_type, _), (_, total) in self._by_month[key].items():
+                cents[group_type] += total
+            months[key] = {
+                "income": cents["income"] / 100,
+                "expense": cents["expense"] / 100,
+            }
+        return months
+    
+    def sum_by_month_and_category(self) -> Dict[Tuple[int, int], Dict[str, Dict[str, float]]]:
+        """Sum transaction amounts by month, category and type.
+        
+        Returns:
+            Dictionary mapping (year, month) to dictionaries mapping category
+            names to 'income' and 'expense' totals
+        """
+        months: Dict[Tuple[int, int], Dict[str, Dict[str, float]]] = {}
+        for key, groups in self._by_month.items():
+            categories = months[key] = {}
+            for (group_type, category), (_, total) in groups.items():
+                totals = categories.setdefault(category, {"income": 0.0, "expense": 0.0})
+                totals[group_type] = total / 100
+        return months
+    
+    def _entries(self) -> List[list]:
+        """Flatten the per-month totals into serializable entries.
+        
+        The type and overall category totals are derived from these on load.
+        
+        Returns:
+            List of [year, month, type, category, count, cents] entries
+        """
+        return [
+            [year, month, group_type, category, count, cents]
+            for (year, month), groups in self._by_month.items()
+            for (group_type, category), (count, cents) in groups.items()
+        ]
+    
+    @staticmethod
+    def _checksum(signature: Optional[list], entries: List[list]) -> str:
+        """Compute the checksum stored alongside serialized aggregates.
+        
+        Args:
+            signature: Signature of the data files the totals describe
+            entries: Serialized per-month totals
+            
+        Returns:
+            Hex digest of the signature and entries
+        """
+        payload = json.dumps([signature, entries], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def to_dict(self) -> dict:
+        """Convert the aggregates to a dictionary for storage.
+        
+        Returns:
+            Dictionary with the signature, entries and checksum
+        """
+        entries = self._entries()
+        return {
+            "signature": self.signature,
+            "entries": entries,
+            "checksum": self._checksum(self.signature, entries),
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> Optional["RunningAggregates"]:
+        """Restore aggregates from a dictionary, verifying the checksum.
+        
+        Args:
+            data: Dictionary produced by to_dict
+            
+        Returns:
+            RunningAggregates instance, or None if the data is corrupt
+        """
+        try:
+            signature = data["signature"]
+            entries = data["entries"]
+            if cls._checksum(signature, entries) != data["checksum"]:
+                return None
+            
+            aggregates = cls(signature)
+            for year, month, group_type, category, count, cents in entries:
+                category_key = (group_type, category)
+                aggregates._by_month.setdefault((year, month), {})[category_key] = [count, cents]
+                for groups, key in (
+                    (aggregates._by_type, group_type),
+                    (aggregates._by_category, category_key),
+                ):
+                    totals = groups.setdefault(key, [0, 0])
+                    totals[0] += count
+                    totals[1] += cents
+            return aggregates
+        except (KeyError, TypeError, ValueError):
+            return None
@@ -0,0 +1,296 @@
+"""Memory-mapped binary snapshot format for local transaction storage."""
+
+import json
+import mmap
+import os
+import struct
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+import numpy as np
+
+from models.transaction import Transaction
+
+
+MAGIC = b"MMTXSNAP"
+FORMAT_VERSION = 1
+
+# Magic, format version, row count, category count, string table size
+HEADER = struct.Struct("<8sIQIQ")
+
+# Sections after the header, each starting on an 8-byte boundary. Offset
+# arrays index into the string table and hold one more entry than strings.
+SECTIONS: Tuple[Tuple[str, str], ...] = (
+    ("date_ordinals", "<i4"),
+    ("month_keys", "<i4"),
+    ("amount_cents", "<i8"),
+    ("is_income", "|b1"),
+    ("category_codes", "<i4"),
+    ("id_offsets", "<u8"),
+    ("description_offsets", "<u8"),
+    ("category_offsets", "<u8"),
+    ("strings", "|u1"),
+)
+
+
+def _layout(
+    count: int,
+    category_count: int,
+    strings_size: int,
+) -> Tuple[Dict[str, Tuple[int, np.dtype, int]], int]:
+    """Compute where each section of a snapshot is stored.
+    
+    Args:
+        count: Number of transactions
+        category_count: Number of distinct categories
+        strings_size: Size of the string table in bytes
+        
+    Returns:
+        Tuple of (section name -> (offset, dtype, length), total file size)
+    """
+    lengths = {
+        "id_offsets": count + 1,
+        "description_offsets": count + 1,
+        "category_offsets": category_count + 1,
+        "strings": strings_size,
+    }
+    layout = {}
+    offset = HEADER.size
+    for name, dtype_name in SECTIONS:
+        dtype = np.dtype(dtype_name)
+        length = lengths.get(name, count)
+        offset += -offset % 8
+        layout[name] = (offset, dtype, length)
+        offset += dtype.itemsize * length
+    return layout, offset
+
+
+def _string_offsets(encoded: List[bytes], start: int) -> np.ndarray:
+    """Compute string table offsets for a run of encoded strings.
+    
+    Args:
+        encoded: Encoded strings, stored back to back
+        start: Offset of the first string in the string table
+        
+    Returns:
+        Start offset of each string, plus the end of the last one
+    """
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return offsets + np.uint64(start)
+
+
+def write_snapshot(file_path: Union[str, Path], transactions: Iterable[Transaction]) -> int:
+    """Write transactions to a binary snapshot file.
+    
+    Amounts are stored as integer cents, so amounts with more than two
+    decimals are rounded.
+    
+    Args:
+        file_path: Path of the snapshot file to write
+        transactions: Transaction or CompactTransaction objects to store
+        
+    Returns:
+        Number of transactions written
+    """
+    category_index: Dict[str, int] = {}
+    date_ordinals = []
+    month_keys = []
+    amount_cents = []
+    is_income = []
+    category_codes = []
+    ids = []
+    descriptions = []
+    
+    for transaction in transactions:
+        transaction_date = transaction.date
+        date_ordinals.append(transaction_date.toordinal())
+        month_keys.append(transaction_date.year * 12 + transaction_date.month - 1)
+        cents = getattr(transaction, "amount_cents", None)
+        amount_cents.append(cents if cents is not None else round(transaction.amount * 100))
+        is_income.append(transaction.type == "income")
+        category_codes.append(
+            category_index.setdefault(transaction.category, len(category_index))
+        )
+        ids.append(transaction.id.encode("utf-8"))
+        descriptions.append(transaction.description.encode("utf-8"))
+    
+    categories = [category.encode("utf-8") for category in category_index]
+    strings = b"".join(ids) + b"".join(descriptions) + b"".join(categories)
+    
+    id_offsets = _string_offsets(ids, 0)
+    description_offsets = _string_offsets(descriptions, int(id_offsets[-1]))
+    columns = {
+        "date_ordinals": date_ordinals,
+        "month_keys": month_keys,
+        "amount_cents": amount_cents,
+        "is_income": is_income,
+        "category_codes": category_codes,
+        "id_offsets": id_offsets,
+        "description_offsets": description_offsets,
+        "category_offsets": _string_offsets(categories, int(description_offsets[-1])),
+        "strings": np.frombuffer(strings, dtype=np.uint8),
+    }
+    
+    count = len(date_ordinals)
+    layout, size = _layout(count, len(categories), len(strings))
+    with open(file_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, count, len(categories), len(strings)))
+        for name, (offset, dtype, _) in layout.items():
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(np.asarray(columns[name], dtype=dtype).tobytes())
+        f.write(b"\0" * (size - f.tell()))
+    return count
+
+
+class BinarySnapshot:
+    """Read-only view of a binary transactions snapshot.
+    
+    A snapshot stores transactions column by column: fixed-width arrays of
+    date ordinals, month keys, integer-cent amounts, income flags and
+    category codes, followed by a UTF-8 string table holding the IDs,
+    descriptions and category names. The file is memory-mapped, and the
+    fixed-width columns are NumPy arrays over the mapping, so reading them
+    copies and parses nothing.
+    
+    The mapping stays open as long as the snapshot or any array taken from
+    it is referenced.
+    """
+    
+    def __init__(self, file_path: Union[str, Path]) -> None:
+        """Map a snapshot file.
+        
+        Args:
+            file_path: Path of the snapshot file
+            
+        Raises:
+            ValueError: If the file is not a valid snapshot
+        """
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise ValueError(f"Not a transactions snapshot: {file_path}")
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, version, count, category_count, strings_size = HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            raise ValueError(f"Not a transactions snapshot: {file_path}")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format version {version}: {file_path}")
+        layout, size = _layout(count, category_count, strings_size)
+        if len(self._buffer) < size:
+            raise ValueError(f"Truncated transactions snapshot: {file_path}")
+        
+        self._columns = {
+            name: np.frombuffer(self._buffer, dtype=dtype, count=length, offset=offset)
+            for name, (offset, dtype, length) in layout.items()
+        }
+        self._categories = None
+    
+    def __len__(self) -> int:
+        """Get the number of transactions in the snapshot.
+        
+        Returns:
+            Number of transactions
+        """
+        return len(self._columns["date_ordinals"])
+    
+    def _decode_strings(self, offsets: np.ndarray) -> List[str]:
+        """Decode a run of strings from the string table.
+        
+        Args:
+            offsets: Start offset of each string, plus the end of the last one
+            
+        Returns:
+            Decoded strings
+        """
+        if len(offsets) < 2:
+            return []
+        start = int(offsets[0])
+        data = self._columns["strings"][start:int(offsets[-1])].tobytes()
+        bounds = (offsets - start).tolist()
+        return [data[a:b].decode("utf-8") for a, b in zip(bounds, bounds[1:])]
+    
+    @property
+    def categories(self) -> List[str]:
+        """Category names, indexed by category code."""
+        if self._categories is None:
+            self._categories = self._decode_strings(self._columns["category_offsets"])
+        return self._categories
+    
+    def columns(self) -> Dict[str, Any]:
+        """Get the fixed-width columns without copying them.
+        
+        Returns:
+            Dictionary with read-only 'date_ordinals', 'month_keys',
+            'amount_cents', 'is_income' and 'category_codes' arrays and the
+            'categories' list, matching TransactionFrame's arguments
+        """
+        columns: Dict[str, Any] = {
+            name: self._columns[name]
+            for name in ("date_ordinals", "month_keys", "amount_cents", "is_income", "category_codes")
+        }
+        columns["categories"] = list(self.categories)
+        return columns
+    
+    def records(self) -> Iterator[dict]:
+        """Iterate over the transactions as dictionaries.
+        
+        Yields:
+            Transaction dictionaries in the format of Transaction.to_dict
+        """
+        categories = self.categories
+        ids = self._decode_strings(self._columns["id_offsets"])
+        descriptions = self._decode_strings(self._columns["description_offsets"])
+        dates: Dict[int, str] = {}
+        
+        for tid, ordinal, cents, income, code, description in zip(
+            ids,
+            self._columns["date_ordinals"].tolist(),
+            self._columns["amount_cents"].tolist(),
+            self._columns["is_income"].tolist(),
+            self._columns["category_codes"].tolist(),
+            descriptions,
+        ):
+            day = dates.get(ordinal)
+            if day is None:
+                day = dates[ordinal] = date.fromordinal(ordinal).isoformat()
+            yield {
+                "id": tid,
+                "date": day,
+                "amount": cents / 100,
+                "category": categories[code],
+                "description": description,
+                "type": "income" if income else "expense",
+            }
+
+
+def json_to_snapshot(json_path: Union[str, Path], snapshot_path: Union[str, Path]) -> int:
+    """Convert a JSON transactions file to a binary snapshot.
+    
+    Args:
+        json_path: Path of the JSON file, a list of transaction dictionaries
+        snapshot_path: Path of the snapshot file to write
+        
+    Returns:
+        Number of transactions converted
+    """
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return write_snapshot(snapshot_path, (Transaction.from_dict(item) for item in data))
+
+
+def snapshot_to_json(snapshot_path: Union[str, Path], json_path: Union[str, Path]) -> int:
+    """Convert a binary snapshot to a JSON transactions file.
+    
+    Args:
+        snapshot_path: Path of the snapshot file
+        json_path: Path of the JSON file to write
+        
+    Returns:
+        Number of transactions converted
+    """
+    records = list(BinarySnapshot(snapshot_path).records())
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=2, ensure_ascii=False)
+    return len(records)
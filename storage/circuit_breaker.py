@@ -0,0 +1,226 @@
+"""Circuit breaker for calls to a remote service."""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+
+class CircuitBreaker:
+    """Stops calling a remote service that keeps failing.
+    
+    While the circuit is closed calls go through, each bounded by
+    ``call_timeout``. After ``failure_threshold`` consecutive failures or
+    timeouts the circuit opens and calls are rejected immediately with
+    CircuitOpenError, so callers fall back without waiting. Once the retry
+    delay has passed the circuit is half-open: a single probe call is let
+    through, which closes the circuit if it succeeds. A failed probe
+    reopens it with the delay doubled, up to ``max_reset_timeout``.
+    
+    Calls that time out keep running on their daemon thread, but their
+    outcome is ignored. Errors for which ``is_failure`` returns False, e.g.
+    a request the service rejected as invalid, show the service is up: they
+    are raised to the caller but count as successes.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        call_timeout: float = 5.0,
+        reset_timeout: float = 5.0,
+        max_reset_timeout: float = 300.0,
+        is_failure: Optional[Callable[[BaseException], bool]] = None,
+    ) -> None:
+        """Initialize a closed circuit breaker.
+        
+        Args:
+            failure_threshold: Consecutive failures after which the circuit opens
+            call_timeout: Default maximum number of seconds a call may take
+            reset_timeout: Seconds before the first probe after the circuit opens
+            max_reset_timeout: Upper bound for the doubled probe delay
+            is_failure: Function telling whether an error raised by a call
+                counts as a failure, None to count every error
+        """
+        self.failure_threshold = failure_threshold
+        self.call_timeout = call_timeout
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.is_failure = is_failure
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._delay = reset_timeout
+        self._retry_at = 0.0
+        self._probing = False
+        self._successes = 0
+        self._failures = 0
+        self._rejected = 0
+        self._last_error: Optional[str] = None
+    
+    @property
+    def state(self) -> str:
+        """Current state: 'closed', 'open' or 'half_open'."""
+        with self._lock:
+            return self._current_state()
+    
+    def _current_state(self) -> str:
+        """Get the current state, half-open once a probe is due.
+        
+        Must be called with the lock held.
+        
+        Returns:
+            Current state
+        """
+        if self._state == self.OPEN and (self._probing or time.monotonic() >= self._retry_at):
+            return self.HALF_OPEN
+        return self._state
+    
+    def available(self) -> bool:
+        """Whether a call would currently be attempted.
+        
+        Returns:
+            True if the circuit is closed or a probe is due
+        """
+        with self._lock:
+            state = self._current_state()
+            return state == self.CLOSED or (state == self.HALF_OPEN and not self._probing)
+    
+    def allow(self) -> bool:
+        """Ask to make a call, claiming the probe if one is due.
+        
+        Every allowed call must be followed by ``record_success`` or
+        ``record_failure``.
+        
+        Returns:
+            True if the call may be made
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self._rejected += 1
+            return False
+    
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit."""
+        with self._lock:
+            self._successes += 1
+            self._consecutive_failures = 0
+            self._state = self.CLOSED
+            self._delay = self.reset_timeout
+            self._probing = False
+    
+    def record_failure(self, error: BaseException) -> None:
+        """Record a failed call, opening the circuit if needed.
+        
+        Args:
+            error: Exception raised by the call
+        """
+        with self._lock:
+            self._failures += 1
+            self._consecutive_failures += 1
+            self._last_error = str(error) or type(error).__name__
+            if self._probing:
+                # The service is still down, so wait longer before the next probe
+                self._probing = False
+                self._delay = min(self._delay * 2, self.max_reset_timeout)
+                self._open()
+            elif self._state == self.CLOSED and self._consecutive_failures >= self.failure_threshold:
+                self._open()
+    
+    def _open(self) -> None:
+        """Open the circuit until the current delay has passed.
+        
+        Must be called with the lock held.
+        """
+        self._state = self.OPEN
+        self._retry_at = time.monotonic() + self._delay
+    
+    def call(self, func: Callable[..., T], *args: Any, timeout: Optional[float] = None) -> T:
+        """Call a function through the breaker.
+        
+        Args:
+            func: Function making the remote call
+            *args: Arguments for the function
+            timeout: Maximum number of seconds to wait, defaults to call_timeout
+            
+        Returns:
+            Result of the function
+            
+        Raises:
+            CircuitOpenError: If the circuit is open
+            TimeoutError: If the call did not finish in time
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"Circuit open, retrying in {self.retry_in():.0f}s")
+        
+        outcome: Dict[str, Any] = {}
+        done = threading.Event()
+        
+        def run() -> None:
+            try:
+                outcome["result"] = func(*args)
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                done.set()
+        
+        threading.Thread(target=run, name="remote-call", daemon=True).start()
+        if timeout is None:
+            timeout = self.call_timeout
+        if not done.wait(timeout):
+            error = TimeoutError(f"Remote call timed out after {timeout:g}s")
+            self.record_failure(error)
+            raise error
+        if "error" in outcome:
+            error = outcome["error"]
+            if self.is_failure is None or self.is_failure(error):
+                self.record_failure(error)
+            else:
+                self.record_success()
+            raise error
+        self.record_success()
+        return outcome["result"]
+    
+    def retry_in(self) -> float:
+        """Get how long until the next probe is due.
+        
+        Returns:
+            Seconds until the next probe, 0 unless the circuit is open
+        """
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(self._retry_at - time.monotonic(), 0.0)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get breaker statistics.
+        
+        Returns:
+            Dictionary with 'state', 'consecutive_failures', 'successes',
+            'failures', 'rejected', 'retry_in' and 'last_error' keys
+        """
+        with self._lock:
+            state = self._current_state()
+            stats = {
+                "state": state,
+                "consecutive_failures": self._consecutive_failures,
+                "successes": self._successes,
+                "failures": self._failures,
+                "rejected": self._rejected,
+                "last_error": self._last_error,
+            }
+        stats["retry_in"] = self.retry_in() if state == self.OPEN else 0.0
+        return stats
@@ -0,0 +1,84 @@
+"""Advisory inter-process file lock for local storage writers."""
+
+import threading
+from pathlib import Path
+from typing import IO, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """Exclusive advisory lock on a lock file, usable as a context manager.
+    
+    The lock excludes other processes as well as other FileLock instances
+    in the same process (``flock`` on POSIX, ``msvcrt.locking`` on Windows).
+    It is reentrant for the thread holding it, so locked methods may call
+    each other. Only cooperating writers are excluded; readers that do not
+    take the lock are unaffected.
+    """
+    
+    def __init__(self, file_path: Union[str, Path]) -> None:
+        """Initialize the lock.
+        
+        Args:
+            file_path: Path of the lock file, created if missing
+        """
+        self.file_path = Path(file_path)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file: Optional[IO] = None
+    
+    def acquire(self) -> None:
+        """Block until the lock is held."""
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self._file = open(self.file_path, "a+b")
+                if fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+                else:
+                    self._file.seek(0)
+                    # LK_LOCK retries for about 10 seconds before failing
+                    while True:
+                        try:
+                            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                            break
+                        except OSError:
+                            continue
+            except BaseException:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+    
+    def release(self) -> None:
+        """Release one level of the lock."""
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+    
+    def __enter__(self) -> "FileLock":
+        """Acquire the lock.
+        
+        Returns:
+            This lock
+        """
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        """Release the lock."""
+        self.release()
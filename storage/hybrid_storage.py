@@ -1,11 +1,23 @@
 """Hybrid storage handler that saves to both local JSON and Supabase."""
 
-from typing import List, Optional
+import json
+import threading
+import time
+import uuid
+from dataclasses import replace
+from datetime import date, datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 from models.transaction import Transaction
 from models.budget import Budget
+from storage.circuit_breaker import CircuitBreaker
+from storage.outbox import Outbox
+from storage.remote_writer import RemoteWriteQueue
 from storage.storage_handler import StorageHandler
-from storage.supabase_storage import SupabaseStorageHandler
+from storage.sqlite_storage import SqliteStorageHandler
+from storage.supabase_storage import SupabaseStorageHandler, is_permanent_error
 
 
 class HybridStorageHandler:
@@ -13,14 +25,54 @@ class HybridStorageHandler:
     
     This class provides a unified interface that saves data to both local storage
     (for offline access) and Supabase (for cloud synchronization).
+    
+    Writes are applied to local storage immediately and queued for Supabase,
+    where a background writer applies them without blocking the caller.
+    Writes that fail, or are made while Supabase is unreachable, are kept
+    in the durable outbox ``outbox.jsonl`` and replayed in a few batched
+    requests once Supabase is back (see RemoteWriteQueue). Writes Supabase
+    rejects as invalid are set aside in ``outbox.rejected.jsonl`` instead of
+    blocking the outbox. While remote writes are pending, reads are served from local storage so they include
+    the caller's own changes.
+    
+    Transactions are read from local storage, which mirrors Supabase through
+    delta syncs (see ``sync``): only rows whose ``updated_at`` is past the
+    last seen high-water mark are fetched, and deletions are replayed from
+    the ``transaction_tombstones`` table. Watermarks are kept in
+    ``sync_state.json`` so a warm start costs one small query instead of a
+    full table scan.
+    
+    Supabase transaction IDs are UUIDs. Local transactions with the numeric
+    IDs of earlier versions are given UUIDs when Supabase is first used
+    (see ``_migrate_legacy_ids``), and are uploaded under them.
+    
+    Reads from Supabase go through a circuit breaker (see CircuitBreaker):
+    each is bounded by ``remote_timeout``, and after repeated failures
+    Supabase is skipped and reads are served locally until a probe
+    succeeds, so an outage costs a few timeouts rather than one per call.
+    ``remote_health`` reports the breaker's state.
+    
+    The handler is thread-safe, so one instance, and with it one Supabase
+    client, can serve every session of a Streamlit server.
     """
     
+    # Re-read rows this close to the watermark, in case transactions that
+    # committed late carry an earlier updated_at than rows already seen
+    SYNC_OVERLAP = timedelta(seconds=60)
+    SYNC_CHUNK_SIZE = 500
+    
     def __init__(
         self,
         data_dir: str = "data",
         supabase_url: Optional[str] = None,
         supabase_key: Optional[str] = None,
         use_supabase: bool = True,
+        journal: bool = False,
+        local_backend: str = "json",
+        sync_interval: float = 10.0,
+        compact: bool = False,
+        remote_timeout: float = 10.0,
+        supabase_client: Optional[Any] = None,
     ) -> None:
         """Initialize the hybrid storage handler.
         
@@ -29,51 +81,661 @@ class HybridStorageHandler:
             supabase_url: Supabase project URL (optional, uses env var if not provided)
             supabase_key: Supabase anon/public key (optional, uses env var if not provided)
             use_supabase: Whether to use Supabase (defaults to True)
+            journal: Whether local storage appends changes to a journal
+                instead of rewriting the transactions file
+            local_backend: Local storage backend, 'json', 'binary' (JSON
+                storage with a memory-mapped binary snapshot) or 'sqlite'
+            sync_interval: Minimum number of seconds between delta syncs
+                triggered by reads
+            compact: Whether local JSON storage caches transactions as
+                CompactTransaction objects
+            remote_timeout: Maximum number of seconds a Supabase read may take
+            supabase_client: Existing client to use instead of creating one,
+                e.g. a local stand-in for supabase.Client
         """
-        self.local_storage = StorageHandler(data_dir)
+        self.local_storage: Union[StorageHandler, SqliteStorageHandler]
+        if local_backend in ("json", "binary"):
+            self.local_storage = StorageHandler(
+                data_dir,
+                journal=journal,
+                compact=compact,
+                snapshot_format=local_backend,
+            )
+        elif local_backend == "sqlite":
+            self.local_storage = SqliteStorageHandler(data_dir)
+        else:
+            raise ValueError(f"Unknown local storage backend: {local_backend}")
         self.use_supabase = use_supabase
         self.supabase_storage: Optional[SupabaseStorageHandler] = None
+        self.remote_writer: Optional[RemoteWriteQueue] = None
+        self.sync_interval = sync_interval
+        self.sync_state_file = Path(data_dir) / "sync_state.json"
+        self.outbox_file = Path(data_dir) / "outbox.jsonl"
+        self.legacy_ids_file = Path(data_dir) / "legacy_ids.json"
+        self._synced = False
+        self._last_sync_attempt: Optional[float] = None
+        self._sync_lock = threading.Lock()
+        # Rejected requests show Supabase is up, so only other errors open the circuit
+        self.breaker = CircuitBreaker(
+            call_timeout=remote_timeout,
+            is_failure=lambda error: not is_permanent_error(error),
+        )
         
         if self.use_supabase:
             try:
-                self.supabase_storage = SupabaseStorageHandler(supabase_url, supabase_key)
+                self.supabase_storage = SupabaseStorageHandler(
+                    supabase_url, supabase_key, client=supabase_client
+                )
+                self.remote_writer = RemoteWriteQueue(
+                    self.supabase_storage,
+                    outbox=Outbox(self.outbox_file),
+                    breaker=self.breaker,
+                )
+                self._migrate_legacy_ids()
+                # Replay changes an earlier run could not apply
+                self.remote_writer.resume()
             except (ValueError, Exception) as e:
                 # If Supabase is not configured, continue with local storage only
                 print(f"Warning: Supabase not available, using local storage only: {e}")
                 self.use_supabase = False
     
+    @staticmethod
+    def _is_remote_id(transaction_id: str) -> bool:
+        """Whether a transaction ID can be stored in Supabase.
+        
+        Args:
+            transaction_id: ID of the transaction
+            
+        Returns:
+            True if the ID is a UUID
+        """
+        try:
+            uuid.UUID(transaction_id)
+        except (ValueError, TypeError, AttributeError):
+            return False
+        return True
+    
+    def _migrate_legacy_ids(self) -> None:
+        """Give local transactions with legacy numeric IDs UUIDs and queue them.
+        
+        The mapping from old to new IDs is written to ``legacy_ids.json``
+        before local storage changes, so a migration interrupted by a crash
+        reuses the same UUIDs when it runs again.
+        """
+        legacy = [
+            transaction
+            for transaction in self.local_storage.iter_transactions()
+            if not self._is_remote_id(transaction.id)
+        ]
+        if not legacy:
+            return
+        
+        try:
+            with open(self.legacy_ids_file, "r", encoding="utf-8") as f:
+                new_ids: Dict[str, str] = json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            new_ids = {}
+        for transaction in legacy:
+            new_ids.setdefault(transaction.id, str(uuid.uuid4()))
+        with open(self.legacy_ids_file, "w", encoding="utf-8") as f:
+            json.dump(new_ids, f, indent=2)
+        
+        migrated = [
+            Transaction(
+                id=new_ids[transaction.id],
+                date=transaction.date,
+                amount=transaction.amount,
+                category=transaction.category,
+                description=transaction.description,
+                type=transaction.type,
+            )
+            for transaction in legacy
+        ]
+        self.local_storage.save_transactions(migrated)
+        self.local_storage.delete_transactions([transaction.id for transaction in legacy])
+        self.remote_writer.enqueue_many("save_transaction", migrated)
+        print(f"Warning: Gave {len(migrated)} transactions with legacy IDs new UUIDs for Supabase")
+    
+    def _queue_transaction_changes(self, operation: str, payloads: List[Any]) -> None:
+        """Queue transaction mutations for Supabase, skipping legacy IDs.
+        
+        Args:
+            operation: Name of the mutation, see RemoteWriteQueue
+            payloads: Transactions, or transaction IDs for deletes
+        """
+        queued = []
+        for payload in payloads:
+            transaction_id = payload if operation == "delete_transaction" else payload.id
+            if self._is_remote_id(transaction_id):
+                queued.append(payload)
+            else:
+                print(f"Warning: Not syncing transaction with legacy ID {transaction_id} to Supabase")
+        self.remote_writer.enqueue_many(operation, queued)
+    
+    def _remote_writes_pending(self) -> bool:
+        """Whether queued Supabase writes have not been applied yet.
+        
+        Returns:
+            True if remote reads could miss local changes
+        """
+        return self.remote_writer is not None and self.remote_writer.depth() > 0
+    
+    def _remote_reads_allowed(self) -> bool:
+        """Whether reads should be attempted in Supabase.
+        
+        Returns:
+            True if no queued writes are pending and the circuit breaker
+            lets calls through
+        """
+        return not self._remote_writes_pending() and self.breaker.available()
+    
+    def _remote(self, method: str, *args):
+        """Call a SupabaseStorageHandler method through the circuit breaker.
+        
+        Args:
+            method: Name of the method
+            *args: Arguments for the method
+            
+        Returns:
+            Result of the method
+            
+        Raises:
+            CircuitOpenError: If Supabase is being skipped after failures
+            TimeoutError: If the call took longer than remote_timeout
+        """
+        return self.breaker.call(getattr(self.supabase_storage, method), *args)
+    
+    def remote_health(self) -> Dict[str, Any]:
+        """Get the health of the Supabase connection.
+        
+        Returns:
+            Dictionary with the circuit breaker statistics (see
+            CircuitBreaker.stats), the write queue depth under
+            'pending_writes' and the number of writes Supabase rejected
+            under 'rejected_writes', in which case 'last_error' is the
+            latest rejection; 'state' is 'disabled' when Supabase is not used
+        """
+        if not self.use_supabase:
+            return {"state": "disabled"}
+        health = self.breaker.stats()
+        health["pending_writes"] = self.remote_writer.depth() if self.remote_writer else 0
+        rejections = self.remote_writer.outbox.rejections() if self.remote_writer else []
+        health["rejected_writes"] = len(rejections)
+        if rejections:
+            (operation, _), error = rejections[-1]
+            health["last_error"] = f"Supabase rejected {operation}: {error}"
+        return health
+    
+    def _read_sync_state(self) -> Dict[str, Optional[str]]:
+        """Read the sync watermarks.
+        
+        Returns:
+            Dictionary with 'transactions_updated_at' and
+            'tombstones_deleted_at' keys, None when never synced
+        """
+        state: Dict[str, Optional[str]] = {
+            "transactions_updated_at": None,
+            "tombstones_deleted_at": None,
+        }
+        try:
+            with open(self.sync_state_file, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            if isinstance(stored, dict):
+                state.update({key: stored.get(key) for key in state})
+        except (json.JSONDecodeError, FileNotFoundError):
+            pass
+        return state
+    
+    def _write_sync_state(self, state: Dict[str, Optional[str]]) -> None:
+        """Write the sync watermarks.
+        
+        Args:
+            state: Dictionary of watermarks to persist
+        """
+        with open(self.sync_state_file, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+    
+    def _with_overlap(self, watermark: Optional[str]) -> Optional[str]:
+        """Move a watermark back by the sync overlap.
+        
+        Args:
+            watermark: ISO timestamp, or None
+            
+        Returns:
+            Earlier ISO timestamp, or the watermark unchanged if it cannot be parsed
+        """
+        if watermark is None:
+            return None
+        try:
+            return (datetime.fromisoformat(watermark) - self.SYNC_OVERLAP).isoformat()
+        except ValueError:
+            return watermark
+    
+    def sync(self, force: bool = False) -> bool:
+        """Merge Supabase changes since the last sync into local storage.
+        
+        Syncs run at most once per ``sync_interval`` unless forced, and are
+        skipped while queued writes have not reached Supabase, while
+        another thread is syncing or while the circuit breaker is open.
+        
+        Args:
+            force: Sync even if the last attempt was within sync_interval
+            
+        Returns:
+            True if local storage is in sync with Supabase
+        """
+        if not self.use_supabase or self.supabase_storage is None:
+            return False
+        if self._remote_writes_pending():
+            return self._synced
+        if not self._sync_lock.acquire(blocking=False):
+            # Another thread is syncing; report the state it started from
+            return self._synced
+        try:
+            return self._sync_locked(force)
+        finally:
+            self._sync_lock.release()
+    
+    def _sync_locked(self, force: bool) -> bool:
+        """Run a delta sync unless one ran within sync_interval.
+        
+        Must be called with the sync lock held.
+        
+        Args:
+            force: Sync even if the last attempt was within sync_interval
+            
+        Returns:
+            True if local storage is in sync with Supabase
+        """
+        now = time.monotonic()
+        if (
+            not force
+            and self._last_sync_attempt is not None
+            and now - self._last_sync_attempt < self.sync_interval
+        ):
+            return self._synced
+        self._last_sync_attempt = now
+        if not self.breaker.available():
+            return self._synced
+        
+        state = self._read_sync_state()
+        try:
+            state["transactions_updated_at"] = self._sync_transaction_changes(
+                state["transactions_updated_at"]
+            )
+        except Exception as e:
+            print(f"Warning: Failed to sync transactions from Supabase: {e}")
+            return self._synced
+        
+        try:
+            state["tombstones_deleted_at"] = self._sync_transaction_deletes(
+                state["tombstones_deleted_at"]
+            )
+        except Exception as e:
+            print(f"Warning: Failed to sync deleted transactions from Supabase: {e}")
+        
+        self._write_sync_state(state)
+        self._synced = True
+        return True
+    
+    def _sync_transaction_changes(self, watermark: Optional[str]) -> Optional[str]:
+        """Save transactions changed in Supabase to local storage.
+        
+        Args:
+            watermark: Highest updated_at seen by the previous sync
+            
+        Returns:
+            New highest updated_at seen
+        """
+        changes = self.supabase_storage.iter_transaction_changes(self._with_overlap(watermark))
+        while True:
+            # Fetched chunk by chunk, so each request is bounded by the breaker's timeout
+            chunk = self.breaker.call(list, islice(changes, self.SYNC_CHUNK_SIZE))
+            if not chunk:
+                return watermark
+            changed: List[Transaction] = []
+            for transaction, updated_at in chunk:
+                if updated_at is not None and (watermark is None or updated_at > watermark):
+                    watermark = updated_at
+                if self.local_storage.get_transaction(transaction.id) != transaction:
+                    changed.append(transaction)
+            if changed:
+                self.local_storage.save_transactions(changed)
+    
+    def _sync_transaction_deletes(self, watermark: Optional[str]) -> Optional[str]:
+        """Delete transactions removed from Supabase from local storage.
+        
+        Args:
+            watermark: Highest deleted_at seen by the previous sync
+            
+        Returns:
+            New highest deleted_at seen
+        """
+        tombstones = self._remote("load_transaction_tombstones", self._with_overlap(watermark))
+        if tombstones:
+            self.local_storage.delete_transactions([transaction_id for transaction_id, _ in tombstones])
+            watermark = max([watermark or "", *(deleted_at for _, deleted_at in tombstones)])
+        return watermark
+    
+    def remote_write_stats(self) -> Dict[str, Any]:
+        """Get statistics of the Supabase write queue.
+        
+        Returns:
+            Dictionary with 'depth', 'lag_seconds', 'sent', 'failed',
+            'outbox', 'deferred', 'replayed', 'rejected' and 'last_error' keys, all
+            empty when Supabase is disabled
+        """
+        if self.remote_writer is None:
+            return {
+                "depth": 0,
+                "lag_seconds": 0.0,
+                "sent": 0,
+                "failed": 0,
+                "outbox": 0,
+                "deferred": 0,
+                "replayed": 0,
+                "rejected": 0,
+                "last_error": None,
+            }
+        return self.remote_writer.stats()
+    
     def save_transaction(self, transaction: Transaction) -> None:
-        """Save a transaction to both local storage and Supabase.
+        """Save a transaction to local storage and queue it for Supabase.
         
         Args:
             transaction: Transaction object to save
         """
+        # Supabase IDs are UUIDs, so assign one up front for both stores
+        operation = "save_transaction"
+        if self.use_supabase and not transaction.id:
+            transaction.id = str(uuid.uuid4())
+            operation = "insert_transaction"
+        
         # Save to local storage first
         self.local_storage.save_transaction(transaction)
         
-        # Save to Supabase if available
-        if self.use_supabase and self.supabase_storage:
-            try:
-                self.supabase_storage.save_transaction(transaction)
-            except Exception as e:
-                print(f"Warning: Failed to save transaction to Supabase: {e}")
+        # Queue for Supabase if available
+        if self.use_supabase and self.remote_writer:
+            self._queue_transaction_changes(operation, [replace(transaction)])
+    
+    def save_transactions(self, transactions: List[Transaction]) -> None:
+        """Save several transactions with one local write and queue them for Supabase.
+        
+        The transactions are queued together, so they reach Supabase in
+        batched requests of up to the write queue's batch size.
+        
+        Args:
+            transactions: Transaction objects to save
+        """
+        new_ids = set()
+        if self.use_supabase:
+            for transaction in transactions:
+                if not transaction.id:
+                    transaction.id = str(uuid.uuid4())
+                    new_ids.add(transaction.id)
+        
+        self.local_storage.save_transactions(transactions)
+        
+        if self.use_supabase and self.remote_writer:
+            self._queue_transaction_changes(
+                "save_transaction",
+                [replace(transaction) for transaction in transactions if transaction.id not in new_ids],
+            )
+            self._queue_transaction_changes(
+                "insert_transaction",
+                [replace(transaction) for transaction in transactions if transaction.id in new_ids],
+            )
     
     def load_all_transactions(self) -> List[Transaction]:
-        """Load all transactions from Supabase if available, otherwise from local storage.
+        """Load all transactions from local storage, synced with Supabase.
+        
+        Until a first sync succeeds, transactions are loaded from Supabase
+        directly, falling back to local storage.
         
         Returns:
             List of Transaction objects
         """
-        if self.use_supabase and self.supabase_storage:
+        if self.use_supabase and not self.sync() and self._remote_reads_allowed():
             try:
-                return self.supabase_storage.load_all_transactions()
+                return self._remote("load_all_transactions")
             except Exception as e:
                 print(f"Warning: Failed to load transactions from Supabase, using local storage: {e}")
         
         return self.local_storage.load_all_transactions()
     
+    def iter_transactions(self) -> Iterator[Transaction]:
+        """Stream all transactions from local storage, synced with Supabase.
+        
+        Until a first sync succeeds, transactions are loaded as in
+        ``load_all_transactions``.
+        
+        Yields:
+            Transaction objects
+        """
+        if self.use_supabase and not self.sync():
+            yield from self.load_all_transactions()
+            return
+        yield from self.local_storage.iter_transactions()
+    
+    def get_transactions_between(self, start_date: date, end_date: date) -> List[Transaction]:
+        """Get the transactions dated within a range from local storage, synced with Supabase.
+        
+        Until a first sync succeeds, the range is queried in Supabase
+        directly, falling back to local storage.
+        
+        Args:
+            start_date: First date of the range
+            end_date: Last date of the range (inclusive)
+            
+        Returns:
+            List of Transaction objects ordered by date
+        """
+        if self.use_supabase and not self.sync() and self._remote_reads_allowed():
+            try:
+                return self._remote("get_transactions_between", start_date, end_date)
+            except Exception as e:
+                print(f"Warning: Failed to load transactions from Supabase, using local storage: {e}")
+        
+        return self.local_storage.get_transactions_between(start_date, end_date)
+    
+    def get_recent_transactions(
+        self,
+        limit: int,
+        before: Optional[Tuple[date, str]] = None,
+    ) -> List[Transaction]:
+        """Get the newest transactions from local storage, synced with Supabase.
+        
+        Until a first sync succeeds, Supabase is asked directly, falling
+        back to local storage.
+        
+        Args:
+            limit: Maximum number of transactions to return
+            before: (date, ID) keyset cursor; only transactions ordered
+                before it are returned
+                
+        Returns:
+            List of Transaction objects ordered by date, then ID (newest first)
+        """
+        if self.use_supabase and not self.sync() and self._remote_reads_allowed():
+            try:
+                return self._remote("get_recent_transactions", limit, before)
+            except Exception as e:
+                print(f"Warning: Failed to load transactions from Supabase, using local storage: {e}")
+        
+        return self.local_storage.get_recent_transactions(limit, before)
+    
+    def get_transaction(self, transaction_id: str) -> Optional[Transaction]:
+        """Get a transaction by ID from local storage, synced with Supabase.
+        
+        Until a first sync succeeds, Supabase is asked first.
+        
+        Args:
+            transaction_id: ID of the transaction to look up
+            
+        Returns:
+            Transaction object, or None if not found
+        """
+        if self.use_supabase and not self.sync() and self._remote_reads_allowed():
+            try:
+                transaction = self._remote("get_transaction", transaction_id)
+                if transaction is not None:
+                    return transaction
+            except Exception as e:
+                print(f"Warning: Failed to get transaction from Supabase, using local storage: {e}")
+        
+        return self.local_storage.get_transaction(transaction_id)
+    
+    @property
+    def data_version(self) -> Optional[int]:
+        """Version number of the transactions returned by this handler.
+        
+        Returns:
+            Local data version, or None while Supabase is enabled but has
+            not been synced, because remote changes are not tracked then
+        """
+        if self.use_supabase and not self.sync():
+            return None
+        return getattr(self.local_storage, "data_version", None)
+    
+    def read_columns(self) -> Optional[Dict[str, Any]]:
+        """Get columns of all transactions from the local binary snapshot.
+        
+        Returns:
+            Dictionary of TransactionFrame arguments, or None if local
+            storage cannot provide them or has not been synced
+        """
+        if self.use_supabase and not self.sync():
+            return None
+        read_columns = getattr(self.local_storage, "read_columns", None)
+        return read_columns() if read_columns is not None else None
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """Get hit and miss counters of the local transaction cache.
+        
+        Returns:
+            Dictionary with 'hits' and 'misses' keys
+        """
+        if isinstance(self.local_storage, StorageHandler):
+            return self.local_storage.cache_stats()
+        return {"hits": 0, "misses": 0}
+    
+    def _aggregation_storage(self):
+        """Get the storage that computes totals matching loaded transactions.
+        
+        Local storage is used while Supabase is disabled or has been synced.
+        Otherwise totals come from the Supabase aggregate functions, unless
+        queued writes have not reached Supabase yet or the circuit breaker
+        is open.
+        
+        Returns:
+            Storage handler that supports aggregation, or None
+        """
+        if not self.use_supabase or self.sync():
+            storage = self.local_storage
+        elif self.supabase_storage is not None and self._remote_reads_allowed():
+            try:
+                supported = self._remote("supports_aggregation")
+            except Exception:
+                return None
+            return self.supabase_storage if supported else None
+        else:
+            return None
+        supports = getattr(storage, "supports_aggregation", None)
+        return storage if supports is not None and supports() else None
+    
+    def _aggregate(self, method: str, *args):
+        """Compute totals with the storage chosen by _aggregation_storage.
+        
+        Falls back to local storage, and calls Supabase through the
+        circuit breaker.
+        
+        Args:
+            method: Name of the aggregate method
+            *args: Arguments for the method
+            
+        Returns:
+            Result of the aggregate method
+            
+        Raises:
+            NotImplementedError: If the chosen storage lacks the method
+        """
+        storage = self._aggregation_storage() or self.local_storage
+        if not hasattr(storage, method):
+            raise NotImplementedError(f"{type(storage).__name__} does not implement {method}")
+        if storage is self.supabase_storage:
+            return self._remote(method, *args)
+        return getattr(storage, method)(*args)
+    
+    def supports_aggregation(self) -> bool:
+        """Whether totals can be computed without loading transactions.
+        
+        Returns:
+            True if the aggregate methods can be used
+        """
+        return self._aggregation_storage() is not None
+    
+    def sum_by_type(self) -> Dict[str, float]:
+        """Sum transaction amounts by type.
+        
+        Returns:
+            Dictionary with 'income' and 'expense' totals
+        """
+        return self._aggregate("sum_by_type")
+    
+    def sum_by_category(
+        self,
+        transaction_type: Optional[str] = None,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> Dict[str, float]:
+        """Sum transaction amounts by category.
+        
+        Args:
+            transaction_type: Type to sum ('income' or 'expense'), or None for
+                the net amount (income - expenses) per category
+            year: Year to restrict the sums to, requires month
+            month: Month (1-12) to restrict the sums to, requires year
+            
+        Returns:
+            Dictionary mapping category names to totals
+        """
+        return self._aggregate("sum_by_category", transaction_type, year, month)
+    
+    def sum_by_month(
+        self,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> Dict[Tuple[int, int], Dict[str, float]]:
+        """Sum transaction amounts by month and type.
+        
+        Args:
+            year: Year to restrict the sums to, requires month
+            month: Month (1-12) to restrict the sums to, requires year
+            
+        Returns:
+            Dictionary mapping (year, month) to 'income' and 'expense' totals
+        """
+        return self._aggregate("sum_by_month", year, month)
+    
+    def sum_by_month_and_category(self) -> Dict[Tuple[int, int], Dict[str, Dict[str, float]]]:
+        """Sum transaction amounts by month, category and type.
+        
+        Returns:
+            Dictionary mapping (year, month) to dictionaries mapping category
+            names to 'income' and 'expense' totals
+            
+        Raises:
+            NotImplementedError: If the totals can only come from Supabase,
+                which has no aggregate function for them
+        """
+        return self._aggregate("sum_by_month_and_category")
+    
     def delete_transaction(self, transaction_id: str) -> bool:
-        """Delete a transaction from both local storage and Supabase.
+        """Delete a transaction from local storage and Supabase.
+        
+        The Supabase delete is queued when the transaction existed locally.
+        Otherwise it can only exist remotely, and Supabase is asked directly
+        so the result is accurate.
         
         Args:
             transaction_id: ID of the transaction to delete
@@ -83,17 +745,21 @@ class HybridStorageHandler:
         """
         local_result = self.local_storage.delete_transaction(transaction_id)
         
-        if self.use_supabase and self.supabase_storage:
+        if self.use_supabase and self.supabase_storage and self.remote_writer:
+            if local_result:
+                self._queue_transaction_changes("delete_transaction", [transaction_id])
+                return True
+            if not self._is_remote_id(transaction_id):
+                return False
             try:
-                supabase_result = self.supabase_storage.delete_transaction(transaction_id)
-                return local_result or supabase_result
+                return self._remote("delete_transaction", transaction_id)
             except Exception as e:
                 print(f"Warning: Failed to delete transaction from Supabase: {e}")
         
         return local_result
     
     def save_budget(self, budget: Budget) -> None:
-        """Save a budget to both local storage and Supabase.
+        """Save a budget to local storage and queue it for Supabase.
         
         Args:
             budget: Budget object to save
@@ -101,12 +767,9 @@ class HybridStorageHandler:
         # Save to local storage first
         self.local_storage.save_budget(budget)
         
-        # Save to Supabase if available
-        if self.use_supabase and self.supabase_storage:
-            try:
-                self.supabase_storage.save_budget(budget)
-            except Exception as e:
-                print(f"Warning: Failed to save budget to Supabase: {e}")
+        # Queue for Supabase if available
+        if self.use_supabase and self.remote_writer:
+            self.remote_writer.enqueue("save_budget", replace(budget))
     
     def load_all_budgets(self) -> List[Budget]:
         """Load all budgets from Supabase if available, otherwise from local storage.
@@ -114,16 +777,19 @@ class HybridStorageHandler:
         Returns:
             List of Budget objects
         """
-        if self.use_supabase and self.supabase_storage:
+        if self.use_supabase and self.supabase_storage and self._remote_reads_allowed():
             try:
-                return self.supabase_storage.load_all_budgets()
+                return self._remote("load_all_budgets")
             except Exception as e:
                 print(f"Warning: Failed to load budgets from Supabase, using local storage: {e}")
         
         return self.local_storage.load_all_budgets()
     
     def delete_budget(self, category: str) -> bool:
-        """Delete a budget from both local storage and Supabase.
+        """Delete a budget from local storage and Supabase.
+        
+        The Supabase delete is queued when the budget existed locally,
+        otherwise Supabase is asked directly so the result is accurate.
         
         Args:
             category: Category of the budget to delete
@@ -133,10 +799,12 @@ class HybridStorageHandler:
         """
         local_result = self.local_storage.delete_budget(category)
         
-        if self.use_supabase and self.supabase_storage:
+        if self.use_supabase and self.supabase_storage and self.remote_writer:
+            if local_result:
+                self.remote_writer.enqueue("delete_budget", category)
+                return True
             try:
-                supabase_result = self.supabase_storage.delete_budget(category)
-                return local_result or supabase_result
+                return self._remote("delete_budget", category)
             except Exception as e:
                 print(f"Warning: Failed to delete budget from Supabase: {e}")
         
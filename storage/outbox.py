@@ -0,0 +1,312 @@
+"""Durable outbox of remote mutations waiting to be applied."""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from models.budget import Budget
+from models.transaction import Transaction
+from storage.file_lock import FileLock
+
+Mutation = Tuple[str, Any]
+
+# Mutation rejected by Supabase, with the reason
+Rejection = Tuple[Mutation, str]
+
+# Operations whose payload is a Transaction or a Budget; the others carry an ID or category
+TRANSACTION_PAYLOADS = ("save_transaction", "insert_transaction")
+BUDGET_PAYLOADS = ("save_budget",)
+
+
+def _encode(mutation: Mutation) -> dict:
+    """Convert a mutation to an outbox record.
+    
+    Args:
+        mutation: (operation, payload) pair
+        
+    Returns:
+        JSON-serializable record
+    """
+    operation, payload = mutation
+    if operation in TRANSACTION_PAYLOADS or operation in BUDGET_PAYLOADS:
+        payload = payload.to_dict()
+    return {"op": operation, "payload": payload}
+
+
+def _decode(record: dict) -> Mutation:
+    """Convert an outbox record back to a mutation.
+    
+    Args:
+        record: Record written by _encode
+        
+    Returns:
+        (operation, payload) pair
+    """
+    operation, payload = record["op"], record["payload"]
+    if operation in TRANSACTION_PAYLOADS:
+        payload = Transaction.from_dict(payload)
+    elif operation in BUDGET_PAYLOADS:
+        payload = Budget.from_dict(payload)
+    return operation, payload
+
+
+def mark_attempted(mutations: List[Mutation]) -> List[Mutation]:
+    """Turn inserts into saves for mutations that may have been applied.
+    
+    A request that failed or timed out may still have reached the remote
+    store, so its inserts can no longer be dropped by a later delete.
+    
+    Args:
+        mutations: (operation, payload) pairs that were sent
+        
+    Returns:
+        The mutations with 'insert_transaction' replaced by 'save_transaction'
+    """
+    return [
+        ("save_transaction" if operation == "insert_transaction" else operation, payload)
+        for operation, payload in mutations
+    ]
+
+
+def coalesce(mutations: List[Mutation], batch_size: int = 500) -> List[List[Mutation]]:
+    """Reduce mutations to their net effect and group them into batches.
+    
+    Only the last mutation of each transaction or budget is kept. A
+    transaction inserted and then deleted is dropped entirely, since it
+    never reached the remote store; saves after an insert stay inserts.
+    
+    Args:
+        mutations: (operation, payload) pairs in the order they were made
+        batch_size: Maximum number of mutations per batch
+        
+    Returns:
+        Batches of mutations of the same kind: transaction saves,
+        transaction deletes, budget saves, then budget deletes
+    """
+    latest: Dict[Tuple[str, str], Mutation] = {}
+    for operation, payload in mutations:
+        if operation in TRANSACTION_PAYLOADS:
+            key = ("transaction", payload.id)
+            if operation == "save_transaction" and latest.get(key, ("",))[0] == "insert_transaction":
+                operation = "insert_transaction"
+        elif operation == "delete_transaction":
+            key = ("transaction", payload)
+            if latest.get(key, ("",))[0] == "insert_transaction":
+                del latest[key]
+                continue
+        elif operation in BUDGET_PAYLOADS:
+            key = ("budget", payload.category)
+        else:
+            key = ("budget", payload)
+        # Re-inserted at the end, so dictionary order follows the last change
+        latest.pop(key, None)
+        latest[key] = (operation, payload)
+    
+    groups: Dict[str, List[Mutation]] = {
+        "save_transaction": [],
+        "delete_transaction": [],
+        "save_budget": [],
+        "delete_budget": [],
+    }
+    for operation, payload in latest.values():
+        kind = "save_transaction" if operation == "insert_transaction" else operation
+        groups[kind].append((operation, payload))
+    
+    return [
+        group[start:start + batch_size]
+        for group in groups.values()
+        for start in range(0, len(group), batch_size)
+    ]
+
+
+class Outbox:
+    """Append-only JSONL file of mutations not yet applied remotely.
+    
+    Appends are a single write followed by an fsync, so recorded mutations
+    survive a crash and readers skip an incomplete final line. Appends and
+    replays hold a lock on ``.<name>.lock`` next to the file, so processes
+    sharing a data directory neither lose records nor replay them twice.
+    
+    Mutations Supabase rejects outright, which retrying would not fix, are
+    moved to the dead-letter file ``<name>.rejected.jsonl`` together with
+    the error, so they neither block the mutations behind them nor get lost.
+    """
+    
+    def __init__(self, file_path: Union[str, Path]) -> None:
+        """Initialize the outbox.
+        
+        Args:
+            file_path: Path of the outbox file, created on first append
+        """
+        self.file_path = Path(file_path)
+        self.rejected_path = self.file_path.with_name(f"{self.file_path.stem}.rejected.jsonl")
+        self._lock = FileLock(self.file_path.parent / f".{self.file_path.stem}.lock")
+        self._count: Optional[int] = None
+        self._count_signature: Optional[Tuple[int, int]] = None
+    
+    def _signature(self) -> Optional[Tuple[int, int]]:
+        """Get the modification time and size of the outbox file.
+        
+        Returns:
+            Tuple of (modification time, size), None if the file is missing
+        """
+        try:
+            stat = self.file_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def depth(self) -> int:
+        """Get the number of recorded mutations.
+        
+        Returns:
+            Number of mutations waiting in the outbox
+        """
+        signature = self._signature()
+        if signature is None or signature[1] == 0:
+            return 0
+        if signature != self._count_signature:
+            count = 0
+            try:
+                with open(self.file_path, "r", encoding="utf-8") as f:
+                    count = sum(1 for line in f if line.endswith("\n") and line.strip())
+            except FileNotFoundError:
+                pass
+            self._count = count
+            self._count_signature = signature
+        return self._count
+    
+    def _read(self) -> List[Mutation]:
+        """Read the recorded mutations.
+        
+        Returns:
+            (operation, payload) pairs in the order they were recorded
+        """
+        mutations = []
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        # An append still in progress, or interrupted
+                        break
+                    line = line.strip()
+                    if line:
+                        mutations.append(_decode(json.loads(line)))
+        except FileNotFoundError:
+            pass
+        return mutations
+    
+    def append(self, mutations: List[Mutation]) -> None:
+        """Durably record mutations.
+        
+        Args:
+            mutations: (operation, payload) pairs to record
+        """
+        if not mutations:
+            return
+        lines = "".join(
+            json.dumps(_encode(mutation), ensure_ascii=False) + "\n" for mutation in mutations
+        )
+        with self._lock:
+            with open(self.file_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+    
+    def reject(self, rejections: List[Rejection]) -> None:
+        """Durably record mutations Supabase rejected in the dead-letter file.
+        
+        Args:
+            rejections: (mutation, error message) pairs
+        """
+        if not rejections:
+            return
+        lines = "".join(
+            json.dumps({**_encode(mutation), "error": error}, ensure_ascii=False) + "\n"
+            for mutation, error in rejections
+        )
+        with self._lock:
+            with open(self.rejected_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+    
+    def rejections(self) -> List[Rejection]:
+        """Read the mutations in the dead-letter file.
+        
+        Returns:
+            (mutation, error message) pairs in the order they were rejected
+        """
+        rejections = []
+        try:
+            with open(self.rejected_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.endswith("\n") and line.strip():
+                        record = json.loads(line)
+                        rejections.append((_decode(record), record["error"]))
+        except FileNotFoundError:
+            pass
+        return rejections
+    
+    def _rewrite(self, mutations: List[Mutation]) -> None:
+        """Atomically replace the recorded mutations.
+        
+        Must be called with the lock held.
+        
+        Args:
+            mutations: (operation, payload) pairs to keep, none to empty the outbox
+        """
+        if not mutations:
+            self.file_path.unlink(missing_ok=True)
+            return
+        fd, temp_path = tempfile.mkstemp(
+            dir=self.file_path.parent, prefix=f".{self.file_path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for mutation in mutations:
+                    f.write(json.dumps(_encode(mutation), ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.file_path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+    
+    def replay(
+        self,
+        apply: Callable[[List[Mutation]], List[Rejection]],
+        batch_size: int = 500,
+    ) -> int:
+        """Apply the recorded mutations, coalesced, and remove them.
+        
+        Mutations rejected by ``apply`` are moved to the dead-letter file.
+        If a batch fails, the outbox is rewritten to hold that batch (see
+        mark_attempted) and the ones not yet applied, and the error is raised.
+        
+        Args:
+            apply: Function applying one batch of mutations remotely and
+                returning the ones Supabase rejected
+            batch_size: Maximum number of mutations per batch
+            
+        Returns:
+            Number of mutations applied after coalescing
+        """
+        with self._lock:
+            batches = coalesce(self._read(), batch_size)
+            applied = 0
+            for position, batch in enumerate(batches):
+                try:
+                    rejections = apply(batch)
+                except Exception:
+                    remaining = mark_attempted(batch)
+                    for later in batches[position + 1:]:
+                        remaining.extend(later)
+                    self._rewrite(remaining)
+                    raise
+                self.reject(rejections)
+                applied += len(batch) - len(rejections)
+            self._rewrite([])
+            return applied
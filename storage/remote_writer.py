@@ -0,0 +1,361 @@
+"""Background write-behind queue for remote (Supabase) mutations."""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from storage.circuit_breaker import CircuitBreaker
+from storage.outbox import Mutation, Outbox, Rejection, mark_attempted
+from storage.supabase_storage import SupabaseStorageHandler, is_permanent_error
+
+
+class RemoteWriteQueue:
+    """Applies remote mutations on a background thread.
+    
+    Mutations are queued as (operation, payload) pairs and drained in order
+    by a daemon thread, so callers never wait for a network round trip.
+    Consecutive mutations of the same kind are sent as one batched request.
+    
+    Supported operations are 'save_transaction' and 'insert_transaction'
+    (Transaction, the latter for transactions new to Supabase),
+    'delete_transaction' (ID), 'save_budget' (Budget) and 'delete_budget'
+    (category).
+    
+    With an outbox, mutations whose request fails are recorded there
+    instead of being dropped. So are new mutations while the outbox is not
+    empty or the circuit breaker is open, which keeps them in order. The
+    writer replays the outbox, coalesced (see ``coalesce``), once Supabase
+    can be reached, retrying every ``retry_interval`` seconds or when the
+    breaker's next probe is due.
+    
+    A batch Supabase rejects outright (see ``is_permanent_error``) is
+    retried one mutation at a time, and the mutations rejected again are
+    moved to the outbox's dead-letter file, so one invalid row does not
+    hold back the others.
+    """
+    
+    # SupabaseStorageHandler batch method applying each operation
+    BATCH_METHODS = {
+        "save_transaction": "save_transactions",
+        "insert_transaction": "save_transactions",
+        "delete_transaction": "delete_transactions",
+        "save_budget": "save_budgets",
+        "delete_budget": "delete_budgets",
+    }
+    
+    def __init__(
+        self,
+        supabase_storage: SupabaseStorageHandler,
+        batch_size: int = 500,
+        outbox: Optional[Outbox] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        retry_interval: float = 5.0,
+    ) -> None:
+        """Initialize the write queue.
+        
+        Args:
+            supabase_storage: Handler used to apply the mutations
+            batch_size: Maximum number of mutations sent in one request
+            outbox: Outbox recording mutations that could not be applied,
+                None to drop them
+            breaker: Circuit breaker the requests are made through
+            retry_interval: Minimum number of seconds between outbox replays
+        """
+        self.supabase_storage = supabase_storage
+        self.batch_size = batch_size
+        self.outbox = outbox
+        self.breaker = breaker
+        self.retry_interval = retry_interval
+        self._pending: Deque[Tuple[str, Any, float]] = deque()
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._oldest_in_flight: Optional[float] = None
+        self._sent = 0
+        self._failed = 0
+        self._deferred = 0
+        self._replayed = 0
+        self._rejected = 0
+        self._last_error: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    def enqueue(self, operation: str, payload: Any) -> None:
+        """Queue a mutation for the background writer.
+        
+        Args:
+            operation: Name of the mutation, see the class docstring
+            payload: Argument for the operation
+        """
+        with self._condition:
+            self._pending.append((operation, payload, time.monotonic()))
+            self._start_locked()
+    
+    def enqueue_many(self, operation: str, payloads: List[Any]) -> None:
+        """Queue several mutations of the same kind at once.
+        
+        The payloads are queued atomically, so they are sent together in
+        batched requests.
+        
+        Args:
+            operation: Name of the mutation, see the class docstring
+            payloads: Arguments for the operation, one per mutation
+        """
+        if not payloads:
+            return
+        with self._condition:
+            queued_at = time.monotonic()
+            self._pending.extend((operation, payload, queued_at) for payload in payloads)
+            self._start_locked()
+    
+    def resume(self) -> None:
+        """Start replaying mutations left in the outbox, e.g. by an earlier run."""
+        if self.outbox is not None and self.outbox.depth():
+            with self._condition:
+                self._start_locked()
+    
+    def _start_locked(self) -> None:
+        """Start the writer thread if needed and wake it.
+        
+        Must be called with the condition held.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="remote-writer", daemon=True
+            )
+            self._thread.start()
+        self._condition.notify_all()
+    
+    def depth(self) -> int:
+        """Get the number of mutations not yet applied remotely.
+        
+        Returns:
+            Number of queued, in-flight and outbox mutations
+        """
+        outbox_depth = self.outbox.depth() if self.outbox is not None else 0
+        with self._condition:
+            return len(self._pending) + self._in_flight + outbox_depth
+    
+    def lag(self) -> float:
+        """Get how long the oldest queued mutation has been waiting.
+        
+        Returns:
+            Age of the oldest queued or in-flight mutation in seconds, 0 if
+            none; mutations in the outbox are not counted
+        """
+        with self._condition:
+            oldest = self._oldest_in_flight
+            if oldest is None and self._pending:
+                oldest = self._pending[0][2]
+        return time.monotonic() - oldest if oldest is not None else 0.0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get queue statistics.
+        
+        Returns:
+            Dictionary with 'depth', 'lag_seconds', 'sent', 'failed',
+            'outbox', 'deferred', 'replayed', 'rejected' and 'last_error' keys
+        """
+        with self._condition:
+            sent, failed, last_error = self._sent, self._failed, self._last_error
+            deferred, replayed, rejected = self._deferred, self._replayed, self._rejected
+        return {
+            "depth": self.depth(),
+            "lag_seconds": self.lag(),
+            "sent": sent,
+            "failed": failed,
+            "outbox": self.outbox.depth() if self.outbox is not None else 0,
+            "deferred": deferred,
+            "replayed": replayed,
+            "rejected": rejected,
+            "last_error": last_error,
+        }
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued mutation was applied, failed or recorded in the outbox.
+        
+        Args:
+            timeout: Maximum number of seconds to wait, None to wait forever
+            
+        Returns:
+            True if the queue drained, False on timeout
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._in_flight, timeout
+            )
+    
+    def _next_batch(self) -> Tuple[List[Mutation], float]:
+        """Take the next mutation, plus following ones of the same kind.
+        
+        Must be called with the condition held and a non-empty queue.
+        
+        Returns:
+            Tuple of (mutations, oldest enqueue time)
+        """
+        operation, payload, queued_at = self._pending.popleft()
+        method = self.BATCH_METHODS[operation]
+        mutations = [(operation, payload)]
+        while (
+            self._pending
+            and self.BATCH_METHODS[self._pending[0][0]] == method
+            and len(mutations) < self.batch_size
+        ):
+            next_operation, next_payload, _ = self._pending.popleft()
+            mutations.append((next_operation, next_payload))
+        return mutations, queued_at
+    
+    def _apply(self, mutations: List[Mutation]) -> None:
+        """Apply one batch of mutations of the same kind remotely.
+        
+        Args:
+            mutations: (operation, payload) pairs to apply
+        """
+        method = self.BATCH_METHODS[mutations[0][0]]
+        getattr(self.supabase_storage, method)([payload for _, payload in mutations])
+    
+    def _call(self, mutations: List[Mutation]) -> None:
+        """Apply a batch of mutations, through the circuit breaker if any.
+        
+        Args:
+            mutations: (operation, payload) pairs to apply
+        """
+        if self.breaker is not None:
+            self.breaker.call(self._apply, mutations)
+        else:
+            self._apply(mutations)
+    
+    def _try_send(self, mutations: List[Mutation]) -> List[Rejection]:
+        """Apply a batch of mutations, one by one if Supabase rejects the batch.
+        
+        Args:
+            mutations: (operation, payload) pairs to apply
+            
+        Returns:
+            Mutations Supabase rejected, with the error message
+            
+        Raises:
+            Exception: If a request failed for a reason retrying may fix
+        """
+        try:
+            self._call(mutations)
+        except Exception as e:
+            if not is_permanent_error(e):
+                raise
+            if len(mutations) == 1:
+                return [(mutations[0], str(e))]
+            return [
+                rejection
+                for mutation in mutations
+                for rejection in self._try_send([mutation])
+            ]
+        return []
+    
+    def _send(self, mutations: List[Mutation]) -> List[Rejection]:
+        """Apply a batch of mutations and record the ones Supabase rejected.
+        
+        Args:
+            mutations: (operation, payload) pairs to apply
+            
+        Returns:
+            Mutations Supabase rejected, with the error message
+        """
+        rejections = self._try_send(mutations)
+        for (operation, _), error in rejections:
+            print(f"Warning: Supabase rejected {operation}: {error}")
+        if rejections:
+            with self._condition:
+                self._rejected += len(rejections)
+                operation, error = rejections[-1][0][0], rejections[-1][1]
+                self._last_error = f"Supabase rejected {operation}: {error}"
+        return rejections
+    
+    def _defer(self) -> bool:
+        """Whether new mutations must go to the outbox instead of Supabase.
+        
+        Returns:
+            True if older mutations are waiting in the outbox or the
+            circuit breaker is open
+        """
+        if self.outbox is None:
+            return False
+        return self.outbox.depth() > 0 or (self.breaker is not None and not self.breaker.available())
+    
+    def _replay_outbox(self) -> bool:
+        """Apply the mutations recorded in the outbox.
+        
+        Returns:
+            True if the outbox was replayed, False if Supabase cannot be
+            reached yet
+        """
+        if self.breaker is not None and not self.breaker.available():
+            return False
+        try:
+            replayed = self.outbox.replay(self._send, self.batch_size)
+        except Exception as e:
+            print(f"Warning: Failed to replay outbox to Supabase: {e}")
+            with self._condition:
+                self._last_error = str(e)
+            return False
+        with self._condition:
+            self._replayed += replayed
+        return True
+    
+    def _retry_delay(self) -> float:
+        """Get how long to wait before the next outbox replay.
+        
+        Returns:
+            Number of seconds to wait
+        """
+        if self.breaker is None:
+            return self.retry_interval
+        return max(self.retry_interval, self.breaker.retry_in())
+    
+    def _run(self) -> None:
+        """Drain the queue, then the outbox, until both are empty."""
+        while True:
+            with self._condition:
+                if self._pending:
+                    mutations, queued_at = self._next_batch()
+                    self._in_flight = len(mutations)
+                    self._oldest_in_flight = queued_at
+                elif self.outbox is not None and self.outbox.depth():
+                    mutations = None
+                else:
+                    self._thread = None
+                    return
+            
+            if mutations is None:
+                if not self._replay_outbox():
+                    # Wait for the next attempt, unless new mutations arrive
+                    with self._condition:
+                        if not self._pending:
+                            self._condition.wait(self._retry_delay())
+                continue
+            
+            error = None
+            rejections: List[Rejection] = []
+            deferred = self._defer()
+            if deferred:
+                self.outbox.append(mutations)
+            else:
+                try:
+                    rejections = self._send(mutations)
+                    if self.outbox is not None:
+                        self.outbox.reject(rejections)
+                except Exception as e:
+                    error = e
+                    print(f"Warning: Failed to apply {mutations[0][0]} to Supabase: {e}")
+                    if self.outbox is not None:
+                        self.outbox.append(mark_attempted(mutations))
+            
+            with self._condition:
+                if deferred:
+                    self._deferred += len(mutations)
+                elif error is None:
+                    self._sent += len(mutations) - len(rejections)
+                else:
+                    self._failed += len(mutations)
+                    self._last_error = str(error)
+                self._in_flight = 0
+                self._oldest_in_flight = None
+                self._condition.notify_all()
@@ -0,0 +1,511 @@
+"""SQLite storage handler for persisting transactions and budgets locally."""
+
+import sqlite3
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from models.transaction import Transaction
+from models.budget import Budget
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    date TEXT NOT NULL,
+    amount_cents INTEGER NOT NULL CHECK (amount_cents >= 0),
+    category TEXT NOT NULL,
+    description TEXT,
+    type TEXT NOT NULL CHECK (type IN ('income', 'expense'))
+);
+
+CREATE TABLE IF NOT EXISTS budgets (
+    category TEXT PRIMARY KEY,
+    monthly_limit REAL NOT NULL CHECK (monthly_limit >= 0)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(date);
+CREATE INDEX IF NOT EXISTS idx_transactions_type ON transactions(type);
+CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions(category);
+CREATE INDEX IF NOT EXISTS idx_transactions_date_id ON transactions(date, id);
+"""
+
+# Transaction columns in the shape Transaction.from_records expects
+TRANSACTION_COLUMNS = (
+    "id, date, amount_cents / 100.0 AS amount, category, "
+    "COALESCE(description, '') AS description, type"
+)
+
+
+class SqliteStorageHandler:
+    """Handles persistence of transactions and budgets using a SQLite database.
+    
+    This class offers the same interface as StorageHandler, backed by an
+    embedded database with indexes on date, type and category. Amounts are
+    stored as integer cents, and totals by type, category and month are
+    computed in SQL so analytics do not have to iterate Transaction objects.
+    
+    Each thread gets its own connection and the database runs in WAL mode,
+    so readers proceed concurrently with a writer.
+    
+    ``data_version`` is a counter kept in the meta table and bumped by every
+    write transaction that changes transactions, so it is shared by all
+    threads, connections and processes using the database.
+    """
+    
+    def __init__(self, data_dir: str = "data", filename: str = "money.db") -> None:
+        """Initialize the SQLite storage handler.
+        
+        Args:
+            data_dir: Directory name where the database file will be stored
+            filename: Name of the database file inside data_dir
+        """
+        self.data_dir = Path(data_dir)
+        self.database_file = self.data_dir / filename
+        self._local = threading.local()
+        
+        # Create data directory if it doesn't exist
+        self.data_dir.mkdir(exist_ok=True)
+        
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Get the database connection for the current thread.
+        
+        Returns:
+            SQLite connection in autocommit mode
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.database_file,
+                timeout=30,
+                isolation_level=None,
+            )
+            connection.row_factory = sqlite3.Row
+            self._local.connection = connection
+        return connection
+    
+    @staticmethod
+    def _bump_data_version(connection: sqlite3.Connection) -> None:
+        """Record that the stored transactions changed.
+        
+        Must be called inside the write transaction making the change.
+        
+        Args:
+            connection: Connection with the write transaction open
+        """
+        connection.execute(
+            "INSERT INTO meta (key, value) VALUES ('data_version', 1) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + 1"
+        )
+    
+    @property
+    def data_version(self) -> int:
+        """Version number that increases whenever the transactions change.
+        
+        Returns:
+            Current data version
+        """
+        row = self._connection().execute(
+            "SELECT value FROM meta WHERE key = 'data_version'"
+        ).fetchone()
+        return row["value"] if row else 0
+    
+    @staticmethod
+    def _to_cents(amount: float) -> int:
+        """Convert an amount to integer cents.
+        
+        Args:
+            amount: Amount in currency units
+            
+        Returns:
+            Amount in cents
+        """
+        return int(round(amount * 100))
+    
+    @staticmethod
+    def _transactions_from_rows(rows: List[sqlite3.Row]) -> List[Transaction]:
+        """Convert database rows to Transactions.
+        
+        Rows were checked by the table constraints when they were written,
+        so they are converted through the trusted bulk path.
+        
+        Args:
+            rows: Rows selected with TRANSACTION_COLUMNS
+            
+        Returns:
+            List of Transaction instances
+        """
+        return Transaction.from_records(rows)
+    
+    @staticmethod
+    def _month_range(year: int, month: int) -> Tuple[str, str]:
+        """Get the ISO date bounds of a month for index-friendly filtering.
+        
+        Args:
+            year: Year of the month
+            month: Month (1-12)
+            
+        Returns:
+            Tuple of (first day, first day of the next month) as ISO strings
+        """
+        start = date(year, month, 1)
+        end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+        return start.isoformat(), end.isoformat()
+    
+    def save_transaction(self, transaction: Transaction) -> None:
+        """Save a transaction to the database.
+        
+        A transaction with an existing ID replaces the stored one.
+        
+        Args:
+            transaction: Transaction object to save
+        """
+        self.save_transactions([transaction])
+    
+    def save_transactions(self, transactions: List[Transaction]) -> None:
+        """Save several transactions in a single database transaction.
+        
+        Transactions with an existing ID replace the stored ones.
+        
+        Args:
+            transactions: Transaction objects to save
+        """
+        if not transactions:
+            return
+        
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT value FROM meta WHERE key = 'next_transaction_id'"
+            ).fetchone()
+            next_id = row["value"] if row else 1
+            
+            rows = []
+            for transaction in transactions:
+                # Generate ID if not present
+                if not transaction.id:
+                    transaction.id = str(next_id)
+                if transaction.id.isdigit():
+                    next_id = max(next_id, int(transaction.id) + 1)
+                rows.append((
+                    transaction.id,
+                    transaction.date.isoformat(),
+                    self._to_cents(transaction.amount),
+                    transaction.category,
+                    transaction.description,
+                    transaction.type,
+                ))
+            
+            connection.execute(
+                "INSERT INTO meta (key, value) VALUES ('next_transaction_id', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (next_id,),
+            )
+            connection.executemany(
+                "INSERT INTO transactions (id, date, amount_cents, category, description, type) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET date = excluded.date, "
+                "amount_cents = excluded.amount_cents, category = excluded.category, "
+                "description = excluded.description, type = excluded.type",
+                rows,
+            )
+            self._bump_data_version(connection)
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+    
+    def load_all_transactions(self) -> List[Transaction]:
+        """Load all transactions from the database.
+        
+        Returns:
+            List of Transaction objects
+        """
+        rows = self._connection().execute(
+            f"SELECT {TRANSACTION_COLUMNS} FROM transactions ORDER BY seq"
+        ).fetchall()
+        return self._transactions_from_rows(rows)
+    
+    def iter_transactions(self, batch_size: int = 1000) -> Iterator[Transaction]:
+        """Stream all transactions from the database.
+        
+        Rows are fetched in batches, so memory use does not grow with the
+        number of transactions.
+        
+        Args:
+            batch_size: Number of rows fetched at a time
+            
+        Yields:
+            Transaction objects in insertion order
+        """
+        cursor = self._connection().execute(f"SELECT {TRANSACTION_COLUMNS} FROM transactions ORDER BY seq")
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield from self._transactions_from_rows(rows)
+        finally:
+            cursor.close()
+    
+    def get_transactions_between(self, start_date: date, end_date: date) -> List[Transaction]:
+        """Get the transactions dated within a range.
+        
+        The range is looked up through the date index.
+        
+        Args:
+            start_date: First date of the range
+            end_date: Last date of the range (inclusive)
+            
+        Returns:
+            List of Transaction objects ordered by date
+        """
+        rows = self._connection().execute(
+            f"SELECT {TRANSACTION_COLUMNS} FROM transactions WHERE date BETWEEN ? AND ? ORDER BY date, seq",
+            (start_date.isoformat(), end_date.isoformat()),
+        ).fetchall()
+        return self._transactions_from_rows(rows)
+    
+    def get_recent_transactions(
+        self,
+        limit: int,
+        before: Optional[Tuple[date, str]] = None,
+    ) -> List[Transaction]:
+        """Get the newest transactions, walking the (date, id) index backwards.
+        
+        Args:
+            limit: Maximum number of transactions to return
+            before: (date, ID) keyset cursor; only transactions ordered
+                before it are returned
+                
+        Returns:
+            List of Transaction objects ordered by date, then ID (newest first)
+        """
+        if before is None:
+            rows = self._connection().execute(
+                f"SELECT {TRANSACTION_COLUMNS} FROM transactions ORDER BY date DESC, id DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        else:
+            rows = self._connection().execute(
+                f"SELECT {TRANSACTION_COLUMNS} FROM transactions WHERE (date, id) < (?, ?) "
+                "ORDER BY date DESC, id DESC LIMIT ?",
+                (before[0].isoformat(), before[1], limit),
+            ).fetchall()
+        return self._transactions_from_rows(rows)
+    
+    def get_transaction(self, transaction_id: str) -> Optional[Transaction]:
+        """Get a transaction by ID.
+        
+        Args:
+            transaction_id: ID of the transaction to look up
+            
+        Returns:
+            Transaction object, or None if not found
+        """
+        row = self._connection().execute(
+            f"SELECT {TRANSACTION_COLUMNS} FROM transactions WHERE id = ?", (transaction_id,)
+        ).fetchone()
+        return self._transactions_from_rows([row])[0] if row else None
+    
+    def delete_transaction(self, transaction_id: str) -> bool:
+        """Delete a transaction by ID.
+        
+        Args:
+            transaction_id: ID of the transaction to delete
+            
+        Returns:
+            True if transaction was deleted, False if not found
+        """
+        return self.delete_transactions([transaction_id]) == 1
+    
+    def delete_transactions(self, transaction_ids: List[str]) -> int:
+        """Delete several transactions in a single database transaction.
+        
+        Args:
+            transaction_ids: IDs of the transactions to delete
+            
+        Returns:
+            Number of transactions that were found and deleted
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = connection.executemany(
+                "DELETE FROM transactions WHERE id = ?",
+                [(transaction_id,) for transaction_id in transaction_ids],
+            )
+            deleted = max(cursor.rowcount, 0)
+            if deleted:
+                self._bump_data_version(connection)
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return deleted
+    
+    def supports_aggregation(self) -> bool:
+        """Whether this handler can compute totals without loading transactions.
+        
+        Returns:
+            Always True, totals are computed in SQL
+        """
+        return True
+    
+    def sum_by_type(self) -> Dict[str, float]:
+        """Sum transaction amounts by type.
+        
+        Returns:
+            Dictionary with 'income' and 'expense' totals
+        """
+        totals = {"income": 0.0, "expense": 0.0}
+        rows = self._connection().execute(
+            "SELECT type, SUM(amount_cents) AS total FROM transactions GROUP BY type"
+        ).fetchall()
+        for row in rows:
+            totals[row["type"]] = row["total"] / 100
+        return totals
+    
+    def sum_by_category(
+        self,
+        transaction_type: Optional[str] = None,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> Dict[str, float]:
+        """Sum transaction amounts by category.
+        
+        Args:
+            transaction_type: Type to sum ('income' or 'expense'), or None for
+                the net amount (income - expenses) per category
+            year: Year to restrict the sums to, requires month
+            month: Month (1-12) to restrict the sums to, requires year
+            
+        Returns:
+            Dictionary mapping category names to totals
+        """
+        if transaction_type is None:
+            amount = "CASE WHEN type = 'income' THEN amount_cents ELSE -amount_cents END"
+        else:
+            amount = "amount_cents"
+        
+        conditions = []
+        params: List = []
+        if transaction_type is not None:
+            conditions.append("type = ?")
+            params.append(transaction_type)
+        if year is not None and month is not None:
+            conditions.append("date >= ? AND date < ?")
+            params.extend(self._month_range(year, month))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        rows = self._connection().execute(
+            f"SELECT category, SUM({amount}) AS total FROM transactions {where} "
+            f"GROUP BY category",
+            params,
+        ).fetchall()
+        return {row["category"]: row["total"] / 100 for row in rows}
+    
+    def sum_by_month(
+        self,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> Dict[Tuple[int, int], Dict[str, float]]:
+        """Sum transaction amounts by month and type.
+        
+        Args:
+            year: Year to restrict the sums to, requires month
+            month: Month (1-12) to restrict the sums to, requires year
+            
+        Returns:
+            Dictionary mapping (year, month) to 'income' and 'expense' totals
+        """
+        where = ""
+        params: List = []
+        if year is not None and month is not None:
+            where = "WHERE date >= ? AND date < ?"
+            params.extend(self._month_range(year, month))
+        
+        rows = self._connection().execute(
+            f"SELECT substr(date, 1, 7) AS period, type, SUM(amount_cents) AS total "
+            f"FROM transactions {where} GROUP BY period, type",
+            params,
+        ).fetchall()
+        
+        months: Dict[Tuple[int, int], Dict[str, float]] = {}
+        for row in rows:
+            key = (int(row["period"][:4]), int(row["period"][5:7]))
+            totals = months.setdefault(key, {"income": 0.0, "expense": 0.0})
+            totals[row["type"]] = row["total"] / 100
+        return months
+    
+    def sum_by_month_and_category(self) -> Dict[Tuple[int, int], Dict[str, Dict[str, float]]]:
+        """Sum transaction amounts by month, category and type.
+        
+        Returns:
+            Dictionary mapping (year, month) to dictionaries mapping category
+            names to 'income' and 'expense' totals
+        """
+        rows = self._connection().execute(
+            "SELECT substr(date, 1, 7) AS period, category, type, SUM(amount_cents) AS total "
+            "FROM transactions GROUP BY period, category, type"
+        ).fetchall()
+        
+        months: Dict[Tuple[int, int], Dict[str, Dict[str, float]]] = {}
+        for row in rows:
+            key = (int(row["period"][:4]), int(row["period"][5:7]))
+            categories = months.setdefault(key, {})
+            totals = categories.setdefault(row["category"], {"income": 0.0, "expense": 0.0})
+            totals[row["type"]] = row["total"] / 100
+        return months
+    
+    def save_budget(self, budget: Budget) -> None:
+        """Save a budget to the database.
+        
+        Args:
+            budget: Budget object to save
+        """
+        self._connection().execute(
+            "INSERT INTO budgets (category, monthly_limit) VALUES (?, ?) "
+            "ON CONFLICT(category) DO UPDATE SET monthly_limit = excluded.monthly_limit",
+            (budget.category, float(budget.monthly_limit)),
+        )
+    
+    def load_all_budgets(self) -> List[Budget]:
+        """Load all budgets from the database.
+        
+        Returns:
+            List of Budget objects
+        """
+        rows = self._connection().execute(
+            "SELECT category, monthly_limit FROM budgets ORDER BY rowid"
+        ).fetchall()
+        return [
+            Budget(category=row["category"], monthly_limit=row["monthly_limit"])
+            for row in rows
+        ]
+    
+    def delete_budget(self, category: str) -> bool:
+        """Delete a budget by category.
+        
+        Args:
+            category: Category of the budget to delete
+            
+        Returns:
+            True if budget was deleted, False if not found
+        """
+        cursor = self._connection().execute(
+            "DELETE FROM budgets WHERE category = ?", (category,)
+        )
+        return cursor.rowcount > 0
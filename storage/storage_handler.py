@@ -1,11 +1,22 @@
 """Storage handler for persisting transactions and budgets to JSON files."""
 
+import copy
 import json
+import os
+import tempfile
+import threading
+from bisect import bisect_left, insort
+from dataclasses import replace
+from datetime import date
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 from models.transaction import Transaction
+from models.compact_transaction import CompactTransaction
 from models.budget import Budget
+from storage.aggregates import RunningAggregates
+from storage.binary_snapshot import BinarySnapshot, json_to_snapshot, write_snapshot
+from storage.file_lock import FileLock
 
 
 class StorageHandler:
@@ -13,26 +24,127 @@ class StorageHandler:
     
     This class encapsulates all file I/O operations and provides a clean
     interface for reading and writing application data.
+    
+    In journal mode, transaction inserts and deletes are appended to a JSONL
+    log next to ``transactions.json`` instead of rewriting the whole file.
+    The log is folded back into the JSON snapshot once it grows past
+    ``compact_threshold`` records, and loads replay snapshot plus log.
+    
+    Parsed transactions are kept in memory and reused until the handler
+    writes them itself or the files change size or modification time on disk.
+    They are held in an insertion-ordered dictionary keyed by ID, which
+    doubles as the ID index, and new IDs come from a counter persisted in
+    ``transactions.meta.json``, so inserts, upserts, deletes and lookups by
+    ID do not scan the stored transactions. A list of (date ordinal, ID)
+    pairs kept in sorted order serves date-range queries by binary search.
+    
+    Totals by type, category and month are maintained incrementally on each
+    write and persisted to ``aggregates.json`` together with the signature of
+    the data files they describe. Analytics are answered from these totals
+    without loading transactions; they are rebuilt when the stored checksum
+    or signature no longer matches.
+    
+    With ``compact=True`` the cache holds CompactTransaction objects, which
+    use slots, interned strings and integer cents to cut memory per row.
+    
+    Reads return copies as regular Transaction objects, whichever model the
+    cache holds, so changing a returned object only affects storage once it
+    is saved.
+    
+    With ``snapshot_format="binary"`` the transactions snapshot is kept in
+    ``transactions.bin`` (see BinarySnapshot) instead of pretty-printed JSON.
+    An existing ``transactions.json`` is converted on first use. While the
+    snapshot holds every transaction, ``read_columns`` serves analytics
+    columns straight from the memory-mapped file.
+    
+    Several processes may share a data directory. Writers hold an advisory
+    lock on ``.storage.lock`` for the whole read-modify-write, reloading
+    the cache first if another process changed the files. Files are
+    rewritten through a temporary file and an atomic rename, and journal
+    records are appended with one write, so readers take no lock: they see
+    the last committed snapshot, skip an incomplete final journal line and
+    reload if the files changed while they were being read.
+    
+    A handler may also be shared by the threads of one process, such as
+    the sessions of a Streamlit server. Its in-memory caches are guarded by
+    a lock, which readers hold only while they consult or reload them.
     """
     
-    def __init__(self, data_dir: str = "data") -> None:
+    # Lock-free attempts at a consistent read before a reader takes the lock
+    READ_ATTEMPTS = 3
+    
+    def __init__(
+        self,
+        data_dir: str = "data",
+        journal: bool = False,
+        compact_threshold: int = 1000,
+        compact: bool = False,
+        snapshot_format: str = "json",
+    ) -> None:
         """Initialize the storage handler.
         
         Args:
             data_dir: Directory name where data files will be stored
+            journal: Whether to append transaction changes to a journal
+                instead of rewriting the transactions file on every change
+            compact_threshold: Number of journal records after which the
+                journal is compacted into the transactions file
+            compact: Whether to cache transactions as CompactTransaction objects
+            snapshot_format: Format of the transactions snapshot, 'json' or 'binary'
         """
+        if snapshot_format not in ("json", "binary"):
+            raise ValueError(f"Unknown snapshot format: {snapshot_format}")
         self.data_dir = Path(data_dir)
-        self.transactions_file = self.data_dir / "transactions.json"
+        self.snapshot_format = snapshot_format
+        self.transactions_file = self.data_dir / (
+            "transactions.bin" if snapshot_format == "binary" else "transactions.json"
+        )
+        self.journal_file = self.data_dir / "transactions.journal.jsonl"
+        self.meta_file = self.data_dir / "transactions.meta.json"
+        self.aggregates_file = self.data_dir / "aggregates.json"
         self.budgets_file = self.data_dir / "budgets.json"
+        self.journal = journal
+        self.compact_threshold = compact_threshold
+        self.compact_transactions = compact
+        self._journal_records: Optional[int] = None
+        # Whether IDs were assigned to snapshot records that lack them
+        self._snapshot_outdated = False
+        
+        # In-memory transaction cache and the file signature it was read at
+        self._transactions: Optional[Dict[str, Transaction]] = None
+        self._transactions_signature: Optional[list] = None
+        self._next_id = 1
+        self._date_index: Optional[List[Tuple[int, str]]] = None
+        self._date_index_source: Optional[Dict[str, Transaction]] = None
+        self._aggregates: Optional[RunningAggregates] = None
+        self._data_version = 0
+        self._version_signature: Optional[list] = None
+        self._snapshot: Optional[BinarySnapshot] = None
+        self._snapshot_signature: Optional[list] = None
+        self._cache_hits = 0
+        self._cache_misses = 0
         
         # Create data directory if it doesn't exist
         self.data_dir.mkdir(exist_ok=True)
+        self._lock = FileLock(self.data_dir / ".storage.lock")
+        # Guards the in-memory state against other threads of this process
+        self._state_lock = threading.RLock()
         
         # Initialize files if they don't exist
-        if not self.transactions_file.exists():
-            self._write_json_file(self.transactions_file, [])
-        if not self.budgets_file.exists():
-            self._write_json_file(self.budgets_file, [])
+        with self._lock:
+            json_file = self.data_dir / "transactions.json"
+            if not self.transactions_file.exists():
+                if snapshot_format == "binary" and json_file.exists():
+                    self._replace_file(
+                        self.transactions_file,
+                        lambda path: json_to_snapshot(json_file, path),
+                    )
+                elif snapshot_format == "binary":
+                    self._replace_file(self.transactions_file, lambda path: write_snapshot(path, []))
+                else:
+                    self._write_json_file(self.transactions_file, [])
+            if not self.budgets_file.exists():
+                self._write_json_file(self.budgets_file, [])
     
     def _read_json_file(self, file_path: Path) -> List[dict]:
         """Read JSON data from a file.
@@ -49,46 +161,527 @@ class StorageHandler:
         except (json.JSONDecodeError, FileNotFoundError):
             return []
     
-    def _write_json_file(self, file_path: Path, data: List[dict]) -> None:
-        """Write JSON data to a file.
+    def _read_snapshot_records(self) -> List[dict]:
+        """Read transaction dictionaries from the binary snapshot.
+        
+        Returns:
+            List of transaction dictionaries, empty if the snapshot is missing
+            or invalid
+        """
+        try:
+            return list(BinarySnapshot(self.transactions_file).records())
+        except (ValueError, FileNotFoundError):
+            return []
+    
+    def _replace_file(self, file_path: Path, write: Callable[[Path], object]) -> None:
+        """Replace a file atomically.
+        
+        The content is written to a uniquely named temporary file in the same
+        directory, which is then renamed over the target, so readers see
+        either the old or the new file and never a partial one.
+        
+        Args:
+            file_path: Path of the file to replace
+            write: Function writing the new content to the path it is given
+        """
+        fd, temp_name = tempfile.mkstemp(
+            dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp"
+        )
+        os.close(fd)
+        try:
+            write(Path(temp_name))
+            os.replace(temp_name, file_path)
+        except BaseException:
+            try:
+                os.unlink(temp_name)
+            except FileNotFoundError:
+                pass
+            raise
+    
+    def _write_json_file(self, file_path: Path, data, indent: Optional[int] = 2) -> None:
+        """Write JSON data to a file atomically.
         
         Args:
             file_path: Path to the JSON file
-            data: List of dictionaries to write
+            data: JSON-serializable data to write
+            indent: Indentation of the JSON output, None for compact output
         """
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        def write(path: Path) -> None:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=indent, ensure_ascii=False)
+        
+        self._replace_file(file_path, write)
+    
+    def _append_journal(self, records: List[dict]) -> None:
+        """Append change records to the transactions journal.
+        
+        Args:
+            records: Journal records to append
+        """
+        if self._journal_records is None:
+            self._journal_records = self._count_journal_records()
+        
+        # One write per batch, so readers see whole records or a torn tail
+        lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        with open(self.journal_file, "a", encoding="utf-8") as f:
+            f.write(lines)
+        self._journal_records += len(records)
+    
+    def _count_journal_records(self) -> int:
+        """Count the records currently in the transactions journal.
+        
+        Returns:
+            Number of journal records, 0 if there is no journal
+        """
+        try:
+            with open(self.journal_file, "r", encoding="utf-8") as f:
+                return sum(1 for line in f if line.strip())
+        except FileNotFoundError:
+            return 0
+    
+    def _load_transaction_records(self) -> Tuple[Dict[str, dict], int]:
+        """Load transaction records by replaying the journal over the snapshot.
+        
+        Snapshot records without an ID, e.g. from a hand-edited or legacy
+        file, are given new IDs from the counter, after every ID in the data.
+        They are written back by the next save, which rewrites the snapshot
+        even in journal mode.
+        
+        Returns:
+            Tuple of (dictionary mapping transaction IDs to transaction
+            dictionaries in storage order, highest numeric ID in the snapshot
+            or put in the journal, including IDs deleted since)
+        """
+        if self.snapshot_format == "binary":
+            items = self._read_snapshot_records()
+        else:
+            items = self._read_json_file(self.transactions_file)
+        # ID-less records are keyed by their position until IDs are assigned
+        records: Dict[Any, dict] = {
+            item.get("id") or (position,): item for position, item in enumerate(items)
+        }
+        missing_ids = len(records) - sum(isinstance(tid, str) for tid in records)
+        max_id = max(
+            (int(tid) for tid in records if isinstance(tid, str) and tid.isdigit()), default=0
+        )
+        
+        try:
+            with open(self.journal_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        # An append still in progress, or interrupted
+                        break
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn line from an interrupted append
+                        continue
+                    if entry["op"] == "put":
+                        item = entry["transaction"]
+                        tid = item.get("id", "")
+                        records[tid] = item
+                        if tid.isdigit():
+                            max_id = max(max_id, int(tid))
+                    elif entry["op"] == "delete":
+                        records.pop(entry["id"], None)
+        except FileNotFoundError:
+            pass
+        
+        if missing_ids:
+            next_id = max(self._read_next_id(), max_id + 1)
+            numbered = {}
+            for tid, item in records.items():
+                if not isinstance(tid, str):
+                    tid = str(next_id)
+                    item = {**item, "id": tid}
+                    next_id += 1
+                numbered[tid] = item
+            records, max_id = numbered, next_id - 1
+        self._snapshot_outdated = missing_ids > 0
+        
+        return records, max_id
+    
+    def _file_signature(self) -> list:
+        """Get the on-disk signature of the transactions file and journal.
+        
+        Returns:
+            List of [modification time, size] pairs, None for missing files
+        """
+        signature = []
+        for file_path in (self.transactions_file, self.journal_file):
+            try:
+                stat = file_path.stat()
+                signature.append([stat.st_mtime_ns, stat.st_size])
+            except FileNotFoundError:
+                signature.append(None)
+        return signature
+    
+    def _cached_transactions(self) -> Dict[str, Transaction]:
+        """Get the in-memory transactions, reloading them if the files changed.
+        
+        Returns:
+            Dictionary mapping transaction IDs to Transaction objects,
+            in storage order
+        """
+        signature = self._file_signature()
+        if self._transactions is not None and signature == self._transactions_signature:
+            self._cache_hits += 1
+            return self._transactions
+        
+        self._cache_misses += 1
+        # Reload until the files did not change while being read, so a
+        # snapshot and journal from different commits are never combined
+        for _ in range(self.READ_ATTEMPTS):
+            records, max_id = self._load_transaction_records()
+            current = self._file_signature()
+            if current == signature:
+                break
+            signature = current
+        else:
+            with self._lock:
+                signature = self._file_signature()
+                records, max_id = self._load_transaction_records()
+        self._journal_records = None
+        model = CompactTransaction if self.compact_transactions else Transaction
+        # Records were written by this handler, so the trusted bulk path is safe
+        self._transactions = dict(zip(records, model.from_records(records.values())))
+        self._transactions_signature = signature
+        
+        # IDs seen in the data, including ones deleted since the last
+        # compaction, win over a stale or missing persisted counter
+        self._next_id = max(self._read_next_id(), max_id + 1)
+        return self._transactions
+    
+    def _sorted_date_index(self) -> List[Tuple[int, str]]:
+        """Get the date index, rebuilding it if the cache was reloaded.
+        
+        Returns:
+            Sorted list of (date ordinal, transaction ID) pairs
+        """
+        cached = self._cached_transactions()
+        if self._date_index is None or self._date_index_source is not cached:
+            self._date_index = sorted(
+                (transaction.date.toordinal(), tid) for tid, transaction in cached.items()
+            )
+            self._date_index_source = cached
+        return self._date_index
+    
+    def _update_date_index(
+        self,
+        removed: Optional[Transaction],
+        added: Optional[Transaction],
+    ) -> None:
+        """Apply a change to the date index, if it is built.
+        
+        Args:
+            removed: Transaction removed from the cache, or None
+            added: Transaction added to the cache, or None
+        """
+        index = self._date_index
+        if index is None or self._date_index_source is not self._transactions:
+            return
+        if removed is not None:
+            key = (removed.date.toordinal(), removed.id)
+            position = bisect_left(index, key)
+            if position < len(index) and index[position] == key:
+                del index[position]
+        if added is not None:
+            insort(index, (added.date.toordinal(), added.id))
+    
+    @property
+    def data_version(self) -> int:
+        """Version number that increases whenever the transactions change.
+        
+        Returns:
+            Current data version
+        """
+        with self._state_lock:
+            signature = self._file_signature()
+            if signature != self._version_signature:
+                self._version_signature = signature
+                self._data_version += 1
+            return self._data_version
+    
+    def read_columns(self) -> Optional[Dict[str, Any]]:
+        """Get columns of all transactions from the memory-mapped snapshot.
+        
+        Columns are only served while the binary snapshot holds every
+        transaction, that is when no journal records are pending.
+        
+        Returns:
+            Dictionary of TransactionFrame arguments backed by the mapped
+            file, or None if columns cannot be read without parsing
+        """
+        if self.snapshot_format != "binary" or self.journal_file.exists():
+            return None
+        with self._state_lock:
+            signature = self._file_signature()
+            if self._snapshot is None or signature != self._snapshot_signature:
+                try:
+                    self._snapshot = BinarySnapshot(self.transactions_file)
+                except (ValueError, FileNotFoundError):
+                    return None
+                self._snapshot_signature = signature
+            return self._snapshot.columns()
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """Get hit and miss counters of the in-memory transaction cache.
+        
+        Returns:
+            Dictionary with 'hits' and 'misses' keys
+        """
+        return {"hits": self._cache_hits, "misses": self._cache_misses}
+    
+    def _running_aggregates(self) -> RunningAggregates:
+        """Get the running totals, loading or rebuilding them if stale.
+        
+        Returns:
+            RunningAggregates matching the current data files
+        """
+        signature = self._file_signature()
+        if self._aggregates is not None and self._aggregates.signature == signature:
+            return self._aggregates
+        
+        aggregates = None
+        try:
+            with open(self.aggregates_file, "r", encoding="utf-8") as f:
+                aggregates = RunningAggregates.from_dict(json.load(f))
+        except (json.JSONDecodeError, FileNotFoundError):
+            pass
+        
+        if aggregates is not None and aggregates.signature == signature:
+            self._aggregates = aggregates
+            return aggregates
+        
+        self._aggregates = RunningAggregates.from_transactions(
+            self._cached_transactions().values(), signature
+        )
+        self._write_aggregates()
+        return self._aggregates
+    
+    def _write_aggregates(self) -> None:
+        """Persist the running totals next to the data files."""
+        self._write_json_file(self.aggregates_file, self._aggregates.to_dict(), indent=None)
+    
+    def _mark_transactions_written(self) -> None:
+        """Record that the in-memory transactions now match the files on disk.
+        
+        Updates the cache signature, the data version and, if loaded, the
+        signature of the running totals, which are then persisted.
+        """
+        signature = self._file_signature()
+        self._transactions_signature = signature
+        self._version_signature = signature
+        self._data_version += 1
+        if self._aggregates is not None:
+            self._aggregates.signature = signature
+            self._write_aggregates()
+    
+    def supports_aggregation(self) -> bool:
+        """Whether this handler can compute totals without loading transactions.
+        
+        Returns:
+            Always True, totals are maintained incrementally
+        """
+        return True
+    
+    def sum_by_type(self) -> Dict[str, float]:
+        """Sum transaction amounts by type.
+        
+        Returns:
+            Dictionary with 'income' and 'expense' totals
+        """
+        with self._state_lock:
+            return self._running_aggregates().sum_by_type()
+    
+    def sum_by_category(
+        self,
+        transaction_type: Optional[str] = None,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> Dict[str, float]:
+        """Sum transaction amounts by category.
+        
+        Args:
+            transaction_type: Type to sum ('income' or 'expense'), or None for
+                the net amount (income - expenses) per category
+            year: Year to restrict the sums to, requires month
+            month: Month (1-12) to restrict the sums to, requires year
+            
+        Returns:
+            Dictionary mapping category names to totals
+        """
+        with self._state_lock:
+            return self._running_aggregates().sum_by_category(transaction_type, year, month)
+    
+    def sum_by_month(
+        self,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> Dict[Tuple[int, int], Dict[str, float]]:
+        """Sum transaction amounts by month and type.
+        
+        Args:
+            year: Year to restrict the sums to, requires month
+            month: Month (1-12) to restrict the sums to, requires year
+            
+        Returns:
+            Dictionary mapping (year, month) to 'income' and 'expense' totals
+        """
+        with self._state_lock:
+            return self._running_aggregates().sum_by_month(year, month)
+    
+    def sum_by_month_and_category(self) -> Dict[Tuple[int, int], Dict[str, Dict[str, float]]]:
+        """Sum transaction amounts by month, category and type.
+        
+        Returns:
+            Dictionary mapping (year, month) to dictionaries mapping category
+            names to 'income' and 'expense' totals
+        """
+        with self._state_lock:
+            return self._running_aggregates().sum_by_month_and_category()
+    
+    def _read_next_id(self) -> int:
+        """Read the persisted transaction ID counter.
+        
+        Returns:
+            Next transaction ID to allocate, 1 if no counter is stored
+        """
+        try:
+            with open(self.meta_file, "r", encoding="utf-8") as f:
+                return int(json.load(f).get("next_id", 1))
+        except (json.JSONDecodeError, FileNotFoundError, AttributeError, ValueError):
+            return 1
+    
+    def _write_next_id(self) -> None:
+        """Persist the transaction ID counter."""
+        self._write_json_file(self.meta_file, {"next_id": self._next_id}, indent=None)
+    
+    def _write_transaction_records(self, transactions: Dict[str, Transaction]) -> None:
+        """Write a full transactions snapshot and drop the journal.
+        
+        The snapshot is replaced atomically, so a crash or a concurrent
+        reader never sees a half-written snapshot. Replaying the journal
+        over the new snapshot is idempotent, so a crash before the journal
+        is removed loses nothing.
+        
+        Args:
+            transactions: Dictionary mapping transaction IDs to Transaction objects
+        """
+        if self.snapshot_format == "binary":
+            # Drop our mapping so the old file can be replaced on every platform
+            self._snapshot = None
+            self._replace_file(
+                self.transactions_file,
+                lambda path: write_snapshot(path, transactions.values()),
+            )
+        else:
+            self._write_json_file(
+                self.transactions_file, [t.to_dict() for t in transactions.values()]
+            )
+        
+        # The counter must outlive IDs whose records are compacted away
+        self._write_next_id()
+        
+        if self.journal_file.exists():
+            self.journal_file.unlink()
+        self._journal_records = 0
+        self._snapshot_outdated = False
+    
+    def _persist_transaction_changes(self, records: List[dict]) -> None:
+        """Persist changes already applied to the in-memory transactions.
+        
+        In journal mode the change records are appended to the journal, and
+        the journal is compacted into the transactions file once it holds at
+        least ``compact_threshold`` records. Otherwise the transactions file
+        is rewritten.
+        
+        Args:
+            records: Journal records describing the changes
+        """
+        if self.journal:
+            self._append_journal(records)
+        if (
+            not self.journal
+            or self._journal_records >= self.compact_threshold
+            or self._snapshot_outdated
+        ):
+            self._write_transaction_records(self._transactions)
+        self._mark_transactions_written()
+    
+    def compact(self) -> None:
+        """Fold the transactions journal into the transactions file."""
+        with self._state_lock, self._lock:
+            transactions = self._cached_transactions()
+            # Load the totals first so they follow the new file signature
+            self._running_aggregates()
+            self._write_transaction_records(transactions)
+            self._mark_transactions_written()
     
     def save_transaction(self, transaction: Transaction) -> None:
         """Save a transaction to storage.
         
+        A transaction with an existing ID replaces the stored one.
+        
         Args:
             transaction: Transaction object to save
         """
-        transactions = self.load_all_transactions()
+        self.save_transactions([transaction])
+    
+    def save_transactions(self, transactions: List[Transaction]) -> None:
+        """Save several transactions with a single write.
         
-        # Generate ID if not present
-        if not transaction.id:
-            max_id = max(
-                (int(t.id) for t in transactions if t.id and t.id.isdigit()),
-                default=0
-            )
-            transaction.id = str(max_id + 1)
+        Transactions with an existing ID replace the stored ones.
         
-        # Check if transaction with this ID already exists
-        existing_index = None
-        for i, t in enumerate(transactions):
-            if t.id == transaction.id:
-                existing_index = i
-                break
+        Args:
+            transactions: Transaction objects to save
+        """
+        if not transactions:
+            return
         
-        if existing_index is not None:
-            transactions[existing_index] = transaction
-        else:
-            transactions.append(transaction)
+        with self._state_lock, self._lock:
+            cached = self._cached_transactions()
+            aggregates = self._running_aggregates()
+            records = []
+            
+            for transaction in transactions:
+                # Generate ID if not present
+                if not transaction.id:
+                    transaction.id = str(self._next_id)
+                if transaction.id.isdigit():
+                    self._next_id = max(self._next_id, int(transaction.id) + 1)
+                
+                # Keep a private copy so later changes by the caller don't leak into the cache
+                existing = cached.get(transaction.id)
+                if self.compact_transactions:
+                    stored = CompactTransaction.from_transaction(transaction)
+                else:
+                    stored = replace(transaction)
+                cached[transaction.id] = stored
+                records.append({"op": "put", "transaction": stored.to_dict()})
+                
+                if existing is not None:
+                    aggregates.remove(existing)
+                aggregates.add(stored)
+                self._update_date_index(existing, stored)
+            
+            self._persist_transaction_changes(records)
+    
+    def _copy(self, transaction: Union[Transaction, CompactTransaction]) -> Transaction:
+        """Copy a cached transaction for a caller.
         
-        transactions_data = [t.to_dict() for t in transactions]
-        self._write_json_file(self.transactions_file, transactions_data)
+        Args:
+            transaction: Transaction held in the cache
+            
+        Returns:
+            Transaction object independent of the cache
+        """
+        if self.compact_transactions:
+            return transaction.to_transaction()
+        return copy.copy(transaction)
     
     def load_all_transactions(self) -> List[Transaction]:
         """Load all transactions from storage.
@@ -96,8 +689,76 @@ class StorageHandler:
         Returns:
             List of Transaction objects
         """
-        data = self._read_json_file(self.transactions_file)
-        return [Transaction.from_dict(item) for item in data]
+        with self._state_lock:
+            return [self._copy(transaction) for transaction in self._cached_transactions().values()]
+    
+    def iter_transactions(self) -> Iterator[Transaction]:
+        """Iterate over all transactions in storage.
+        
+        Returns:
+            Iterator of Transaction objects
+        """
+        with self._state_lock:
+            transactions = list(self._cached_transactions().values())
+        return (self._copy(transaction) for transaction in transactions)
+    
+    def get_transactions_between(self, start_date: date, end_date: date) -> List[Transaction]:
+        """Get the transactions dated within a range.
+        
+        The range is located in the date index by binary search, so the
+        cost is O(log n + k) for k matching transactions.
+        
+        Args:
+            start_date: First date of the range
+            end_date: Last date of the range (inclusive)
+            
+        Returns:
+            List of Transaction objects ordered by date
+        """
+        with self._state_lock:
+            index = self._sorted_date_index()
+            cached = self._transactions
+            low = bisect_left(index, (start_date.toordinal(), ""))
+            high = bisect_left(index, (end_date.toordinal() + 1, ""), low)
+            return [self._copy(cached[tid]) for _, tid in index[low:high]]
+    
+    def get_recent_transactions(
+        self,
+        limit: int,
+        before: Optional[Tuple[date, str]] = None,
+    ) -> List[Transaction]:
+        """Get the newest transactions, walking the date index backwards.
+        
+        Args:
+            limit: Maximum number of transactions to return
+            before: (date, ID) keyset cursor; only transactions ordered
+                before it are returned
+                
+        Returns:
+            List of Transaction objects ordered by date, then ID (newest first)
+        """
+        with self._state_lock:
+            index = self._sorted_date_index()
+            cached = self._transactions
+            end = len(index) if before is None else bisect_left(index, (before[0].toordinal(), before[1]))
+            return [
+                self._copy(cached[tid]) for _, tid in reversed(index[max(end - limit, 0):end])
+            ]
+    
+    def get_transaction(self, transaction_id: str) -> Optional[Transaction]:
+        """Get a transaction by ID.
+        
+        Args:
+            transaction_id: ID of the transaction to look up
+            
+        Returns:
+            Transaction object, or None if not found
+        """
+        with self._state_lock:
+            transaction = self._cached_transactions().get(transaction_id)
+        if transaction is None:
+            return None
+        return self._copy(transaction)
     
     def delete_transaction(self, transaction_id: str) -> bool:
         """Delete a transaction by ID.
@@ -108,15 +769,32 @@ class StorageHandler:
         Returns:
             True if transaction was deleted, False if not found
         """
-        transactions = self.load_all_transactions()
-        original_count = len(transactions)
-        transactions = [t for t in transactions if t.id != transaction_id]
+        return self.delete_transactions([transaction_id]) == 1
+    
+    def delete_transactions(self, transaction_ids: List[str]) -> int:
+        """Delete several transactions with a single write.
         
-        if len(transactions) < original_count:
-            transactions_data = [t.to_dict() for t in transactions]
-            self._write_json_file(self.transactions_file, transactions_data)
-            return True
-        return False
+        Args:
+            transaction_ids: IDs of the transactions to delete
+            
+        Returns:
+            Number of transactions that were found and deleted
+        """
+        with self._state_lock, self._lock:
+            cached = self._cached_transactions()
+            aggregates = self._running_aggregates()
+            records = []
+            
+            for transaction_id in transaction_ids:
+                existing = cached.pop(transaction_id, None)
+                if existing is not None:
+                    aggregates.remove(existing)
+                    self._update_date_index(existing, None)
+                    records.append({"op": "delete", "id": transaction_id})
+            
+            if records:
+                self._persist_transaction_changes(records)
+            return len(records)
     
     def save_budget(self, budget: Budget) -> None:
         """Save a budget to storage.
@@ -124,22 +802,23 @@ class StorageHandler:
         Args:
             budget: Budget object to save
         """
-        budgets = self.load_all_budgets()
-        
-        # Update existing budget for this category or add new one
-        existing_index = None
-        for i, b in enumerate(budgets):
-            if b.category == budget.category:
-                existing_index = i
-                break
-        
-        if existing_index is not None:
-            budgets[existing_index] = budget
-        else:
-            budgets.append(budget)
-        
-        budgets_data = [b.to_dict() for b in budgets]
-        self._write_json_file(self.budgets_file, budgets_data)
+        with self._lock:
+            budgets = self.load_all_budgets()
+            
+            # Update existing budget for this category or add new one
+            existing_index = None
+            for i, b in enumerate(budgets):
+                if b.category == budget.category:
+                    existing_index = i
+                    break
+            
+            if existing_index is not None:
+                budgets[existing_index] = budget
+            else:
+                budgets.append(budget)
+            
+            budgets_data = [b.to_dict() for b in budgets]
+            self._write_json_file(self.budgets_file, budgets_data)
     
     def load_all_budgets(self) -> List[Budget]:
         """Load all budgets from storage.
@@ -159,12 +838,13 @@ class StorageHandler:
         Returns:
             True if budget was deleted, False if not found
         """
-        budgets = self.load_all_budgets()
-        original_count = len(budgets)
-        budgets = [b for b in budgets if b.category != category]
-        
-        if len(budgets) < original_count:
-            budgets_data = [b.to_dict() for b in budgets]
-            self._write_json_file(self.budgets_file, budgets_data)
-            return True
-        return False
+        with self._lock:
+            budgets = self.load_all_budgets()
+            original_count = len(budgets)
+            budgets = [b for b in budgets if b.category != category]
+            
+            if len(budgets) < original_count:
+                budgets_data = [b.to_dict() for b in budgets]
+                self._write_json_file(self.budgets_file, budgets_data)
+                return True
+            return False
@@ -1,7 +1,11 @@
 """Supabase storage handler for persisting transactions and budgets."""
 
 import os
-from typing import List, Optional
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 from datetime import date
 
 from supabase import create_client, Client
@@ -10,22 +14,91 @@ from models.transaction import Transaction
 from models.budget import Budget
 
 
+# Columns needed to build a Transaction
+TRANSACTION_COLUMNS = "id,date,amount,category,description,type"
+
+# Keys per batched delete, keeping the request's filter well within URL length limits
+DELETE_CHUNK_SIZE = 100
+
+# HTTP client errors that may succeed when retried
+RETRYABLE_STATUS_CODES = (401, 403, 408, 429)
+
+
+def is_permanent_error(error: BaseException) -> bool:
+    """Whether a failed request would fail the same way if retried.
+    
+    Rows rejected by the database, with a SQLSTATE of class 22 (data
+    exception, e.g. an invalid UUID or an amount out of range) or 23
+    (integrity constraint violation), and HTTP client errors other than
+    authentication, timeouts and rate limiting are permanent. Network
+    errors, timeouts and server errors are transient.
+    
+    Args:
+        error: Exception raised by the request
+        
+    Returns:
+        True if retrying the request is pointless
+    """
+    code = getattr(error, "code", None)
+    if isinstance(code, str):
+        if code.startswith(("22", "23")):
+            return True
+        code = int(code) if code.isdigit() else None
+    if not isinstance(code, int):
+        code = getattr(getattr(error, "response", None), "status_code", None)
+    return isinstance(code, int) and 400 <= code < 500 and code not in RETRYABLE_STATUS_CODES
+
+
 class SupabaseStorageHandler:
     """Handles persistence of transactions and budgets using Supabase.
     
     This class encapsulates all Supabase operations and provides a clean
     interface for reading and writing application data to Supabase.
+    
+    Totals by type, category and month are computed in the database by the
+    functions defined in supabase_setup.sql, so analytics do not have to
+    fetch every transaction.
+    
+    ``data_version`` counts writes made through this handler. Changes made
+    by other clients are detected by polling the row count and latest
+    ``updated_at`` at most once per ``version_check_interval`` seconds.
     """
     
-    def __init__(self, supabase_url: Optional[str] = None, supabase_key: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        supabase_url: Optional[str] = None,
+        supabase_key: Optional[str] = None,
+        client: Optional[Client] = None,
+        page_size: int = 1000,
+        max_workers: int = 4,
+        version_check_interval: float = 10.0,
+    ) -> None:
         """Initialize the Supabase storage handler.
         
         Args:
             supabase_url: Supabase project URL (defaults to SUPABASE_URL env var)
             supabase_key: Supabase anon/public key (defaults to SUPABASE_KEY env var)
+            client: Existing client to use instead of creating one, e.g. a
+                local stand-in for supabase.Client
+            page_size: Number of rows fetched per request when loading
+            max_workers: Number of pages fetched concurrently when loading
+            version_check_interval: Minimum number of seconds between checks
+                for changes made by other clients
         """
         self.supabase_url = supabase_url or os.getenv("SUPABASE_URL", "")
         self.supabase_key = supabase_key or os.getenv("SUPABASE_KEY", "")
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self._aggregation_supported: Optional[bool] = None
+        self.version_check_interval = version_check_interval
+        self._data_version = 0
+        self._version_lock = threading.Lock()
+        self._remote_state: Optional[Tuple[int, Optional[str]]] = None
+        self._last_version_check: Optional[float] = None
+        
+        if client is not None:
+            self.client: Client = client
+            return
         
         if not self.supabase_url or not self.supabase_key:
             raise ValueError(
@@ -33,7 +106,42 @@ class SupabaseStorageHandler:
                 "or via SUPABASE_URL and SUPABASE_KEY environment variables"
             )
         
-        self.client: Client = create_client(self.supabase_url, self.supabase_key)
+        self.client = create_client(self.supabase_url, self.supabase_key)
+    
+    def _bump_data_version(self) -> None:
+        """Record that the stored transactions changed."""
+        with self._version_lock:
+            self._data_version += 1
+    
+    @property
+    def data_version(self) -> int:
+        """Version number that increases whenever the transactions change.
+        
+        Returns:
+            Current data version
+        """
+        now = time.monotonic()
+        if (
+            self._last_version_check is None
+            or now - self._last_version_check >= self.version_check_interval
+        ):
+            self._last_version_check = now
+            try:
+                result = (
+                    self.client.table("transactions")
+                    .select("updated_at", count="exact")
+                    .order("updated_at", desc=True)
+                    .limit(1)
+                    .execute()
+                )
+                latest = result.data[0]["updated_at"] if result.data else None
+                state = (result.count or 0, latest)
+                if self._remote_state is not None and state != self._remote_state:
+                    self._bump_data_version()
+                self._remote_state = state
+            except Exception as e:
+                print(f"Warning: Failed to check Supabase for changes: {e}")
+        return self._data_version
     
     def save_transaction(self, transaction: Transaction) -> None:
         """Save a transaction to Supabase.
@@ -41,13 +149,7 @@ class SupabaseStorageHandler:
         Args:
             transaction: Transaction object to save
         """
-        transaction_data = {
-            "date": transaction.date.isoformat(),
-            "amount": float(transaction.amount),
-            "category": transaction.category,
-            "description": transaction.description,
-            "type": transaction.type,
-        }
+        transaction_data = self._transaction_row(transaction)
         
         if transaction.id:
             # Update existing transaction
@@ -62,6 +164,51 @@ class SupabaseStorageHandler:
             result = self.client.table("transactions").insert(transaction_data).execute()
             if result.data and len(result.data) > 0:
                 transaction.id = str(result.data[0]["id"])
+        self._bump_data_version()
+    
+    def save_transactions(self, transactions: List[Transaction]) -> None:
+        """Save several transactions with at most two requests.
+        
+        Transactions that already have an ID are upserted in one request, so
+        retrying a batch is safe. The rest are inserted in one request and
+        receive the IDs generated by the database.
+        
+        Args:
+            transactions: Transaction objects to save
+        """
+        with_id = [t for t in transactions if t.id]
+        without_id = [t for t in transactions if not t.id]
+        
+        if with_id:
+            rows = [{"id": t.id, **self._transaction_row(t)} for t in with_id]
+            self.client.table("transactions").upsert(rows).execute()
+        
+        if without_id:
+            rows = [self._transaction_row(t) for t in without_id]
+            result = self.client.table("transactions").insert(rows).execute()
+            for transaction, row in zip(without_id, result.data or []):
+                transaction.id = str(row["id"])
+        
+        if transactions:
+            self._bump_data_version()
+    
+    @staticmethod
+    def _transaction_row(transaction: Transaction) -> dict:
+        """Convert a Transaction to a Supabase row without its ID.
+        
+        Args:
+            transaction: Transaction to convert
+            
+        Returns:
+            Row dictionary for the transactions table
+        """
+        return {
+            "date": transaction.date.isoformat(),
+            "amount": float(transaction.amount),
+            "category": transaction.category,
+            "description": transaction.description,
+            "type": transaction.type,
+        }
     
     def load_all_transactions(self) -> List[Transaction]:
         """Load all transactions from Supabase.
@@ -69,23 +216,297 @@ class SupabaseStorageHandler:
         Returns:
             List of Transaction objects
         """
-        result = self.client.table("transactions").select("*").order("date", desc=True).execute()
+        return list(self.iter_transactions())
+    
+    def iter_transactions(self) -> Iterator[Transaction]:
+        """Stream all transactions from Supabase, newest first.
         
-        transactions = []
-        for row in result.data:
-            transactions.append(
-                Transaction(
-                    id=str(row["id"]),
-                    date=date.fromisoformat(row["date"]),
-                    amount=float(row["amount"]),
-                    category=row["category"],
-                    description=row.get("description", ""),
-                    type=row["type"],
-                )
-            )
+        Rows are fetched in pages of ``page_size`` using range requests, so
+        results are not truncated by the server's row limit. Up to
+        ``max_workers`` pages are fetched concurrently, and only that many
+        pages are held in memory at a time.
+        
+        Yields:
+            Transaction objects ordered by date (descending), then ID
+        """
+        for row in self._iter_transaction_rows(TRANSACTION_COLUMNS):
+            yield self._transaction_from_row(row)
+    
+    def iter_transaction_changes(
+        self,
+        updated_since: Optional[str] = None,
+    ) -> Iterator[Tuple[Transaction, Optional[str]]]:
+        """Stream transactions created or updated after a point in time.
+        
+        Args:
+            updated_since: ISO timestamp; only rows with a later updated_at
+                are returned. None returns every row.
+                
+        Yields:
+            Tuples of (Transaction, updated_at timestamp)
+        """
+        filters = [("gt", "updated_at", updated_since)] if updated_since is not None else []
+        for row in self._iter_transaction_rows(f"{TRANSACTION_COLUMNS},updated_at", filters):
+            yield self._transaction_from_row(row), row.get("updated_at")
+    
+    def get_transactions_between(self, start_date: date, end_date: date) -> List[Transaction]:
+        """Get the transactions dated within a range.
         
+        The range is filtered in the database, using its date index.
+        
+        Args:
+            start_date: First date of the range
+            end_date: Last date of the range (inclusive)
+            
+        Returns:
+            List of Transaction objects ordered by date
+        """
+        filters = [
+            ("gte", "date", start_date.isoformat()),
+            ("lte", "date", end_date.isoformat()),
+        ]
+        transactions = [
+            self._transaction_from_row(row)
+            for row in self._iter_transaction_rows(TRANSACTION_COLUMNS, filters)
+        ]
+        transactions.reverse()
         return transactions
     
+    def load_transaction_tombstones(
+        self,
+        deleted_since: Optional[str] = None,
+    ) -> List[Tuple[str, str]]:
+        """Load the IDs of transactions deleted after a point in time.
+        
+        Args:
+            deleted_since: ISO timestamp; only later deletions are returned.
+                None returns every recorded deletion.
+                
+        Returns:
+            List of (transaction ID, deleted_at timestamp) tuples
+        """
+        query = self.client.table("transaction_tombstones").select("id,deleted_at")
+        if deleted_since is not None:
+            query = query.gt("deleted_at", deleted_since)
+        result = query.order("deleted_at").execute()
+        return [(str(row["id"]), row["deleted_at"]) for row in result.data or []]
+    
+    def get_recent_transactions(
+        self,
+        limit: int,
+        before: Optional[Tuple[date, str]] = None,
+    ) -> List[Transaction]:
+        """Get the newest transactions with one ordered, limited request.
+        
+        Args:
+            limit: Maximum number of transactions to return
+            before: (date, ID) keyset cursor; only transactions ordered
+                before it are returned
+                
+        Returns:
+            List of Transaction objects ordered by date, then ID (newest first)
+        """
+        query = self.client.table("transactions").select(TRANSACTION_COLUMNS)
+        if before is not None:
+            before_date = before[0].isoformat()
+            query = query.or_(
+                f"date.lt.{before_date},and(date.eq.{before_date},id.lt.{before[1]})"
+            )
+        result = query.order("date", desc=True).order("id", desc=True).limit(limit).execute()
+        return [self._transaction_from_row(row) for row in result.data or []]
+    
+    @staticmethod
+    def _apply_filters(query, filters: Sequence[Tuple[str, str, Any]]):
+        """Add filters to a query.
+        
+        Args:
+            query: Query builder to filter
+            filters: Tuples of (operator, column, value), e.g. ("gte", "date", "2024-01-01")
+            
+        Returns:
+            Filtered query builder
+        """
+        for operator, column, value in filters:
+            query = getattr(query, operator)(column, value)
+        return query
+    
+    def _iter_transaction_rows(
+        self,
+        columns: str,
+        filters: Sequence[Tuple[str, str, Any]] = (),
+    ) -> Iterator[dict]:
+        """Stream transaction rows in concurrently fetched pages.
+        
+        Args:
+            columns: Comma-separated columns to select
+            filters: Tuples of (operator, column, value) rows must match
+            
+        Yields:
+            Row dictionaries ordered by date (descending), then ID
+        """
+        query = self.client.table("transactions").select("id", count="exact")
+        total = self._apply_filters(query, filters).limit(1).execute().count or 0
+        if total == 0:
+            return
+        
+        def fetch(start: int) -> List[dict]:
+            return self._fetch_transaction_page(columns, start, filters)
+        
+        starts = iter(range(0, total, self.page_size))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            window = deque()
+            for start in starts:
+                window.append(executor.submit(fetch, start))
+                if len(window) >= self.max_workers:
+                    break
+            
+            while window:
+                rows = window.popleft().result()
+                start = next(starts, None)
+                if start is not None:
+                    window.append(executor.submit(fetch, start))
+                yield from rows
+    
+    def _fetch_transaction_page(
+        self,
+        columns: str,
+        start: int,
+        filters: Sequence[Tuple[str, str, Any]] = (),
+    ) -> List[dict]:
+        """Fetch one page of transaction rows.
+        
+        Args:
+            columns: Comma-separated columns to select
+            start: Offset of the first row in the page
+            filters: Tuples of (operator, column, value) rows must match
+            
+        Returns:
+            List of row dictionaries
+        """
+        query = self._apply_filters(self.client.table("transactions").select(columns), filters)
+        result = (
+            query.order("date", desc=True)
+            .order("id")
+            .range(start, start + self.page_size - 1)
+            .execute()
+        )
+        return result.data or []
+    
+    def supports_aggregation(self) -> bool:
+        """Whether the database provides the aggregate functions.
+        
+        The functions are created by supabase_setup.sql. Their presence is
+        checked with one call on first use and remembered afterwards.
+        
+        Returns:
+            True if the aggregate methods can be used
+        """
+        if self._aggregation_supported is None:
+            try:
+                self.client.rpc("transaction_totals_by_type").execute()
+                self._aggregation_supported = True
+            except Exception as e:
+                print(f"Warning: Supabase aggregate functions not available, computing locally: {e}")
+                self._aggregation_supported = False
+        return self._aggregation_supported
+    
+    def sum_by_type(self) -> Dict[str, float]:
+        """Sum transaction amounts by type in the database.
+        
+        Returns:
+            Dictionary with 'income' and 'expense' totals
+        """
+        totals = {"income": 0.0, "expense": 0.0}
+        result = self.client.rpc("transaction_totals_by_type").execute()
+        for row in result.data or []:
+            totals[row["type"]] = round(float(row["total"]), 2)
+        return totals
+    
+    def sum_by_category(
+        self,
+        transaction_type: Optional[str] = None,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> Dict[str, float]:
+        """Sum transaction amounts by category in the database.
+        
+        Args:
+            transaction_type: Type to sum ('income' or 'expense'), or None for
+                the net amount (income - expenses) per category
+            year: Year to restrict the sums to, requires month
+            month: Month (1-12) to restrict the sums to, requires year
+            
+        Returns:
+            Dictionary mapping category names to totals
+        """
+        result = self.client.rpc(
+            "transaction_totals_by_category",
+            {"p_type": transaction_type, "p_year": year, "p_month": month},
+        ).execute()
+        return {row["category"]: round(float(row["total"]), 2) for row in result.data or []}
+    
+    def sum_by_month(
+        self,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+    ) -> Dict[Tuple[int, int], Dict[str, float]]:
+        """Sum transaction amounts by month and type in the database.
+        
+        Args:
+            year: Year to restrict the sums to, requires month
+            month: Month (1-12) to restrict the sums to, requires year
+            
+        Returns:
+            Dictionary mapping (year, month) to 'income' and 'expense' totals
+        """
+        result = self.client.rpc(
+            "transaction_totals_by_month",
+            {"p_year": year, "p_month": month},
+        ).execute()
+        return {
+            (int(row["year"]), int(row["month"])): {
+                "income": round(float(row["income"]), 2),
+                "expense": round(float(row["expense"]), 2),
+            }
+            for row in result.data or []
+        }
+    
+    def get_transaction(self, transaction_id: str) -> Optional[Transaction]:
+        """Get a transaction by ID.
+        
+        Args:
+            transaction_id: ID of the transaction to look up
+            
+        Returns:
+            Transaction object, or None if not found
+        """
+        try:
+            result = self.client.table("transactions").select(TRANSACTION_COLUMNS).eq("id", transaction_id).limit(1).execute()
+        except Exception:
+            return None
+        if not result.data:
+            return None
+        return self._transaction_from_row(result.data[0])
+    
+    @staticmethod
+    def _transaction_from_row(row: dict) -> Transaction:
+        """Convert a Supabase row to a Transaction.
+        
+        Args:
+            row: Row dictionary returned by Supabase
+            
+        Returns:
+            Transaction instance
+        """
+        return Transaction(
+            id=str(row["id"]),
+            date=date.fromisoformat(row["date"]),
+            amount=float(row["amount"]),
+            category=row["category"],
+            description=row.get("description") or "",
+            type=row["type"],
+        )
+    
     def delete_transaction(self, transaction_id: str) -> bool:
         """Delete a transaction by ID.
         
@@ -94,12 +515,35 @@ class SupabaseStorageHandler:
             
         Returns:
             True if transaction was deleted, False if not found
+            
+        Raises:
+            Exception: If the request fails
         """
-        try:
-            result = self.client.table("transactions").delete().eq("id", transaction_id).execute()
-            return result.data is not None and len(result.data) > 0
-        except Exception:
-            return False
+        result = self.client.table("transactions").delete().eq("id", transaction_id).execute()
+        deleted = result.data is not None and len(result.data) > 0
+        if deleted:
+            self._bump_data_version()
+        return deleted
+    
+    def delete_transactions(self, transaction_ids: List[str]) -> int:
+        """Delete several transactions with one request per DELETE_CHUNK_SIZE IDs.
+        
+        Deleting IDs that do not exist is not an error.
+        
+        Args:
+            transaction_ids: IDs of the transactions to delete
+            
+        Returns:
+            Number of transactions that were found and deleted
+        """
+        deleted = 0
+        for start in range(0, len(transaction_ids), DELETE_CHUNK_SIZE):
+            chunk = transaction_ids[start:start + DELETE_CHUNK_SIZE]
+            result = self.client.table("transactions").delete().in_("id", chunk).execute()
+            deleted += len(result.data or [])
+        if deleted:
+            self._bump_data_version()
+        return deleted
     
     def save_budget(self, budget: Budget) -> None:
         """Save a budget to Supabase.
@@ -115,6 +559,20 @@ class SupabaseStorageHandler:
         # Use upsert to insert or update
         self.client.table("budgets").upsert(budget_data, on_conflict="category").execute()
     
+    def save_budgets(self, budgets: List[Budget]) -> None:
+        """Save several budgets with one upsert request.
+        
+        Args:
+            budgets: Budget objects to save
+        """
+        if not budgets:
+            return
+        rows = [
+            {"category": budget.category, "monthly_limit": float(budget.monthly_limit)}
+            for budget in budgets
+        ]
+        self.client.table("budgets").upsert(rows, on_conflict="category").execute()
+    
     def load_all_budgets(self) -> List[Budget]:
         """Load all budgets from Supabase.
         
@@ -142,9 +600,25 @@ class SupabaseStorageHandler:
             
         Returns:
             True if budget was deleted, False if not found
+            
+        Raises:
+            Exception: If the request fails
         """
-        try:
-            result = self.client.table("budgets").delete().eq("category", category).execute()
-            return result.data is not None and len(result.data) > 0
-        except Exception:
-            return False
+        result = self.client.table("budgets").delete().eq("category", category).execute()
+        return result.data is not None and len(result.data) > 0
+    
+    def delete_budgets(self, categories: List[str]) -> int:
+        """Delete several budgets with one request per DELETE_CHUNK_SIZE categories.
+        
+        Args:
+            categories: Categories of the budgets to delete
+            
+        Returns:
+            Number of budgets that were found and deleted
+        """
+        deleted = 0
+        for start in range(0, len(categories), DELETE_CHUNK_SIZE):
+            chunk = categories[start:start + DELETE_CHUNK_SIZE]
+            result = self.client.table("budgets").delete().in_("category", chunk).execute()
+            deleted += len(result.data or [])
+        return deleted
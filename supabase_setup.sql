@@ -25,10 +25,111 @@ CREATE TABLE IF NOT EXISTS budgets (
 CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(date);
 CREATE INDEX IF NOT EXISTS idx_transactions_type ON transactions(type);
 CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions(category);
+CREATE INDEX IF NOT EXISTS idx_transactions_updated_at ON transactions(updated_at);
+
+-- Create tombstones table so clients can sync deletions incrementally
+CREATE TABLE IF NOT EXISTS transaction_tombstones (
+    id UUID PRIMARY KEY,
+    deleted_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_transaction_tombstones_deleted_at ON transaction_tombstones(deleted_at);
+
+-- Keep updated_at current so clients can fetch only changed rows
+CREATE OR REPLACE FUNCTION set_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS transactions_set_updated_at ON transactions;
+CREATE TRIGGER transactions_set_updated_at
+    BEFORE UPDATE ON transactions
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+-- Record deleted transaction IDs, and forget them if the ID is inserted again
+CREATE OR REPLACE FUNCTION record_transaction_tombstone()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO transaction_tombstones (id, deleted_at)
+    VALUES (OLD.id, NOW())
+    ON CONFLICT (id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS transactions_record_tombstone ON transactions;
+CREATE TRIGGER transactions_record_tombstone
+    AFTER DELETE ON transactions
+    FOR EACH ROW EXECUTE FUNCTION record_transaction_tombstone();
+
+CREATE OR REPLACE FUNCTION clear_transaction_tombstone()
+RETURNS TRIGGER AS $$
+BEGIN
+    DELETE FROM transaction_tombstones WHERE id = NEW.id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS transactions_clear_tombstone ON transactions;
+CREATE TRIGGER transactions_clear_tombstone
+    AFTER INSERT ON transactions
+    FOR EACH ROW EXECUTE FUNCTION clear_transaction_tombstone();
+
+-- Aggregate functions so totals are computed in the database instead of
+-- fetching every transaction (called through supabase.rpc)
+CREATE OR REPLACE FUNCTION transaction_totals_by_type()
+RETURNS TABLE (type VARCHAR, total NUMERIC) AS $$
+    SELECT t.type, SUM(t.amount)
+    FROM transactions t
+    GROUP BY t.type;
+$$ LANGUAGE sql STABLE;
+
+-- Category totals for one type, or the net amount (income - expenses) when
+-- p_type is NULL, optionally restricted to one month
+CREATE OR REPLACE FUNCTION transaction_totals_by_category(
+    p_type VARCHAR DEFAULT NULL,
+    p_year INTEGER DEFAULT NULL,
+    p_month INTEGER DEFAULT NULL
+)
+RETURNS TABLE (category VARCHAR, total NUMERIC) AS $$
+    SELECT
+        t.category,
+        SUM(CASE WHEN p_type IS NULL AND t.type = 'expense' THEN -t.amount ELSE t.amount END)
+    FROM transactions t
+    WHERE (p_type IS NULL OR t.type = p_type)
+      AND (
+          p_year IS NULL OR p_month IS NULL
+          OR (t.date >= make_date(p_year, p_month, 1)
+              AND t.date < make_date(p_year, p_month, 1) + INTERVAL '1 month')
+      )
+    GROUP BY t.category;
+$$ LANGUAGE sql STABLE;
+
+-- Income and expense totals per month, optionally restricted to one month
+CREATE OR REPLACE FUNCTION transaction_totals_by_month(
+    p_year INTEGER DEFAULT NULL,
+    p_month INTEGER DEFAULT NULL
+)
+RETURNS TABLE (year INTEGER, month INTEGER, income NUMERIC, expense NUMERIC) AS $$
+    SELECT
+        EXTRACT(YEAR FROM t.date)::INTEGER,
+        EXTRACT(MONTH FROM t.date)::INTEGER,
+        COALESCE(SUM(t.amount) FILTER (WHERE t.type = 'income'), 0),
+        COALESCE(SUM(t.amount) FILTER (WHERE t.type = 'expense'), 0)
+    FROM transactions t
+    WHERE p_year IS NULL OR p_month IS NULL
+       OR (t.date >= make_date(p_year, p_month, 1)
+           AND t.date < make_date(p_year, p_month, 1) + INTERVAL '1 month')
+    GROUP BY 1, 2;
+$$ LANGUAGE sql STABLE;
 
 -- Enable Row Level Security (RLS) - optional, for multi-user scenarios
 -- ALTER TABLE transactions ENABLE ROW LEVEL SECURITY;
 -- ALTER TABLE budgets ENABLE ROW LEVEL SECURITY;
+-- ALTER TABLE transaction_tombstones ENABLE ROW LEVEL SECURITY;
 
 -- Create policies for public access (adjust based on your security needs)
 -- CREATE POLICY "Enable read access for all users" ON transactions FOR SELECT USING (true);
@@ -39,3 +140,4 @@ CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions(category);
 -- CREATE POLICY "Enable insert access for all users" ON budgets FOR INSERT WITH CHECK (true);
 -- CREATE POLICY "Enable update access for all users" ON budgets FOR UPDATE USING (true);
 -- CREATE POLICY "Enable delete access for all users" ON budgets FOR DELETE USING (true);
+-- CREATE POLICY "Enable read access for all users" ON transaction_tombstones FOR SELECT USING (true);
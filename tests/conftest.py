@@ -0,0 +1,250 @@
+"""Shared fixtures, including an in-memory stand-in for supabase.Client."""
+
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import pytest
+from postgrest.exceptions import APIError
+
+# Largest amount the DECIMAL(10, 2) column holds
+MAX_AMOUNT = 99_999_999.99
+
+
+class FakeResponse:
+    """Response of an executed request."""
+    
+    def __init__(self, data: List[dict], count: Optional[int] = None) -> None:
+        self.data = data
+        self.count = count
+
+
+class FakeQuery:
+    """Query builder for one table, supporting the calls the app makes."""
+    
+    def __init__(self, client: "FakeSupabaseClient", table: str) -> None:
+        self.client = client
+        self.table = table
+        self.operation = "select"
+        self.columns = "*"
+        self.count: Optional[str] = None
+        self.payload: Any = None
+        self.filters: List[Callable[[dict], bool]] = []
+        self.orders: List[tuple] = []
+        self.row_range: Optional[tuple] = None
+        self.row_limit: Optional[int] = None
+    
+    def select(self, columns: str = "*", count: Optional[str] = None) -> "FakeQuery":
+        self.operation, self.columns, self.count = "select", columns, count
+        return self
+    
+    def insert(self, rows) -> "FakeQuery":
+        self.operation, self.payload = "insert", rows
+        return self
+    
+    def upsert(self, rows, on_conflict: str = "id") -> "FakeQuery":
+        self.operation, self.payload = "upsert", rows
+        return self
+    
+    def update(self, values: dict) -> "FakeQuery":
+        self.operation, self.payload = "update", values
+        return self
+    
+    def delete(self) -> "FakeQuery":
+        self.operation = "delete"
+        return self
+    
+    def _compare(self, column: str, value: Any, check: Callable[[str, str], bool]) -> "FakeQuery":
+        self.filters.append(
+            lambda row: row.get(column) is not None and check(str(row[column]), str(value))
+        )
+        return self
+    
+    def eq(self, column: str, value: Any) -> "FakeQuery":
+        return self._compare(column, value, lambda a, b: a == b)
+    
+    def gt(self, column: str, value: Any) -> "FakeQuery":
+        return self._compare(column, value, lambda a, b: a > b)
+    
+    def gte(self, column: str, value: Any) -> "FakeQuery":
+        return self._compare(column, value, lambda a, b: a >= b)
+    
+    def lt(self, column: str, value: Any) -> "FakeQuery":
+        return self._compare(column, value, lambda a, b: a < b)
+    
+    def lte(self, column: str, value: Any) -> "FakeQuery":
+        return self._compare(column, value, lambda a, b: a <= b)
+    
+    def in_(self, column: str, values: List[Any]) -> "FakeQuery":
+        wanted = {str(value) for value in values}
+        self.filters.append(lambda row: str(row.get(column)) in wanted)
+        return self
+    
+    def or_(self, expression: str) -> "FakeQuery":
+        # Only the keyset form "date.lt.X,and(date.eq.X,id.lt.Y)" is used
+        before, tie = expression.split(",and(")
+        _, _, before_date = before.split(".", 2)
+        equal, smaller = tie.rstrip(")").split(",")
+        _, _, tie_date = equal.split(".", 2)
+        _, _, tie_id = smaller.split(".", 2)
+        self.filters.append(
+            lambda row: row["date"] < before_date
+            or (row["date"] == tie_date and str(row["id"]) < tie_id)
+        )
+        return self
+    
+    def order(self, column: str, desc: bool = False) -> "FakeQuery":
+        self.orders.append((column, desc))
+        return self
+    
+    def range(self, start: int, end: int) -> "FakeQuery":
+        self.row_range = (start, end)
+        return self
+    
+    def limit(self, count: int) -> "FakeQuery":
+        self.row_limit = count
+        return self
+    
+    def execute(self) -> FakeResponse:
+        return self.client.execute_query(self)
+
+
+class FakeRpc:
+    """Call of a database function."""
+    
+    def __init__(self, client: "FakeSupabaseClient", name: str, params: Optional[dict]) -> None:
+        self.client = client
+        self.name = name
+        self.params = params or {}
+    
+    def execute(self) -> FakeResponse:
+        self.client.before_request(("rpc", self.name))
+        function = self.client.functions.get(self.name)
+        if function is None:
+            raise APIError({
+                "message": f"Could not find the function public.{self.name}",
+                "code": "PGRST202",
+            })
+        return FakeResponse(function(self.client.tables, **self.params))
+
+
+class FakeSupabaseClient:
+    """In-memory stand-in for supabase.Client.
+    
+    Mimics the tables of supabase_setup.sql closely enough for the storage
+    handlers: transaction IDs must be UUIDs and amounts must fit
+    DECIMAL(10, 2), deletes record tombstones, and every write moves
+    ``updated_at`` forward. Set ``error`` to make every request fail with
+    it, and ``delay`` to slow every request down.
+    """
+    
+    def __init__(self) -> None:
+        self.tables: Dict[str, List[dict]] = {
+            "transactions": [],
+            "budgets": [],
+            "transaction_tombstones": [],
+        }
+        self.functions: Dict[str, Callable[..., List[dict]]] = {}
+        self.requests: List[tuple] = []
+        self.error: Optional[Exception] = None
+        self.delay = 0.0
+        self._clock = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+    
+    def rpc(self, name: str, params: Optional[dict] = None) -> FakeRpc:
+        return FakeRpc(self, name, params)
+    
+    def before_request(self, request: tuple) -> None:
+        if self.delay:
+            time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        self.requests.append(request)
+    
+    def _now(self) -> str:
+        self._clock += timedelta(seconds=1)
+        return self._clock.isoformat()
+    
+    @staticmethod
+    def _validate(table: str, row: dict) -> None:
+        if table != "transactions":
+            return
+        try:
+            uuid.UUID(str(row["id"]))
+        except ValueError:
+            raise APIError({
+                "message": f'invalid input syntax for type uuid: "{row["id"]}"',
+                "code": "22P02",
+            })
+        if row["amount"] > MAX_AMOUNT:
+            raise APIError({"message": "numeric field overflow", "code": "22003"})
+    
+    def execute_query(self, query: FakeQuery) -> FakeResponse:
+        self.before_request((query.table, query.operation))
+        rows = self.tables.setdefault(query.table, [])
+        key = "category" if query.table == "budgets" else "id"
+        
+        if query.operation in ("insert", "upsert"):
+            payload = query.payload if isinstance(query.payload, list) else [query.payload]
+            payload = [dict(row) for row in payload]
+            for row in payload:
+                if key == "id":
+                    row.setdefault("id", str(uuid.uuid4()))
+                self._validate(query.table, row)
+            existing = {str(row[key]): row for row in rows}
+            if query.operation == "insert" and any(str(row[key]) in existing for row in payload):
+                raise APIError({"message": "duplicate key value", "code": "23505"})
+            written = []
+            for row in payload:
+                row["updated_at"] = self._now()
+                stored = existing.get(str(row[key]))
+                if stored is not None:
+                    stored.update(row)
+                else:
+                    stored = existing[str(row[key])] = row
+                    rows.append(row)
+                    if query.table == "transactions":
+                        self.tables["transaction_tombstones"] = [
+                            t for t in self.tables["transaction_tombstones"] if t["id"] != row["id"]
+                        ]
+                written.append(dict(stored))
+            return FakeResponse(written)
+        
+        selected = [row for row in rows if all(check(row) for check in query.filters)]
+        if query.operation == "update":
+            for row in selected:
+                self._validate(query.table, {**row, **query.payload})
+            for row in selected:
+                row.update(query.payload, updated_at=self._now())
+            return FakeResponse([dict(row) for row in selected])
+        if query.operation == "delete":
+            for row in selected:
+                rows.remove(row)
+                if query.table == "transactions":
+                    self.tables["transaction_tombstones"].append(
+                        {"id": row["id"], "deleted_at": self._now()}
+                    )
+            return FakeResponse([dict(row) for row in selected])
+        
+        for column, desc in reversed(query.orders):
+            selected.sort(key=lambda row: str(row.get(column)), reverse=desc)
+        total = len(selected)
+        if query.row_range is not None:
+            selected = selected[query.row_range[0]:query.row_range[1] + 1]
+        if query.row_limit is not None:
+            selected = selected[:query.row_limit]
+        if query.columns != "*":
+            columns = [column.strip() for column in query.columns.split(",")]
+            selected = [{column: row.get(column) for column in columns} for row in selected]
+        return FakeResponse(
+            [dict(row) for row in selected], total if query.count is not None else None
+        )
+
+
+@pytest.fixture
+def supabase_client() -> FakeSupabaseClient:
+    """Empty stand-in Supabase client."""
+    return FakeSupabaseClient()
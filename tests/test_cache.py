@@ -0,0 +1,30 @@
+"""Tests for the versioned result cache."""
+
+from services.cache import VersionedCache
+
+
+def test_results_are_cached_per_version():
+    cache = VersionedCache()
+    calls = []
+    
+    def compute() -> int:
+        calls.append(1)
+        return len(calls)
+    
+    assert cache.get_or_compute("total", 1, compute) == 1
+    assert cache.get_or_compute("total", 1, compute) == 1
+    assert cache.get_or_compute("total", 2, compute) == 2
+    assert cache.get_or_compute("total", None, compute) == 3
+    assert cache.stats() == {"hits": 1, "misses": 2, "evictions": 0, "size": 1}
+
+
+def test_an_older_version_neither_clears_nor_replaces_newer_results():
+    cache = VersionedCache()
+    cache.get_or_compute("total", 2, lambda: "new")
+    
+    assert cache.get_or_compute("total", 1, lambda: "old") == "old"
+    assert cache.get_or_compute("other", 1, lambda: "old") == "old"
+    
+    assert cache.get_or_compute("total", 2, lambda: "recomputed") == "new"
+    assert cache.get_or_compute("other", 2, lambda: "current") == "current"
+    assert cache.stats()["size"] == 2
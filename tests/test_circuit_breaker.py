@@ -0,0 +1,89 @@
+"""Tests for the circuit breaker guarding Supabase calls."""
+
+import time
+
+import pytest
+
+from storage.circuit_breaker import CircuitBreaker, CircuitOpenError
+from storage.supabase_storage import SupabaseStorageHandler
+
+
+def fail() -> None:
+    """Stand-in for a remote call that fails."""
+    raise ConnectionError("connection refused")
+
+
+def test_breaker_opens_after_consecutive_timeouts():
+    breaker = CircuitBreaker(failure_threshold=2, call_timeout=0.05, reset_timeout=10.0)
+    
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            breaker.call(time.sleep, 0.5)
+    
+    assert breaker.state == CircuitBreaker.OPEN
+    calls = []
+    started = time.monotonic()
+    with pytest.raises(CircuitOpenError):
+        breaker.call(calls.append, 1)
+    # Rejected right away, without calling the function
+    assert time.monotonic() - started < 0.05
+    assert calls == []
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2)
+    
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert breaker.call(len, "ok") == 2
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_half_open_probes_back_off_until_one_succeeds():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05, max_reset_timeout=0.15)
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert 0.0 < breaker.retry_in() <= 0.05
+    
+    # Each failed probe doubles the delay, up to max_reset_timeout
+    for expected_delay in (0.1, 0.15):
+        time.sleep(breaker.retry_in() + 0.01)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        with pytest.raises(ConnectionError):
+            breaker.call(fail)
+        assert breaker.state == CircuitBreaker.OPEN
+        assert expected_delay - 0.03 < breaker.retry_in() <= expected_delay
+    
+    time.sleep(breaker.retry_in() + 0.01)
+    assert breaker.call(len, "ok") == 2
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.retry_in() == 0.0
+
+
+def test_only_one_half_open_probe_is_let_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    time.sleep(0.02)
+    
+    assert breaker.allow()
+    assert not breaker.available()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_supabase_deletes_open_the_breaker(supabase_client):
+    handler = SupabaseStorageHandler(client=supabase_client)
+    breaker = CircuitBreaker(failure_threshold=3)
+    supabase_client.error = ConnectionError("connection refused")
+    
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            breaker.call(handler.delete_transaction, "3f1c2f9e-8d1b-4b8a-9a55-1f3d2c4b5a69")
+    
+    assert breaker.state == CircuitBreaker.OPEN
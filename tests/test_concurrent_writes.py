@@ -0,0 +1,55 @@
+"""Tests for StorageHandler writers in several processes sharing a data directory."""
+
+import multiprocessing
+from datetime import date
+
+import pytest
+
+from models.transaction import Transaction
+from storage.storage_handler import StorageHandler
+
+PROCESSES = 4
+INSERTS_PER_PROCESS = 90
+
+MODES = {
+    "json": {},
+    "journal": {"journal": True, "compact_threshold": 50},
+    "binary": {"snapshot_format": "binary"},
+}
+
+
+def insert_transactions(data_dir: str, options: dict, writer: int) -> None:
+    """Insert transactions through a handler of its own, run in a child process."""
+    handler = StorageHandler(data_dir=data_dir, **options)
+    for i in range(INSERTS_PER_PROCESS):
+        handler.save_transaction(Transaction(
+            date=date(2024, 1, 1 + i % 28),
+            amount=1.0,
+            category=f"Writer {writer}",
+            description=f"{writer}-{i}",
+            type="expense",
+        ))
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_concurrent_writers_lose_no_rows(tmp_path, mode):
+    options = MODES[mode]
+    StorageHandler(data_dir=str(tmp_path), **options)
+    
+    processes = [
+        multiprocessing.Process(target=insert_transactions, args=(str(tmp_path), options, writer))
+        for writer in range(PROCESSES)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=120)
+    assert all(process.exitcode == 0 for process in processes)
+    
+    handler = StorageHandler(data_dir=str(tmp_path), **options)
+    transactions = handler.load_all_transactions()
+    expected = PROCESSES * INSERTS_PER_PROCESS
+    assert len(transactions) == expected
+    assert len({transaction.id for transaction in transactions}) == expected
+    assert len({transaction.description for transaction in transactions}) == expected
+    assert handler.sum_by_type()["expense"] == expected
@@ -0,0 +1,55 @@
+"""Tests for HybridStorageHandler against a stand-in Supabase client."""
+
+import json
+import uuid
+from datetime import date
+
+from models.transaction import Transaction
+from storage.hybrid_storage import HybridStorageHandler
+from storage.storage_handler import StorageHandler
+
+
+def make_transaction(amount: float, transaction_id: str = "") -> Transaction:
+    """Create a transaction, by default without an ID."""
+    return Transaction(
+        id=transaction_id,
+        date=date(2024, 1, 1),
+        amount=amount,
+        category="Food",
+        description="",
+        type="expense",
+    )
+
+
+def test_legacy_ids_are_replaced_with_uuids_and_uploaded(supabase_client, tmp_path):
+    legacy = StorageHandler(str(tmp_path))
+    for amount in (1.0, 2.0, 3.0):
+        legacy.save_transaction(make_transaction(amount))
+    old_ids = sorted(t.id for t in legacy.load_all_transactions())
+    reused = str(uuid.uuid4())
+    # Left by a migration that was interrupted
+    (tmp_path / "legacy_ids.json").write_text(json.dumps({old_ids[0]: reused}))
+    
+    handler = HybridStorageHandler(data_dir=str(tmp_path), supabase_client=supabase_client)
+    handler.remote_writer.flush()
+    
+    new_ids = json.loads((tmp_path / "legacy_ids.json").read_text())
+    assert sorted(new_ids) == old_ids
+    assert new_ids[old_ids[0]] == reused
+    local = {t.id: t.amount for t in handler.local_storage.load_all_transactions()}
+    assert local == {new_ids[old_id]: float(n) for n, old_id in enumerate(old_ids, 1)}
+    remote = {row["id"]: row["amount"] for row in supabase_client.tables["transactions"]}
+    assert remote == local
+    assert handler.remote_health()["rejected_writes"] == 0
+
+
+def test_changes_to_legacy_ids_are_not_queued(supabase_client, tmp_path):
+    handler = HybridStorageHandler(data_dir=str(tmp_path), supabase_client=supabase_client)
+    
+    handler.save_transaction(make_transaction(1.0, transaction_id="42"))
+    handler.delete_transaction("42")
+    handler.remote_writer.flush()
+    
+    assert supabase_client.requests.count(("transactions", "upsert")) == 0
+    assert ("transactions", "delete") not in supabase_client.requests
+    assert handler.remote_write_stats()["rejected"] == 0
@@ -0,0 +1,29 @@
+"""Tests for the bank statement importer."""
+
+import io
+
+from services.importer import TransactionImporter
+from services.transaction_service import TransactionService
+from storage.storage_handler import StorageHandler
+
+
+def test_non_finite_amounts_are_rejected_as_invalid(tmp_path):
+    service = TransactionService(StorageHandler(data_dir=str(tmp_path)))
+    importer = TransactionImporter(service, chunk_size=2)
+    csv_text = (
+        "date,amount,category\n"
+        "2024-01-01,-12.50,Food\n"
+        "2024-01-02,nan,Food\n"
+        "2024-01-03,inf,Food\n"
+        "2024-01-04,1e400,Food\n"
+        "2024-01-05,-1e307,Food\n"
+        "2024-01-06,abc,Food\n"
+        "2024-01-07,100,Salary\n"
+    )
+    
+    report = importer.import_csv(io.StringIO(csv_text))
+    
+    assert report.added == 2
+    assert report.invalid == 5
+    assert len(report.errors) == 5
+    assert sorted(t.amount for t in service.get_all_transactions()) == [12.5, 100.0]
@@ -0,0 +1,113 @@
+"""Tests for the Supabase write queue and its outbox, against a stand-in client."""
+
+import time
+import uuid
+from datetime import date
+
+from models.transaction import Transaction
+from storage.circuit_breaker import CircuitBreaker
+from storage.hybrid_storage import HybridStorageHandler
+from storage.outbox import Outbox, coalesce
+from storage.remote_writer import RemoteWriteQueue
+from storage.supabase_storage import SupabaseStorageHandler
+
+
+def make_transaction(amount: float = 10.0) -> Transaction:
+    """Create a transaction with a UUID, as queued for Supabase."""
+    return Transaction(
+        id=str(uuid.uuid4()),
+        date=date(2024, 1, 1),
+        amount=amount,
+        category="Food",
+        description="",
+        type="expense",
+    )
+
+
+def wait_until(condition, timeout: float = 5.0) -> None:
+    """Wait for the background writer to reach a state."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for the writer"
+        time.sleep(0.01)
+
+
+def test_coalesce_drops_transactions_inserted_then_deleted():
+    kept, dropped = make_transaction(), make_transaction()
+    
+    batches = coalesce([
+        ("insert_transaction", kept),
+        ("insert_transaction", dropped),
+        ("save_transaction", kept),
+        ("delete_transaction", dropped.id),
+    ])
+    
+    assert batches == [[("insert_transaction", kept)]]
+
+
+def test_outbox_is_replayed_coalesced_after_an_outage(supabase_client, tmp_path):
+    outbox = Outbox(tmp_path / "outbox.jsonl")
+    writer = RemoteWriteQueue(
+        SupabaseStorageHandler(client=supabase_client),
+        outbox=outbox,
+        breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.05),
+        retry_interval=0.05,
+    )
+    first, cancelled = make_transaction(), make_transaction()
+    supabase_client.error = ConnectionError("connection refused")
+    
+    writer.enqueue("insert_transaction", first)
+    writer.flush()
+    # Recorded behind the failed insert while the circuit is open
+    writer.enqueue("insert_transaction", cancelled)
+    writer.enqueue("delete_transaction", cancelled.id)
+    writer.flush()
+    assert outbox.depth() == 3
+    
+    supabase_client.error = None
+    # Counted once the outbox was emptied
+    wait_until(lambda: writer.stats()["replayed"] == 1)
+    
+    assert writer.depth() == 0
+    assert [row["id"] for row in supabase_client.tables["transactions"]] == [first.id]
+    assert ("transactions", "delete") not in supabase_client.requests
+
+
+def test_rejected_writes_are_set_aside_without_blocking_the_outbox(supabase_client, tmp_path):
+    handler = HybridStorageHandler(data_dir=str(tmp_path), supabase_client=supabase_client)
+    valid = [make_transaction() for _ in range(3)]
+    too_large = make_transaction(amount=1_000_000_000.0)
+    supabase_client.error = ConnectionError("connection refused")
+    
+    handler.save_transactions([*valid, too_large])
+    handler.remote_writer.flush()
+    assert handler.remote_writer.outbox.depth() > 0
+    
+    supabase_client.error = None
+    # Also covers the writer being mid-replay, about to wait, when woken
+    handler.remote_writer.retry_interval = 0.05
+    handler.remote_writer.resume()
+    wait_until(lambda: handler.remote_writer.depth() == 0)
+    
+    stored = {row["id"] for row in supabase_client.tables["transactions"]}
+    assert stored == {transaction.id for transaction in valid}
+    health = handler.remote_health()
+    assert health["state"] == "closed"
+    assert health["pending_writes"] == 0
+    assert health["rejected_writes"] == 1
+    assert "numeric field overflow" in health["last_error"]
+    [((operation, payload), _)] = handler.remote_writer.outbox.rejections()
+    assert (operation, payload.id) == ("save_transaction", too_large.id)
+
+
+def test_rejections_do_not_open_the_circuit(supabase_client, tmp_path):
+    handler = HybridStorageHandler(data_dir=str(tmp_path), supabase_client=supabase_client)
+    
+    for _ in range(4):
+        handler.save_transactions([make_transaction(), make_transaction(amount=1_000_000_000.0)])
+    handler.remote_writer.flush()
+    
+    assert handler.breaker.state == CircuitBreaker.CLOSED
+    assert len(supabase_client.tables["transactions"]) == 4
+    stats = handler.remote_write_stats()
+    assert (stats["sent"], stats["rejected"], stats["outbox"]) == (4, 4, 0)
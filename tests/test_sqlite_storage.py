@@ -0,0 +1,62 @@
+"""Tests for the SQLite storage handler."""
+
+import threading
+from datetime import date
+
+from models.transaction import Transaction
+from services.analytics_service import AnalyticsService
+from services.transaction_service import TransactionService
+from storage.sqlite_storage import SqliteStorageHandler
+
+
+def in_new_thread(func):
+    """Call a function on a new thread, like a Streamlit rerun, and return its result."""
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def make_transaction(amount: float) -> Transaction:
+    """Create an expense transaction for tests."""
+    return Transaction(
+        date=date(2024, 1, 1), amount=amount, category="Food", description="", type="expense"
+    )
+
+
+def test_data_version_sees_commits_from_other_handlers(tmp_path):
+    handler = SqliteStorageHandler(data_dir=str(tmp_path))
+    other = SqliteStorageHandler(data_dir=str(tmp_path))
+    
+    before = in_new_thread(lambda: handler.data_version)
+    other.save_transaction(make_transaction(10.0))
+    after = in_new_thread(lambda: handler.data_version)
+    assert after > before
+    
+    other.delete_transaction("1")
+    assert in_new_thread(lambda: handler.data_version) > after
+    
+    # Deleting nothing is not a change
+    version = handler.data_version
+    other.delete_transaction("1")
+    assert handler.data_version == version
+
+
+def test_cached_analytics_follow_commits_from_other_handlers(tmp_path):
+    analytics = AnalyticsService(TransactionService(SqliteStorageHandler(data_dir=str(tmp_path))))
+    other = SqliteStorageHandler(data_dir=str(tmp_path))
+    
+    other.save_transaction(make_transaction(10.0))
+    assert in_new_thread(analytics.get_total_expenses) == 10.0
+    other.save_transaction(make_transaction(5.0))
+    assert in_new_thread(analytics.get_total_expenses) == 15.0
+
+
+def test_transactions_load_through_the_bulk_path(tmp_path):
+    handler = SqliteStorageHandler(data_dir=str(tmp_path))
+    handler.save_transactions([make_transaction(10.0), make_transaction(2.5)])
+    
+    transactions = handler.load_all_transactions()
+    assert [(t.id, t.amount, t.description) for t in transactions] == [("1", 10.0, ""), ("2", 2.5, "")]
+    assert handler.get_transaction("2").amount == 2.5
@@ -0,0 +1,138 @@
+"""Tests for the JSON storage handler."""
+
+import json
+from datetime import date
+
+import pytest
+
+from models.transaction import Transaction
+from storage.storage_handler import StorageHandler
+
+
+def make_transaction(amount: float = 10.0, day: int = 1, **kwargs) -> Transaction:
+    """Create an expense transaction for tests."""
+    fields = {
+        "date": date(2024, 1, day),
+        "amount": amount,
+        "category": "Food",
+        "description": "",
+        "type": "expense",
+    }
+    fields.update(kwargs)
+    return Transaction(**fields)
+
+
+def test_returned_transactions_do_not_leak_into_cache(tmp_path):
+    handler = StorageHandler(data_dir=str(tmp_path))
+    handler.save_transactions([make_transaction(10.0, 1), make_transaction(20.0, 2)])
+    
+    for loaded in (
+        handler.load_all_transactions(),
+        list(handler.iter_transactions()),
+        handler.get_transactions_between(date(2024, 1, 1), date(2024, 1, 31)),
+        handler.get_recent_transactions(10),
+    ):
+        for transaction in loaded:
+            transaction.amount = 500.0
+    
+    assert handler.get_transaction("1").amount == 10.0
+    assert [t.amount for t in handler.load_all_transactions()] == [10.0, 20.0]
+    assert handler.sum_by_type()["expense"] == 30.0
+
+
+def test_saving_a_modified_copy_updates_totals(tmp_path):
+    handler = StorageHandler(data_dir=str(tmp_path))
+    handler.save_transaction(make_transaction(10.0))
+    
+    transaction = handler.load_all_transactions()[0]
+    transaction.amount = 25.0
+    handler.save_transaction(transaction)
+    
+    assert handler.get_transaction("1").amount == 25.0
+    assert handler.sum_by_type()["expense"] == 25.0
+
+
+def test_deleted_max_id_is_not_reused_after_reopen(tmp_path):
+    for journal in (False, True):
+        data_dir = tmp_path / f"journal-{journal}"
+        handler = StorageHandler(data_dir=str(data_dir), journal=journal)
+        handler.save_transactions([make_transaction(day=day) for day in (1, 2, 3)])
+        assert handler.delete_transaction("3")
+        
+        other = StorageHandler(data_dir=str(data_dir), journal=journal)
+        transaction = make_transaction(day=4)
+        other.save_transaction(transaction)
+        assert transaction.id == "4"
+        
+        # The first handler reloads the other's write and keeps counting from it
+        transaction = make_transaction(day=5)
+        handler.save_transaction(transaction)
+        assert transaction.id == "5"
+
+
+def test_legacy_records_without_description_load(tmp_path):
+    (tmp_path / "transactions.json").write_text(
+        '[{"id": "1", "date": "2024-01-01", "amount": 12.5, "category": "Food", "type": "expense"}]',
+        encoding="utf-8",
+    )
+    
+    for compact in (False, True):
+        handler = StorageHandler(data_dir=str(tmp_path), compact=compact)
+        transaction = handler.load_all_transactions()[0]
+        assert transaction.description == ""
+        assert transaction.amount == 12.5
+
+
+@pytest.mark.parametrize("journal", [False, True])
+def test_records_without_id_get_ids_that_are_written_back(tmp_path, journal):
+    (tmp_path / "transactions.json").write_text(
+        json.dumps([
+            {"date": "2024-01-01", "amount": 1.0, "category": "Food", "type": "expense"},
+            {"id": "5", "date": "2024-01-02", "amount": 2.0, "category": "Food", "type": "expense"},
+            {"date": "2024-01-03", "amount": 3.0, "category": "Food", "type": "expense"},
+            {"id": "", "date": "2024-01-04", "amount": 4.0, "category": "Food", "type": "expense"},
+        ]),
+        encoding="utf-8",
+    )
+    
+    handler = StorageHandler(data_dir=str(tmp_path), journal=journal)
+    loaded = [(t.id, t.amount) for t in handler.load_all_transactions()]
+    assert loaded == [("6", 1.0), ("5", 2.0), ("7", 3.0), ("8", 4.0)]
+    # Assigned the same way until they are written back
+    reopened = StorageHandler(data_dir=str(tmp_path), journal=journal)
+    assert [(t.id, t.amount) for t in reopened.load_all_transactions()] == loaded
+    
+    handler.save_transaction(make_transaction(5.0, 5))
+    
+    stored = json.loads((tmp_path / "transactions.json").read_text(encoding="utf-8"))
+    assert [record["id"] for record in stored][:4] == ["6", "5", "7", "8"]
+    reopened = StorageHandler(data_dir=str(tmp_path), journal=journal)
+    assert [(t.id, t.amount) for t in reopened.load_all_transactions()] == [*loaded, ("9", 5.0)]
+
+
+def test_compact_folds_journal_with_compact_caching(tmp_path):
+    handler = StorageHandler(data_dir=str(tmp_path), journal=True, compact=True)
+    handler.save_transactions([make_transaction(10.0, 1), make_transaction(20.0, 2)])
+    handler.delete_transaction("1")
+    assert handler.journal_file.exists()
+    
+    handler.compact()
+    
+    assert not handler.journal_file.exists()
+    reopened = StorageHandler(data_dir=str(tmp_path), journal=True, compact=True)
+    assert [t.amount for t in reopened.load_all_transactions()] == [20.0]
+    assert reopened.sum_by_type()["expense"] == 20.0
+
+
+def test_compact_caching_still_returns_transactions(tmp_path):
+    handler = StorageHandler(data_dir=str(tmp_path), compact=True)
+    handler.save_transactions([make_transaction(10.0, 1), make_transaction(20.0, 2)])
+    
+    for loaded in (
+        handler.load_all_transactions(),
+        list(handler.iter_transactions()),
+        handler.get_transactions_between(date(2024, 1, 1), date(2024, 1, 31)),
+        handler.get_recent_transactions(10),
+        [handler.get_transaction("1")],
+    ):
+        assert loaded and all(type(transaction) is Transaction for transaction in loaded)
@@ -0,0 +1,123 @@
+"""Tests for the Supabase storage handler, run against a stand-in client."""
+
+import uuid
+from datetime import date
+
+from models.transaction import Transaction
+from services.analytics_service import AnalyticsService
+from services.transaction_service import TransactionService
+from storage.supabase_storage import SupabaseStorageHandler
+
+
+def make_transaction(day: int, amount: float = 10.0, transaction_type: str = "expense") -> Transaction:
+    """Create a transaction with a UUID, as stored in Supabase."""
+    return Transaction(
+        id=str(uuid.uuid4()),
+        date=date(2024, 1, day),
+        amount=amount,
+        category="Food",
+        description="",
+        type=transaction_type,
+    )
+
+
+def test_load_all_transactions_pages_in_date_then_id_order(supabase_client):
+    handler = SupabaseStorageHandler(client=supabase_client, page_size=3, max_workers=2)
+    transactions = [make_transaction(day) for day in (3, 1, 2, 3, 5, 1, 4, 3, 2, 5)]
+    handler.save_transactions(transactions)
+    supabase_client.requests.clear()
+    
+    loaded = handler.load_all_transactions()
+    
+    expected = sorted(transactions, key=lambda t: t.id)
+    expected.sort(key=lambda t: t.date, reverse=True)
+    assert [t.id for t in loaded] == [t.id for t in expected]
+    assert loaded == expected
+    # One count request, then four pages of at most three rows
+    assert supabase_client.requests == [("transactions", "select")] * 5
+
+
+def test_load_all_transactions_of_an_empty_table_costs_one_request(supabase_client):
+    handler = SupabaseStorageHandler(client=supabase_client, page_size=3)
+    
+    assert handler.load_all_transactions() == []
+    assert len(supabase_client.requests) == 1
+
+
+def totals_by_type(tables):
+    """Stand-in for the transaction_totals_by_type database function."""
+    totals = {}
+    for row in tables["transactions"]:
+        totals[row["type"]] = totals.get(row["type"], 0) + row["amount"]
+    return [{"type": kind, "total": total} for kind, total in totals.items()]
+
+
+def totals_by_category(tables, p_type=None, p_year=None, p_month=None):
+    """Stand-in for the transaction_totals_by_category database function."""
+    totals = {}
+    for row in tables["transactions"]:
+        if p_type is not None and row["type"] != p_type:
+            continue
+        if p_year is not None and not row["date"].startswith(f"{p_year:04d}-{p_month:02d}"):
+            continue
+        sign = -1 if p_type is None and row["type"] == "expense" else 1
+        totals[row["category"]] = totals.get(row["category"], 0) + sign * row["amount"]
+    return [{"category": category, "total": total} for category, total in totals.items()]
+
+
+def totals_by_month(tables, p_year=None, p_month=None):
+    """Stand-in for the transaction_totals_by_month database function."""
+    totals = {}
+    for row in tables["transactions"]:
+        year, month = int(row["date"][:4]), int(row["date"][5:7])
+        if p_year is not None and (year, month) != (p_year, p_month):
+            continue
+        month_totals = totals.setdefault((year, month), {"income": 0, "expense": 0})
+        month_totals[row["type"]] += row["amount"]
+    return [{"year": year, "month": month, **sums} for (year, month), sums in totals.items()]
+
+
+def add_sample_transactions(handler):
+    """Store an income and two expenses in two categories."""
+    salary = make_transaction(1, 1000.0, "income")
+    salary.category = "Salary"
+    handler.save_transactions([salary, make_transaction(2, 12.5), make_transaction(3, 7.5)])
+
+
+def test_totals_are_computed_by_database_functions(supabase_client):
+    supabase_client.functions.update({
+        "transaction_totals_by_type": totals_by_type,
+        "transaction_totals_by_category": totals_by_category,
+        "transaction_totals_by_month": totals_by_month,
+    })
+    handler = SupabaseStorageHandler(client=supabase_client)
+    add_sample_transactions(handler)
+    supabase_client.requests.clear()
+    
+    assert handler.supports_aggregation()
+    assert handler.sum_by_type() == {"income": 1000.0, "expense": 20.0}
+    assert handler.sum_by_category("expense") == {"Food": 20.0}
+    assert handler.sum_by_category() == {"Salary": 1000.0, "Food": -20.0}
+    assert handler.sum_by_month(2024, 1) == {(2024, 1): {"income": 1000.0, "expense": 20.0}}
+    # Only function calls, no transaction rows were fetched
+    assert all(kind == "rpc" for kind, _ in supabase_client.requests)
+    
+    supabase_client.requests.clear()
+    analytics = AnalyticsService(TransactionService(handler))
+    assert analytics.get_current_balance() == 980.0
+    assert ("rpc", "transaction_totals_by_type") in supabase_client.requests
+
+
+def test_totals_fall_back_to_local_computation_without_database_functions(supabase_client):
+    handler = SupabaseStorageHandler(client=supabase_client)
+    add_sample_transactions(handler)
+    
+    assert not handler.supports_aggregation()
+    assert not handler.supports_aggregation()
+    # The missing function is probed once and remembered
+    assert supabase_client.requests.count(("rpc", "transaction_totals_by_type")) == 1
+    
+    analytics = AnalyticsService(TransactionService(handler))
+    assert analytics.get_total_income() == 1000.0
+    assert analytics.get_total_expenses() == 20.0
+    assert analytics.get_expense_by_category() == {"Food": 20.0}
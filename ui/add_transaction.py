@@ -1,8 +1,11 @@
 """Page for adding new transactions."""
 
+import io
+
 import streamlit as st
 from datetime import date
 
+from services.importer import TransactionImporter
 from services.transaction_service import TransactionService
 
 
@@ -68,3 +71,41 @@ def show_add_transaction(transaction_service: TransactionService) -> None:
                     st.error(f"Error adding transaction: {str(e)}")
                 except Exception as e:
                     st.error(f"Unexpected error: {str(e)}")
+    
+    show_import(transaction_service)
+
+
+def show_import(transaction_service: TransactionService) -> None:
+    """Display the bulk import section for bank statement files.
+    
+    Args:
+        transaction_service: TransactionService instance
+    """
+    with st.expander("📥 Import Transactions"):
+        st.caption(
+            "Upload a CSV file with date and amount columns (category, description "
+            "and type are optional) or an OFX/QFX bank statement. Transactions that "
+            "are already stored are skipped."
+        )
+        uploaded_file = st.file_uploader("Statement file", type=["csv", "ofx", "qfx"])
+        
+        if uploaded_file is not None and st.button("Import", use_container_width=True):
+            importer = TransactionImporter(transaction_service)
+            try:
+                with io.TextIOWrapper(uploaded_file, encoding="utf-8-sig", errors="replace") as file:
+                    report = importer.import_file(file, uploaded_file.name)
+            except ValueError as e:
+                st.error(f"Error importing file: {str(e)}")
+                return
+            except Exception as e:
+                st.error(f"Unexpected error: {str(e)}")
+                return
+            
+            st.success(
+                f"Imported {report.added:,} transactions, skipped {report.duplicates:,} "
+                f"duplicates ({report.rows_per_second:,.0f} rows/s)"
+            )
+            if report.invalid:
+                st.warning(f"{report.invalid:,} rows could not be imported")
+                for error in report.errors:
+                    st.text(error)
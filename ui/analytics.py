@@ -2,31 +2,92 @@
 
 import streamlit as st
 import pandas as pd
+from datetime import date
+from typing import Mapping, Optional
 
-from services.analytics_service import AnalyticsService
+from services.analytics_service import AnalyticsService, AnalyticsSnapshot
 
 
-def show_analytics(analytics_service: AnalyticsService) -> None:
+def _category_frame(totals: Mapping[str, float], amount_column: str) -> pd.DataFrame:
+    """Build a table of category totals, largest first.
+    
+    Args:
+        totals: Totals by category
+        amount_column: Name of the amount column
+        
+    Returns:
+        DataFrame with 'Category' and amount columns
+    """
+    return pd.DataFrame(
+        list(totals.items()),
+        columns=["Category", amount_column]
+    ).sort_values(amount_column, ascending=False)
+
+
+def show_monthly_trends(analytics_service: AnalyticsService) -> None:
+    """Display monthly income, expense and balance charts.
+    
+    Args:
+        analytics_service: AnalyticsService instance
+    """
+    st.subheader("Monthly Trends")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        months = st.selectbox(
+            "Period",
+            options=[6, 12, 24, 36],
+            index=1,
+            format_func=lambda n: f"Last {n} months",
+        )
+    with col2:
+        by_category = st.toggle("Expenses by category")
+    
+    today = date.today()
+    first = today.year * 12 + today.month - months
+    start = date(first // 12, first % 12 + 1, 1)
+    series = analytics_service.get_monthly_series(start, today, by_category=by_category)
+    
+    if by_category:
+        st.bar_chart(series, x="month", y="expenses", color="category")
+    else:
+        st.line_chart(series, x="month", y=["income", "expenses", "balance_rolling"])
+        st.line_chart(series, x="month", y="cumulative_balance")
+
+
+def show_analytics(
+    analytics_service: AnalyticsService,
+    snapshot: Optional[AnalyticsSnapshot] = None,
+) -> None:
     """Display the analytics page with charts and breakdowns.
     
     Args:
         analytics_service: AnalyticsService instance
+        snapshot: Metrics already computed for this rerun (computed here if omitted)
     """
     st.title("📈 Analytics")
     
+    if snapshot is None:
+        snapshot = analytics_service.snapshot()
+    
+    if snapshot.monthly:
+        show_monthly_trends(analytics_service)
+        st.divider()
+    
     # Get category summaries
-    expense_by_category = analytics_service.get_expense_by_category()
-    income_by_category = analytics_service.get_income_by_category()
+    expense_by_category = snapshot.expense_by_category
+    income_by_category = snapshot.income_by_category
     
     # Expense breakdown
     if expense_by_category:
         st.subheader("Expenses by Category")
         
-        # Create DataFrame for expenses
-        expense_df = pd.DataFrame(
-            list(expense_by_category.items()),
-            columns=["Category", "Amount"]
-        ).sort_values("Amount", ascending=False)
+        # Create DataFrame for expenses, cached until the data changes. Keys
+        # carry the snapshot's version so a frame always matches the snapshot.
+        expense_df = analytics_service.memoize(
+            ("expense_df", snapshot.data_version),
+            lambda: _category_frame(expense_by_category, "Amount"),
+        )
         
         # Display bar chart
         st.bar_chart(expense_df.set_index("Category"))
@@ -47,10 +108,10 @@ def show_analytics(analytics_service: AnalyticsService) -> None:
         st.subheader("Income by Category")
         
         # Create DataFrame for income
-        income_df = pd.DataFrame(
-            list(income_by_category.items()),
-            columns=["Category", "Amount"]
-        ).sort_values("Amount", ascending=False)
+        income_df = analytics_service.memoize(
+            ("income_df", snapshot.data_version),
+            lambda: _category_frame(income_by_category, "Amount"),
+        )
         
         # Display bar chart
         st.bar_chart(income_df.set_index("Category"))
@@ -67,15 +128,15 @@ def show_analytics(analytics_service: AnalyticsService) -> None:
     st.divider()
     
     # Overall category summary
-    category_summary = analytics_service.get_category_summary()
+    category_summary = snapshot.net_by_category
     if category_summary:
         st.subheader("Net by Category (Income - Expenses)")
         
         # Create DataFrame
-        summary_df = pd.DataFrame(
-            list(category_summary.items()),
-            columns=["Category", "Net Amount"]
-        ).sort_values("Net Amount", ascending=False)
+        summary_df = analytics_service.memoize(
+            ("summary_df", snapshot.data_version),
+            lambda: _category_frame(category_summary, "Net Amount"),
+        )
         
         # Display bar chart with different colors for positive/negative
         st.bar_chart(summary_df.set_index("Category"))
@@ -1,28 +1,48 @@
 """Dashboard page showing financial overview."""
 
+import io
+import tempfile
+
 import streamlit as st
 from datetime import date
+from typing import Optional
 
 from services.transaction_service import TransactionService
-from services.analytics_service import AnalyticsService
+from services.analytics_service import AnalyticsService, AnalyticsSnapshot
+from services.budget_service import BudgetService
+
+
+# Number of transactions per page of the recent transactions table
+RECENT_PAGE_SIZE = 10
+
+# Largest export offered for download, which Streamlit keeps in memory until the next rerun
+MAX_EXPORT_BYTES = 50 * 1024 ** 2
 
 
 def show_dashboard(
     transaction_service: TransactionService,
     analytics_service: AnalyticsService,
+    snapshot: Optional[AnalyticsSnapshot] = None,
+    budget_service: Optional[BudgetService] = None,
 ) -> None:
     """Display the dashboard page with financial overview.
     
     Args:
         transaction_service: TransactionService instance
         analytics_service: AnalyticsService instance
+        snapshot: Metrics already computed for this rerun (computed here if omitted)
+        budget_service: BudgetService instance, the budgets section is
+            hidden if omitted
     """
     st.title("📊 Dashboard")
     
-    # Calculate key metrics
-    total_income = analytics_service.get_total_income()
-    total_expenses = analytics_service.get_total_expenses()
-    current_balance = analytics_service.get_current_balance()
+    if snapshot is None:
+        snapshot = analytics_service.snapshot()
+    
+    # Key metrics
+    total_income = snapshot.total_income
+    total_expenses = snapshot.total_expenses
+    current_balance = snapshot.balance
     
     # Display key metrics in columns
     col1, col2, col3 = st.columns(3)
@@ -39,21 +59,28 @@ def show_dashboard(
     
     st.divider()
     
+    if budget_service is not None:
+        show_budgets(budget_service, snapshot)
+        st.divider()
+    
     # Recent transactions
     st.subheader("Recent Transactions")
-    all_transactions = transaction_service.get_all_transactions()
     
-    # Sort by date (most recent first)
-    sorted_transactions = sorted(
-        all_transactions,
-        key=lambda t: t.date,
-        reverse=True
-    )[:10]  # Show last 10 transactions
+    # Cursors of the pages before the current one, newest first
+    cursors = st.session_state.setdefault("recent_cursors", [])
+    before = cursors[-1] if cursors else None
     
-    if sorted_transactions:
+    # Fetch one extra row to know whether an older page exists
+    recent_transactions = transaction_service.get_recent(
+        limit=RECENT_PAGE_SIZE + 1, before=before
+    )
+    has_older = len(recent_transactions) > RECENT_PAGE_SIZE
+    recent_transactions = recent_transactions[:RECENT_PAGE_SIZE]
+    
+    if recent_transactions:
         # Display transactions in a table
         transaction_data = []
-        for transaction in sorted_transactions:
+        for transaction in recent_transactions:
             transaction_data.append({
                 "Date": transaction.date.strftime("%Y-%m-%d"),
                 "Type": transaction.type.title(),
@@ -67,5 +94,150 @@ def show_dashboard(
             use_container_width=True,
             hide_index=True,
         )
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("← Newer", disabled=not cursors, use_container_width=True):
+                cursors.pop()
+                st.rerun()
+        with col2:
+            if st.button("Older →", disabled=not has_older, use_container_width=True):
+                cursors.append(transaction_service.recent_cursor(recent_transactions[-1]))
+                st.rerun()
+    elif cursors:
+        # The page emptied, e.g. after deletions, so go back to the newest
+        cursors.clear()
+        st.rerun()
     else:
         st.info("No transactions found. Add your first transaction to get started!")
+    
+    show_export(transaction_service, snapshot)
+
+
+def show_budgets(budget_service: BudgetService, snapshot: AnalyticsSnapshot) -> None:
+    """Display this month's spending against each budget, and a budget editor.
+    
+    Args:
+        budget_service: BudgetService instance
+        snapshot: Metrics computed for this rerun, used for the category list
+    """
+    st.subheader("Budgets This Month")
+    
+    statuses = budget_service.get_status()
+    if statuses:
+        for category in sorted(statuses):
+            status = statuses[category]
+            icon = "🔴" if status.over_budget else ("🟠" if status.projected_overrun else "🟢")
+            st.progress(
+                min(status.fraction_used, 1.0),
+                text=(
+                    f"{icon} **{category}**: ${status.spent:,.2f} of ${status.limit:,.2f}"
+                    f" (${status.remaining:,.2f} left)"
+                ),
+            )
+            if status.projected_overrun:
+                st.caption(
+                    f"Projected ${status.projected:,.2f} this month, "
+                    f"${status.projected_overrun:,.2f} over budget"
+                )
+    else:
+        st.info("No budgets set. Add one below to track your monthly spending.")
+    
+    with st.expander("🎯 Manage Budgets"):
+        with st.form("budget_form", clear_on_submit=True):
+            col1, col2 = st.columns(2)
+            with col1:
+                categories = sorted({*snapshot.expense_by_category, *statuses})
+                category = st.selectbox("Category", options=[None, *categories])
+                new_category = st.text_input("Or a new category")
+            with col2:
+                monthly_limit = st.number_input(
+                    "Monthly limit ($)", min_value=0.0, step=10.0, format="%.2f"
+                )
+            submitted = st.form_submit_button("Save Budget", use_container_width=True)
+        
+        if submitted:
+            category = new_category.strip() or category
+            if not category:
+                st.error("Please choose a category.")
+            else:
+                budget_service.set_budget(category, monthly_limit)
+                st.rerun()
+        
+        for budget in budget_service.get_budgets():
+            col1, col2 = st.columns([4, 1])
+            col1.write(f"{budget.category}: ${budget.monthly_limit:,.2f} per month")
+            if col2.button("Delete", key=f"delete_budget_{budget.category}"):
+                budget_service.delete_budget(budget.category)
+                st.rerun()
+
+
+def show_export(transaction_service: TransactionService, snapshot: AnalyticsSnapshot) -> None:
+    """Display the export section with filters and a download button.
+    
+    The file is generated when "Prepare export" is clicked, streaming
+    transactions into a temporary file instead of building a table in
+    memory, and offered for download until the next rerun. Exports larger
+    than MAX_EXPORT_BYTES are refused rather than held in memory.
+    
+    Args:
+        transaction_service: TransactionService instance
+        snapshot: Metrics computed for this rerun, used for the category list
+    """
+    with st.expander("📤 Export Transactions"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            date_range = st.date_input("Date range", value=(), max_value=date.today())
+            file_format = st.radio("Format", options=["CSV", "Parquet"], horizontal=True)
+        
+        with col2:
+            transaction_type = st.selectbox(
+                "Type",
+                options=[None, "income", "expense"],
+                format_func=lambda x: "All" if x is None else x.title(),
+                key="export_type",
+            )
+            categories = sorted({**snapshot.income_by_category, **snapshot.expense_by_category})
+            category = st.selectbox(
+                "Category",
+                options=[None, *categories],
+                format_func=lambda x: "All" if x is None else x,
+                key="export_category",
+            )
+        
+        start_date = date_range[0] if len(date_range) > 0 else None
+        end_date = date_range[1] if len(date_range) > 1 else start_date
+        
+        # Generated in the run the button is clicked, so the file is held by
+        # the download button only until the next rerun, not for the session
+        if not st.button("Prepare export", use_container_width=True):
+            return
+        with tempfile.TemporaryFile() as file:
+            if file_format == "Parquet":
+                transaction_service.export_parquet(
+                    file, start_date, end_date, transaction_type, category
+                )
+            else:
+                text = io.TextIOWrapper(file, encoding="utf-8", newline="")
+                transaction_service.export_csv(
+                    text, start_date, end_date, transaction_type, category
+                )
+                text.flush()
+                text.detach()
+            
+            if file.tell() > MAX_EXPORT_BYTES:
+                st.error(
+                    f"The export is larger than {MAX_EXPORT_BYTES // 1024 ** 2} MB, "
+                    "narrow it down with the filters."
+                )
+                return
+            file.seek(0)
+            extension = "parquet" if file_format == "Parquet" else "csv"
+            st.download_button(
+                "Download",
+                data=file.read(),
+                file_name=f"transactions.{extension}",
+                mime="application/vnd.apache.parquet" if file_format == "Parquet" else "text/csv",
+                use_container_width=True,
+            )